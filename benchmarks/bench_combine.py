@@ -0,0 +1,77 @@
+"""Peak memory and time of combining dealer exports: pandas ExcelWriter vs streaming
+
+    python benchmarks/bench_combine.py [--files 20] [--rows 5000]
+
+Each implementation runs in a fresh process so its peak RSS is its own
+(the resource module makes this benchmark Unix-only).
+"""
+import os
+import sys
+import time
+import argparse
+import resource
+import tempfile
+import multiprocessing
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from elite_reports.excel_writer import combine_workbooks
+from synthetic import make_tickets
+
+
+def legacy_combine(paths, output_path):
+    """The read_excel/to_excel loop combine_excels.py used to run"""
+    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+        for file_path in paths:
+            df = pd.read_excel(file_path, engine='openpyxl')
+            sheet_name = os.path.splitext(os.path.basename(file_path))[0][:31]
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+
+def measure(name, paths, output_path):
+    combine = {'pandas': legacy_combine, 'streaming': combine_workbooks}[name]
+    start = time.perf_counter()
+    combine(paths, output_path)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=20)
+    parser.add_argument('--rows', type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Writing {args.files} synthetic exports of {args.rows:,} rows...")
+        paths = []
+        for i in range(args.files):
+            path = os.path.join(tmp, f"DEALER{i:03d}_12-06-2025_E_ALL_TICKET_STATUS.xlsx")
+            make_tickets(args.rows, seed=i, first_ticket=i * args.rows).to_excel(path, index=False)
+            paths.append(path)
+
+        context = multiprocessing.get_context('spawn')
+        results = {}
+        for name in ('pandas', 'streaming'):
+            output_path = os.path.join(tmp, f"Combined_{name}.xlsx")
+            with context.Pool(1) as pool:
+                results[name] = pool.apply(measure, (name, paths, output_path))
+
+        # Same sheets and cells either way
+        legacy = pd.read_excel(os.path.join(tmp, 'Combined_pandas.xlsx'), sheet_name=None)
+        streamed = pd.read_excel(os.path.join(tmp, 'Combined_streaming.xlsx'), sheet_name=None)
+        assert list(legacy) == list(streamed)
+        for sheet in legacy:
+            pd.testing.assert_frame_equal(legacy[sheet], streamed[sheet])
+
+    print(f"{'Implementation':<16}{'Seconds':>10}{'Peak RSS (MB)':>16}")
+    for name, (elapsed, peak) in results.items():
+        print(f"{name:<16}{elapsed:>10.2f}{peak:>16.0f}")
+    print(f"Peak memory: {results['pandas'][1] / results['streaming'][1]:.1f}x lower (outputs identical)")
+
+
+if __name__ == '__main__':
+    main()
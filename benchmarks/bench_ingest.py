@@ -0,0 +1,71 @@
+"""Serial vs process-pool parsing of dealer exports and of the combined report
+
+    python benchmarks/bench_ingest.py [--files 24] [--rows 3000] [--workers N]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from elite_reports import Fixing_excel
+from elite_reports.excel_writer import combine_workbooks
+from elite_reports.ingest import DEFAULT_WORKERS
+from synthetic import make_tickets
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def same_workbooks(left, right):
+    left, right = pd.read_excel(left, sheet_name=None), pd.read_excel(right, sheet_name=None)
+    assert list(left) == list(right)
+    for sheet in left:
+        pd.testing.assert_frame_equal(left[sheet], right[sheet])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=24)
+    parser.add_argument('--rows', type=int, default=3000)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Writing {args.files} synthetic exports of {args.rows:,} rows...")
+        paths = []
+        for i in range(args.files):
+            path = os.path.join(tmp, f"DEALER{i:03d}_12-06-2025_{'ES'[i % 2]}_ALL_TICKET_STATUS.xlsx")
+            make_tickets(args.rows, seed=i, first_ticket=i * args.rows).to_excel(path, index=False)
+            paths.append(path)
+
+        results = []
+        outputs = {}
+        for workers in (1, args.workers):
+            combined = os.path.join(tmp, f"Combined_{workers}.xlsx")
+            processed = os.path.join(tmp, f"Processed_{workers}.xlsx")
+            combine_time = timed(combine_workbooks, paths, combined, workers=workers)
+            process_time = timed(Fixing_excel.process_workbook, combined, processed, workers=workers)
+            results.append((workers, combine_time, process_time))
+            outputs[workers] = (combined, processed)
+
+        # Parallel parsing must not change sheet order or contents
+        for serial, parallel in zip(outputs[1], outputs[args.workers]):
+            same_workbooks(serial, parallel)
+
+    print(f"{'Workers':<10}{'Combine (s)':>14}{'Process (s)':>14}")
+    for workers, combine_time, process_time in results:
+        print(f"{workers:<10}{combine_time:>14.2f}{process_time:>14.2f}")
+    (_, serial_combine, serial_process), (_, pool_combine, pool_process) = results
+    print(f"Speedup: combine {serial_combine / pool_combine:.1f}x, "
+          f"process {serial_process / pool_process:.1f}x (outputs identical)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Loading a combined report for processing: full pandas parse vs column-pruned, typed, filtered
+
+    python benchmarks/bench_load.py [--sheets 6] [--rows 20000] [--extra-columns 30]
+
+The portal's exports carry many more columns than the processing uses,
+so --extra-columns pads the synthetic ones with text fields. Writing the
+report, each loader and the comparison of their results run in fresh
+processes, so a loader's peak RSS is its own and not one inherited from
+a parent that held data (the resource module makes this benchmark
+Unix-only).
+"""
+import os
+import sys
+import time
+import argparse
+import resource
+import tempfile
+import multiprocessing
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from elite_reports import Fixing_excel
+from elite_reports.ingest import read_sheets
+from synthetic import make_tickets
+
+
+def legacy_load(path):
+    """What Fixing_excel.py did before processing: every column parsed, then cut down"""
+    frames = {}
+    with pd.ExcelFile(path) as xls:
+        for sheet_name in xls.sheet_names:
+            df = pd.read_excel(xls, sheet_name=sheet_name)
+            df = df[[col for col in Fixing_excel.columns_to_keep if col in df.columns]]
+            frames[sheet_name] = df[df['Restoration Type'] == 'Restored By Support'].reset_index(drop=True)
+    return frames
+
+
+def pruned_load(path):
+    return dict(read_sheets(path, spec=Fixing_excel.export_columns()))
+
+
+def peak_rss():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def measure(name, path):
+    load = {'full parse': legacy_load, 'pruned': pruned_load}[name]
+    imported = peak_rss()
+    start = time.perf_counter()
+    frames = load(path)
+    elapsed = time.perf_counter() - start
+    held = sum(df.memory_usage(deep=True).sum() for df in frames.values())
+    return elapsed, peak_rss(), peak_rss() - imported, held / (1024 * 1024)
+
+
+def same_values(path):
+    """Both loaders give the same tickets and values, compared as plain object columns"""
+    legacy, pruned = legacy_load(path), pruned_load(path)
+    assert list(legacy) == list(pruned)
+    for sheet in legacy:
+        pd.testing.assert_frame_equal(legacy[sheet].astype(object), pruned[sheet].astype(object))
+
+
+def write_report(path, sheets, rows, extra_columns):
+    with pd.ExcelWriter(path, engine='xlsxwriter') as writer:
+        for i in range(sheets):
+            df = make_tickets(rows, seed=i, first_ticket=i * rows)
+            rng = np.random.default_rng(i)
+            for n in range(extra_columns):
+                df[f"Field {n:02d}"] = rng.choice(['Attended on site', 'Part replaced', 'Towing arranged', ''], rows)
+            df.to_excel(writer, sheet_name=f"DEALER{i:03d}_12-06-2025_{'ES'[i % 2]}_ALL", index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sheets', type=int, default=6)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--extra-columns', type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'Combined_Report_12-06-2025.xlsx')
+        print(f"Writing a combined report of {args.sheets} sheets x {args.rows:,} rows, "
+              f"{16 + args.extra_columns} columns...")
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(1) as pool:
+            pool.apply(write_report, (path, args.sheets, args.rows, args.extra_columns))
+        results = {}
+        for name in ('full parse', 'pruned'):
+            with context.Pool(1) as pool:
+                results[name] = pool.apply(measure, (name, path))
+        with context.Pool(1) as pool:
+            pool.apply(same_values, (path,))
+
+    # Loading adds the peak RSS above what the imports already took
+    print(f"{'Loader':<14}{'Seconds':>10}{'Peak RSS (MB)':>16}{'Loading (MB)':>15}{'Frames (MB)':>14}")
+    for name, (elapsed, peak, loading, held) in results.items():
+        print(f"{name:<14}{elapsed:>10.2f}{peak:>16.0f}{loading:>15.0f}{held:>14.1f}")
+    (full_time, _, full_loading, full_held), (time_, _, loading, held) = results.values()
+    print(f"Pruned loading: {full_time / time_:.1f}x faster, {full_loading / loading:.1f}x less memory to load, "
+          f"frames {full_held / held:.1f}x smaller (same tickets and values)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""End-to-end scraper run against the mock portal: exports/sec and per-step p50/p95
+
+    python benchmarks/bench_scraper.py [--users 6] [--rows 500] [--latency 0.05] [--workers 1] [--tabs 1] [--http]
+
+Runs automatn12.main() unchanged, with CONFIG['url'] pointed at a local
+MockPortal and the user list replaced by the mock accounts. The browser
+flow needs Chrome and chromedriver; --http only needs the portal.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from mock_portal import MockPortal, mock_users
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=6)
+    parser.add_argument('--rows', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.05, help="Seconds added to every portal response")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--tabs', type=int, default=1, help="Tabs exporting at once in each browser")
+    parser.add_argument('--http', action='store_true', help="Benchmark the direct HTTP export instead of the browser")
+    parser.add_argument('--headed', action='store_true', help="Show the browser windows")
+    args = parser.parse_args()
+
+    users = mock_users(args.users)
+    with tempfile.TemporaryDirectory() as tmp, MockPortal(users, args.rows, args.latency) as portal:
+        # automatn12 puts its downloads, caches and trace under the working directory at import
+        os.chdir(tmp)
+        from elite_reports import automatn12
+        from elite_reports.tracing import load_spans, summary
+        automatn12.users = users
+        automatn12.CONFIG['url'] = portal.url
+        automatn12.CONFIG['headless'] = not args.headed
+        automatn12.CONFIG['http_export']['login_with_browser'] = False
+        automatn12.CONFIG['tabs_per_browser'] = args.tabs
+
+        start = time.perf_counter()
+        automatn12.main(workers=args.workers, http=args.http)
+        elapsed = time.perf_counter() - start
+
+        exports = [name for name in os.listdir(automatn12.download_dir) if name.endswith('_ALL_TICKET_STATUS.xlsx')]
+        expected = len(users) * len(automatn12.modes)
+        print(f"\n{'Flow':<10}{'Workers':>8}{'Exports':>10}{'Seconds':>10}{'Exports/sec':>13}{'Requests':>10}")
+        print(f"{'http' if args.http else 'browser':<10}{args.workers:>8}{f'{len(exports)}/{expected}':>10}"
+              f"{elapsed:>10.2f}{len(exports) / elapsed:>13.2f}{portal.requests:>10}")
+        spans = load_spans([automatn12.CONFIG['trace_path']], automatn12.tracer.run_id)
+        if spans:
+            print()
+            summary(spans)
+        os.chdir(BENCH_DIR)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Rows/sec of the SLA computation in Fixing_excel.py against the row-wise original
+
+    python benchmarks/bench_sla.py [--rows 1000000]
+
+The comparison with the original runs on wall-clock hours; business-hours
+SLA is timed on its own and checked against a day-by-day loop on a sample.
+"""
+import os
+import sys
+import time
+import argparse
+from datetime import timedelta
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from elite_reports import Fixing_excel
+from synthetic import make_tickets
+
+
+def legacy_process_sheet(df):
+    """The row-wise .apply() implementation this benchmark compares against"""
+    is_holiday, get_quarter = Fixing_excel.is_holiday, Fixing_excel.get_quarter
+    df = df[[col for col in Fixing_excel.columns_to_keep if col in df.columns]]
+    df = df[df['Restoration Type'] == 'Restored By Support'].copy()
+    if df.empty:
+        return df
+    df['Month'] = pd.to_datetime(df['Call Log Date'], format='%d-%m-%Y', errors='coerce').dt.strftime('%B %y')
+    df['Date Time (TTBL)'] = pd.to_datetime(
+        df['Call Log Date'].astype(str) + ' ' + df['Call Log Time'].astype(str), format='%d-%m-%Y %H:%M:%S', errors='coerce')
+    df['Date Time (TTBL)'] = df['Date Time (TTBL)'].dt.strftime('%d-%m-%Y %H:%M:%S')
+    df['Date Time (Dealer)'] = pd.to_datetime(
+        df['Actual Response/Reach Date as per Dealer'].astype(str) + ' ' +
+        df['Actual Response/Reach Time as per Dealer'].astype(str), format='%d-%m-%Y %H:%M:%S', errors='coerce')
+    df['Date Time (Dealer)'] = df['Date Time (Dealer)'].dt.strftime('%d-%m-%Y %H:%M:%S')
+    df['Restored as per Dealer'] = df['Actual Restoration Date Dealer'].astype(str) + ' ' + df['Actual Restoration Time Dealer'].astype(str)
+    df['Restored as per Dealer'] = pd.to_datetime(df['Restored as per Dealer'], format='%d-%m-%Y %H:%M:%S', errors='coerce')
+    df['Restored as per Dealer'] = df['Restored as per Dealer'].dt.strftime('%d-%m-%Y %H:%M:%S')
+    dt_ttbl = pd.to_datetime(df['Date Time (TTBL)'], format='%d-%m-%Y %H:%M:%S', errors='coerce')
+    dt_dealer = pd.to_datetime(df['Date Time (Dealer)'], format='%d-%m-%Y %H:%M:%S', errors='coerce')
+    dt_restored = pd.to_datetime(df['Restored as per Dealer'], format='%d-%m-%Y %H:%M:%S', errors='coerce')
+    resp_seconds = (dt_dealer - dt_ttbl).dt.total_seconds()
+    df['Response Time'] = resp_seconds.apply(lambda x: f"{int(x//3600):02}:{int((x%3600)//60):02}" if pd.notnull(x) else '')
+    rest_seconds = (dt_restored - dt_ttbl).dt.total_seconds()
+    df['Restoration Time'] = rest_seconds.apply(lambda x: f"{int(x//3600):02}:{int((x%3600)//60):02}" if pd.notnull(x) else '')
+    resp_hours = resp_seconds / 3600
+    rest_hours = rest_seconds / 3600
+    df['Response Confirmity (2 Hrs)'] = resp_hours.apply(lambda x: 'Conf.' if pd.notnull(x) and x <= 2 else 'NC')
+    df['Response Confirmity (4 Hrs)'] = resp_hours.apply(lambda x: 'Conf.' if pd.notnull(x) and x <= 4 else 'NC')
+    df['Restore Confirmity'] = rest_hours.apply(lambda x: 'Conf.' if pd.notnull(x) and x <= 12 else 'NC')
+    df['Holiday Count'] = dt_ttbl.apply(lambda x: is_holiday(x) if pd.notnull(x) else False)
+    df['Day/Night'] = dt_ttbl.apply(
+        lambda x: 'Day' if pd.notnull(x) and 6 <= x.hour < 18 else ('Night' if pd.notnull(x) else ''))
+    df['Quarter'] = dt_ttbl.apply(
+        lambda x: get_quarter(x.month) if pd.notnull(x) else '')
+    return df
+
+
+def loop_business_seconds(start, end, calendar):
+    """Business seconds from start to end, one calendar day at a time"""
+    sign = 1
+    if end < start:
+        start, end, sign = end, start, -1
+    total = 0.0
+    day = start.normalize()
+    while day <= end:
+        if not calendar.off_days(pd.Series([day]))[0]:
+            window_start = day + timedelta(seconds=calendar.start)
+            window_end = window_start + timedelta(seconds=calendar.window)
+            total += max(0.0, (min(end, window_end) - max(start, window_start)).total_seconds())
+        day += timedelta(days=1)
+    return sign * total
+
+
+def check_business_hours(df, sample=2000):
+    calendar = Fixing_excel.sla_calendar()
+    rows = df.sample(min(sample, len(df)), random_state=0)
+    start = Fixing_excel.parse_date_time(rows['Call Log Date'], rows['Call Log Time'])
+    end = Fixing_excel.parse_date_time(rows['Actual Restoration Date Dealer'], rows['Actual Restoration Time Dealer'])
+    fast = calendar.elapsed(start, end)
+    for i in range(len(rows)):
+        if pd.isna(start.iloc[i]) or pd.isna(end.iloc[i]):
+            assert pd.isna(fast.iloc[i])
+        else:
+            assert fast.iloc[i] == loop_business_seconds(start.iloc[i], end.iloc[i], calendar), i
+
+
+def timed(func, df):
+    start = time.perf_counter()
+    result = func(df)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    print(f"Generating {args.rows:,} synthetic tickets...")
+    df = make_tickets(args.rows)
+    Fixing_excel.business_hours_sla = False
+    legacy, legacy_time = timed(legacy_process_sheet, df)
+    vectorized, vectorized_time = timed(Fixing_excel.process_sheet, df)
+    Fixing_excel.business_hours_sla = True
+    _, business_time = timed(Fixing_excel.process_sheet, df)
+    check_business_hours(df)
+
+    # Same values in every cell, whatever dtype pandas picked for the columns
+    pd.testing.assert_frame_equal(legacy.astype(object), vectorized.astype(object))
+    print(f"{'Implementation':<16}{'Seconds':>10}{'Rows/sec':>14}")
+    print(f"{'row-wise apply':<16}{legacy_time:>10.2f}{args.rows / legacy_time:>14,.0f}")
+    print(f"{'vectorized':<16}{vectorized_time:>10.2f}{args.rows / vectorized_time:>14,.0f}")
+    print(f"{'business hours':<16}{business_time:>10.2f}{args.rows / business_time:>14,.0f}")
+    print(f"Speedup: {legacy_time / vectorized_time:.1f}x (outputs identical)")
+    print("Business-hours elapsed times match a day-by-day loop on a sample")
+
+
+if __name__ == '__main__':
+    main()
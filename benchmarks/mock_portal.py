@@ -0,0 +1,327 @@
+"""Local stand-in for the Elite Support portal, for benchmarks and scraper testing
+
+    python benchmarks/mock_portal.py [--port 8000] [--users 5] [--rows 500] [--latency 0.05]
+
+Serves the pages and endpoints automatn12.py drives: the login form, the
+Consolidated Report form with cascading zone/state/city/dealer selects,
+the support-mode switch under #profileDropdown, a DataTables-style result
+table with an Excel export, and the plain HTTP endpoints used by --http.
+Every response is delayed by the configured latency.
+"""
+import io
+import json
+import time
+import uuid
+import zlib
+import argparse
+import threading
+from datetime import date, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+import numpy as np
+
+from synthetic import make_tickets
+
+BASE_PATH = '/elitesupport/'
+ZONE = 'North 1'
+PREVIEW_ROWS = 10
+TICKET_STATUSES = ['Open', 'Assigned', 'Restored', 'Closed']
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>Elite Support - Login</title></head><body>
+<form method="post" action="login">
+  <input type="text" id="userId" name="userId" placeholder="Employee Id">
+  <input type="password" id="password" name="password" placeholder="Password">
+  <button type="submit" class="login-btn">LOG IN</button>
+</form>
+</body></html>"""
+
+DASHBOARD_PAGE = """<!DOCTYPE html>
+<html><head><title>Consolidated Report</title></head><body>
+<nav>
+  <a id="profileDropdown" href="#" onclick="document.getElementById('profileMenu').style.display = 'block'; return false;">Dealer</a>
+  <div id="profileMenu" style="display: none">
+    <a class="dropdown-item" href="switch-support?type=Elite">Elite Support</a>
+    <a class="dropdown-item" href="switch-support?type=Standard">Standard Support</a>
+  </div>
+</nav>
+<h4 class="card-title">__MODE__ Support</h4>
+<h3>Consolidated Report</h3>
+<form id="report" onsubmit="return false;">
+  <input type="text" id="DateFrom" name="dateFrom" placeholder="Date From">
+  <input type="text" id="DateTo" name="dateTo" placeholder="Date To">
+  <select id="zone" name="zone"><option value="">Select Zone</option><option value="__ZONE__">__ZONE__</option></select>
+  <select id="state" name="state"><option value="">Select State</option></select>
+  <select id="city" name="city"><option value="">Select City</option></select>
+  <select id="dealer" name="dealer"><option value="">Select Dealer</option></select>
+  <select id="ticketStatus" name="ticketStatus" multiple>__STATUSES__</select>
+  <select id="tat" name="tat"><option value="All">All</option><option value="Within">Within TAT</option><option value="Beyond">Beyond TAT</option></select>
+  <button type="button" id="submitBtn" onclick="runReport()">Submit</button>
+</form>
+<div class="dataTables_processing" id="processing" style="display: none">Processing...</div>
+<button type="button" class="dt-button buttons-excel" id="excelBtn" style="display: none">Excel</button>
+<table id="results"><thead></thead><tbody></tbody></table>
+<script>
+var pending = 0;
+function busy(on) {
+  pending += on ? 1 : -1;
+  document.getElementById('processing').style.display = pending > 0 ? 'block' : 'none';
+}
+function reset(ids) {
+  ids.forEach(function (id) { document.getElementById(id).length = 1; });
+}
+function load(level, parent, target) {
+  busy(true);
+  fetch('options?' + new URLSearchParams({level: level, parent: parent}))
+    .then(function (r) { return r.json(); })
+    .then(function (items) {
+      var select = document.getElementById(target);
+      items.forEach(function (item) { select.add(new Option(item, item)); });
+    })
+    .finally(function () { busy(false); });
+}
+document.getElementById('zone').onchange = function () { reset(['state', 'city', 'dealer']); load('state', this.value, 'state'); };
+document.getElementById('state').onchange = function () { reset(['city', 'dealer']); load('city', this.value, 'city'); };
+document.getElementById('city').onchange = function () { reset(['dealer']); load('dealer', this.value, 'dealer'); };
+function runReport() {
+  var query = new URLSearchParams(new FormData(document.getElementById('report')));
+  var excel = document.getElementById('excelBtn');
+  excel.style.display = 'none';
+  busy(true);
+  fetch('consolidated-report/data?format=json', {method: 'POST', body: query})
+    .then(function (r) { return r.json(); })
+    .then(function (payload) {
+      var head = document.querySelector('#results thead');
+      var body = document.querySelector('#results tbody');
+      head.innerHTML = '<tr>' + payload.columns.map(function (c) { return '<th>' + c + '</th>'; }).join('') + '</tr>';
+      body.innerHTML = payload.data.map(function (row) {
+        return '<tr>' + row.map(function (v) { return '<td>' + v + '</td>'; }).join('') + '</tr>';
+      }).join('');
+      excel.onclick = function () { window.location.href = 'consolidated-report/export?' + query; };
+      excel.style.display = 'inline-block';
+    })
+    .finally(function () { busy(false); });
+}
+</script>
+</body></html>"""
+
+
+def mock_users(count, password='secret'):
+    """Portal accounts spread over a few regions and areas, one dealer each"""
+    places = [('Delhi', 'Ghaziabad'), ('Haryana', 'Gurgaon'), ('Haryana', 'Faridabad')]
+    users = []
+    for i in range(count):
+        region, area = places[i % len(places)]
+        users.append({'id': f"EMP{i + 1:04d}", 'pass': password, 'region': region, 'area': area,
+                      'dealer': f"TTBL Dealer {i + 1:02d}"})
+    return users
+
+
+def report_frame(dealer, mode, date_from, date_to, rows, first_ticket=1000000):
+    """A dealer's export for the date range, the same every time it is asked for"""
+    seed = zlib.crc32(f"{dealer}|{mode}|{date_from}|{date_to}".encode('utf-8'))
+    df = make_tickets(rows, seed=seed, first_ticket=first_ticket)
+    start = date.fromisoformat(date_from)
+    span = (date.fromisoformat(date_to) - start).days + 1
+    offsets = np.random.default_rng(seed).integers(0, span, rows)
+    days = [(start + timedelta(days=int(offset))).strftime('%d-%m-%Y') for offset in offsets]
+    df['Call Log Date'] = days
+    df['Actual Response/Reach Date as per Dealer'] = days
+    df['Actual Restoration Date Dealer'] = days
+    return df
+
+
+class MockPortal:
+    """The portal on a background HTTP server; url is the CONFIG['url'] to use"""
+
+    def __init__(self, users, rows=500, latency=0.0, port=0):
+        self.users = {user['id']: user for user in users}
+        self.rows = rows
+        self.latency = latency
+        self.sessions = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._exports = {}
+        self._ticket_blocks = {}
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}{BASE_PATH}"
+        self._thread = threading.Thread(target=self.server.serve_forever, name='mock-portal', daemon=True)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def options(self, level, parent):
+        users = self.users.values()
+        if level == 'state':
+            values = [u['region'] for u in users] if parent == ZONE else []
+        elif level == 'city':
+            values = [u['area'] for u in users if u['region'] == parent]
+        else:
+            values = [u['dealer'] for u in users if u['area'] == parent]
+        return sorted(set(values))
+
+    def report(self, dealer, mode, date_from, date_to):
+        # Every query gets its own ticket numbers, as separate dealers' tickets would
+        with self._lock:
+            block = self._ticket_blocks.setdefault((dealer, mode, date_from, date_to), len(self._ticket_blocks))
+        return report_frame(dealer, mode, date_from, date_to, self.rows, 1000000 + block * self.rows)
+
+    def export(self, dealer, mode, date_from, date_to):
+        """XLSX bytes of one export, built once per query"""
+        key = (dealer, mode, date_from, date_to)
+        with self._lock:
+            cached = self._exports.get(key)
+        if cached is None:
+            buffer = io.BytesIO()
+            self.report(dealer, mode, date_from, date_to).to_excel(buffer, index=False)
+            cached = buffer.getvalue()
+            with self._lock:
+                self._exports[key] = cached
+        return cached
+
+    def _handler(self):
+        portal = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _session(self):
+                for part in self.headers.get('Cookie', '').split(';'):
+                    name, _, value = part.strip().partition('=')
+                    if name == 'JSESSIONID' and value in portal.sessions:
+                        return portal.sessions[value]
+                return None
+
+            def _send(self, status, body=b'', content_type='text/html; charset=utf-8', headers=()):
+                if isinstance(body, str):
+                    body = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _redirect(self, location, headers=()):
+                self._send(302, headers=[('Location', location)] + list(headers))
+
+            def _route(self):
+                time.sleep(portal.latency)
+                with portal._lock:
+                    portal.requests += 1
+                url = urlsplit(self.path)
+                if not url.path.startswith(BASE_PATH):
+                    return None, None
+                return url.path[len(BASE_PATH):], parse_qs(url.query)
+
+            def do_GET(self):
+                path, query = self._route()
+                session = self._session()
+                if path is None:
+                    self._send(404, 'Not found')
+                elif path in ('', 'login'):
+                    if session:
+                        self._redirect('consolidated-report')
+                    else:
+                        self._send(200, LOGIN_PAGE)
+                elif session is None:
+                    self._redirect('login')
+                elif path == 'consolidated-report':
+                    statuses = ''.join(f'<option value="{s}">{s}</option>' for s in ['All'] + TICKET_STATUSES)
+                    page = (DASHBOARD_PAGE.replace('__MODE__', session['mode'])
+                            .replace('__ZONE__', ZONE).replace('__STATUSES__', statuses))
+                    self._send(200, page)
+                elif path == 'switch-support':
+                    mode = query.get('type', [''])[0]
+                    if mode in ('Elite', 'Standard'):
+                        session['mode'] = mode
+                    self._redirect('consolidated-report')
+                elif path == 'options':
+                    items = portal.options(query.get('level', [''])[0], query.get('parent', [''])[0])
+                    self._send(200, json.dumps(items), 'application/json')
+                elif path == 'consolidated-report/export':
+                    self._send_export(session, query)
+                else:
+                    self._send(404, 'Not found')
+
+            def do_POST(self):
+                path, query = self._route()
+                length = int(self.headers.get('Content-Length', 0))
+                form = parse_qs(self.rfile.read(length).decode('utf-8'))
+                session = self._session()
+                if path == 'login':
+                    user = portal.users.get(form.get('userId', [''])[0])
+                    if user is None or form.get('password', [''])[0] != user['pass']:
+                        self._redirect('login?error=1')
+                        return
+                    token = uuid.uuid4().hex
+                    portal.sessions[token] = {'user': user['id'], 'mode': 'Elite'}
+                    self._redirect('consolidated-report', [('Set-Cookie', f"JSESSIONID={token}; Path=/")])
+                elif session is None:
+                    self._send(401, 'Not logged in')
+                elif path == 'consolidated-report/data' and query.get('format') == ['json']:
+                    df = self._report(session, form)
+                    preview = df.head(PREVIEW_ROWS).astype(str)
+                    payload = {'columns': list(df.columns), 'data': preview.values.tolist(),
+                               'recordsTotal': len(df)}
+                    self._send(200, json.dumps(payload), 'application/json')
+                elif path == 'consolidated-report/data':
+                    self._send_export(session, form)
+                else:
+                    self._send(404, 'Not found')
+
+            def _query(self, fields):
+                first = lambda name: fields.get(name, [''])[0]
+                return first('dealer'), first('dateFrom'), first('dateTo') or first('dateFrom')
+
+            def _report(self, session, fields):
+                dealer, date_from, date_to = self._query(fields)
+                return portal.report(dealer, session['mode'], date_from, date_to)
+
+            def _send_export(self, session, fields):
+                dealer, date_from, date_to = self._query(fields)
+                try:
+                    body = portal.export(dealer, session['mode'], date_from, date_to)
+                except ValueError as e:
+                    self._send(400, str(e))
+                    return
+                self._send(200, body, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+                           [('Content-Disposition', 'attachment; filename="Consolidated Report.xlsx"')])
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--users', type=int, default=5)
+    parser.add_argument('--rows', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.05, help="Seconds added to every response")
+    args = parser.parse_args()
+    users = mock_users(args.users)
+    portal = MockPortal(users, args.rows, args.latency, args.port)
+    print(f"Mock portal at {portal.url}")
+    print("Accounts (password 'secret'): " + ', '.join(f"{u['id']} -> {u['dealer']}" for u in users))
+    try:
+        portal.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
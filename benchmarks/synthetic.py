@@ -0,0 +1,38 @@
+"""Synthetic Elite Support exports for the benchmarks"""
+import numpy as np
+import pandas as pd
+
+COMPANIES = ['Sharma Roadlines', 'Delhi Freight Carriers', 'Gurgaon Logistics', 'North Star Transport', 'Om Sai Movers']
+CUSTOMER_TYPES = ['Fleet', 'Retail', 'Key Account']
+RESTORATION_TYPES = ['Restored By Support', 'Restored By Dealer', 'Restored By Customer']
+
+
+def make_tickets(rows, seed=0, first_ticket=1000000):
+    """A dealer export with the portal's columns and realistic gaps"""
+    rng = np.random.default_rng(seed)
+    logged = pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, 365 * 24 * 3600, rows), unit='s')
+    # Some dealers report a response slightly before the call log time
+    responded = logged + pd.to_timedelta(rng.integers(-600, 8 * 3600, rows), unit='s')
+    restored = logged + pd.to_timedelta(rng.integers(0, 30 * 3600, rows), unit='s')
+    df = pd.DataFrame({
+        'Ticket Number': np.arange(rows) + first_ticket,
+        'Call Log Date': logged.strftime('%d-%m-%Y'),
+        'Call Log Time': logged.strftime('%H:%M:%S'),
+        'Actual Response/Reach Date as per Dealer': responded.strftime('%d-%m-%Y'),
+        'Actual Response/Reach Time as per Dealer': responded.strftime('%H:%M:%S'),
+        'Response/Reach Gap': rng.integers(0, 600, rows),
+        'Actual Restoration Date Dealer': restored.strftime('%d-%m-%Y'),
+        'Actual Restoration Time Dealer': restored.strftime('%H:%M:%S'),
+        'Total Restoration Time': rng.integers(0, 1800, rows),
+        'Company Name': rng.choice(COMPANIES, rows),
+        'Registration Number': [f"HR55AB{n:04d}" for n in rng.integers(0, 10000, rows)],
+        'Chassis Number': [f"MB1PAE{n:08d}" for n in rng.integers(0, 10 ** 8, rows)],
+        'Customer Type': rng.choice(CUSTOMER_TYPES, rows),
+        'Restoration Type': rng.choice(RESTORATION_TYPES, rows, p=[0.6, 0.3, 0.1]),
+        'Estimated Response/Reach Time': '02:00',
+        'Remarks': 'Breakdown attended',
+    })
+    # Tickets the dealer has not responded to yet
+    missing = rng.random(rows) < 0.02
+    df.loc[missing, 'Actual Response/Reach Date as per Dealer'] = np.nan
+    return df
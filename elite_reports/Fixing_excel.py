@@ -0,0 +1,399 @@
+import os
+import re
+from importlib import resources
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from .excel_writer import WorkbookWriter, source_property
+from .excel_reader import XlsxReader
+from .ingest import DEFAULT_WORKERS, ColumnSpec, read_frame, read_sheets
+from .parse_cache import ParseCache
+from .business_calendar import BusinessCalendar
+
+# --- CONFIGURATION ---
+target_date = '12-06-2025'
+DOWNLOAD_DIR = r'C:\Users\91987\TVS\downloads'
+combined_file = os.path.join(DOWNLOAD_DIR, f'Combined_Report_{target_date}.xlsx')
+output_file = os.path.join(DOWNLOAD_DIR, f'Processed_Combined_Report_{target_date}.xlsx')
+# Set to None to process every sheet from scratch without the ticket store
+ticket_store_file = os.path.join(DOWNLOAD_DIR, 'tickets.sqlite')
+# Processes parsing sheets of the combined file in parallel (1 = parse in this process)
+ingest_workers = DEFAULT_WORKERS
+# Parsed sheets kept as Feather so re-running the same day skips XLSX parsing (None to disable)
+parse_cache_dir = os.path.join(DOWNLOAD_DIR, 'parse_cache')
+parse_cache_max_mb = 2048
+
+columns_to_keep = [
+    'Ticket Number', 'Call Log Date', 'Call Log Time',
+    'Actual Response/Reach Date as per Dealer', 'Actual Response/Reach Time as per Dealer',
+    'Response/Reach Gap', 'Actual Restoration Date Dealer', 'Actual Restoration Time Dealer',
+    'Total Restoration Time', 'Company Name', 'Registration Number', 'Chassis Number',
+    'Customer Type', 'Restoration Type', 'Estimated Response/Reach Time'
+]
+# How those columns are read: dates and times stay text for the dd-mm-yyyy and HH:MM:SS
+# parsing, and the handful of companies, customer and restoration types become categoricals.
+# Columns not listed keep the type the export stored, e.g. numeric ticket numbers.
+column_dtypes = {
+    'Call Log Date': 'str', 'Call Log Time': 'str',
+    'Actual Response/Reach Date as per Dealer': 'str', 'Actual Response/Reach Time as per Dealer': 'str',
+    'Actual Restoration Date Dealer': 'str', 'Actual Restoration Time Dealer': 'str',
+    'Registration Number': 'str', 'Chassis Number': 'str', 'Estimated Response/Reach Time': 'str',
+    'Company Name': 'category', 'Customer Type': 'category', 'Restoration Type': 'category',
+}
+
+# Holidays as date,region,name lines (add more as needed); a blank region applies to every dealer.
+# None uses the holidays.csv shipped with the package
+holidays_file = None
+# Region of each dealer's regional holidays in holidays_file, e.g. {'TTBL Dealer': 'Haryana'};
+# unlisted dealers only get the national ones
+dealer_regions = {}
+# Count response/restoration time in business hours: Sundays and holidays are
+# skipped and only business_day_hours of each working day count. Changing
+# these or the holidays reprocesses the affected tickets in the ticket store.
+business_hours_sla = True
+business_day_hours = (0, 24)
+# Append 'KPI by Month' and 'KPI by Quarter' rollups after the dealer sheets
+kpi_summary = True
+
+_calendar = None
+
+def sla_calendar():
+    """The holiday calendar, loaded on first use"""
+    global _calendar
+    if _calendar is None:
+        settings = dict(weekly_off=(6,), day_start=business_day_hours[0], day_end=business_day_hours[1])
+        if holidays_file:
+            _calendar = BusinessCalendar.from_file(holidays_file, **settings)
+        else:
+            with resources.as_file(resources.files(__package__).joinpath('holidays.csv')) as path:
+                _calendar = BusinessCalendar.from_file(str(path), **settings)
+    return _calendar
+
+def region_for(dealer):
+    """dealer_regions entry for a dealer as written in sheet names (spaces and '/' as '_')"""
+    for name, region in dealer_regions.items():
+        if name.replace(' ', '_').replace('/', '_') == dealer:
+            return region
+    return ''
+
+def sla_settings(region=''):
+    """Fingerprint of the SLA settings and the region's calendar, stored with each processed ticket"""
+    return f"{'business' if business_hours_sla else 'clock'}-{sla_calendar().fingerprint(region)}"
+
+def is_holiday(date_obj, region=''):
+    return bool(sla_calendar().off_days(pd.Series([date_obj]), region)[0])
+
+def holiday_flags(timestamps, region=''):
+    """Vectorized is_holiday over a datetime Series; False where missing"""
+    return sla_calendar().off_days(timestamps, region)
+
+def elapsed_seconds(start, end, region=''):
+    """Seconds from start to end, in business hours when business_hours_sla is set"""
+    if business_hours_sla:
+        return sla_calendar().elapsed(start, end, region)
+    return (end - start).dt.total_seconds()
+
+# Zero-padded two-digit strings and month names, indexed by number
+PAD2 = np.array([f"{i:02}" for i in range(100)], dtype=object)
+MONTH_NAMES = np.array([''] + [datetime(2000, m, 1).strftime('%B') for m in range(1, 13)], dtype=object)
+
+def _datetime_parts(timestamps, *names):
+    return [getattr(timestamps.dt, name).to_numpy(dtype=float, na_value=0).astype(np.int64) for name in names]
+
+def format_datetimes(timestamps):
+    """Same strings as .dt.strftime('%d-%m-%Y %H:%M:%S'), built from lookup tables"""
+    day, month, year, hour, minute, second = _datetime_parts(
+        timestamps, 'day', 'month', 'year', 'hour', 'minute', 'second')
+    text = (PAD2[day] + '-' + PAD2[month] + '-' + year.astype(str).astype(object) + ' ' +
+            PAD2[hour] + ':' + PAD2[minute] + ':' + PAD2[second])
+    return pd.Series(np.where(timestamps.notna().to_numpy(), text, np.nan), index=timestamps.index)
+
+def format_month_year(timestamps):
+    """Same strings as .dt.strftime('%B %y'), built from lookup tables"""
+    month, year = _datetime_parts(timestamps, 'month', 'year')
+    text = MONTH_NAMES[month] + ' ' + PAD2[year % 100]
+    return pd.Series(np.where(timestamps.notna().to_numpy(), text, np.nan), index=timestamps.index)
+
+def format_hours_minutes(seconds):
+    """HH:MM strings for a Series of elapsed seconds; '' where missing"""
+    valid = seconds.notna().to_numpy()
+    values = seconds.to_numpy(dtype=float, na_value=0.0)
+    hours = np.floor_divide(values, 3600).astype(np.int64)
+    minutes = np.floor_divide(np.mod(values, 3600), 60).astype(np.int64)
+    # Outside 0-99 plain str() already matches f"{h:02}", including the sign of negative gaps
+    padded = (hours >= 0) & (hours < 100)
+    hours_text = np.where(padded, PAD2[np.clip(hours, 0, 99)], hours.astype(str).astype(object))
+    return np.where(valid, hours_text + ':' + PAD2[minutes], '')
+
+def _parse_distinct(values, fmt):
+    """to_datetime over each distinct string once, then broadcast back"""
+    codes, distinct = pd.factorize(values.astype(str).to_numpy(dtype=object))
+    parsed = pd.to_datetime(pd.Series(distinct, dtype=object), format=fmt, errors='coerce').to_numpy()
+    result = parsed[codes]
+    # factorize codes missing values as -1
+    result[codes < 0] = np.datetime64('NaT')
+    return pd.Series(result, index=values.index)
+
+def parse_date_time(dates, times):
+    """Parse dd-mm-yyyy and HH:MM:SS columns into one datetime Series.
+
+    Same result as parsing the joined 'date time' strings, but a day has at
+    most 86,400 distinct times and a report few distinct dates, so each part
+    is parsed once per distinct value instead of once per row.
+    """
+    date_part = _parse_distinct(dates, '%d-%m-%Y')
+    time_part = _parse_distinct(times, '%H:%M:%S')
+    return date_part + (time_part - pd.Timestamp('1900-01-01'))
+
+def conformity(hours, limit):
+    return np.where(hours.to_numpy(dtype=float, na_value=np.nan) <= limit, 'Conf.', 'NC')
+
+def get_quarter(month):
+    if month in [4, 5, 6]:
+        return 'Q1'
+    elif month in [7, 8, 9]:
+        return 'Q2'
+    elif month in [10, 11, 12]:
+        return 'Q3'
+    else:
+        return 'Q4'
+
+# Quarter by calendar month (index 0 is for missing dates)
+QUARTERS = np.array([''] + [get_quarter(month) for month in range(1, 13)], dtype=object)
+
+def sheet_info(sheet_name, source=None):
+    """Dealer, report date and mode suffix of an export, from its file name when known.
+
+    Sheet names are cut to Excel's 31 characters, which can take the date
+    and mode off a long dealer name; the export's file name keeps them.
+    """
+    name = os.path.splitext(os.path.basename(source))[0] if source else sheet_name
+    match = re.match(r'^(.*?)_(\d{2}-\d{2}-\d{4})(?:_to_\d{2}-\d{2}-\d{4})?_([ES])(?:_|$)', name)
+    if not match:
+        return name, '', ''
+    return match.group(1), match.group(2), match.group(3)
+
+def sheet_sources(combined_file):
+    """{sheet name: export file name} as combine_workbooks recorded them in a combined report"""
+    with XlsxReader(combined_file) as reader:
+        properties = reader.custom_properties()
+        return {sheet: properties.get(source_property(sheet)) for sheet in reader.sheet_names}
+
+def export_columns():
+    """What process_sheet needs from an export: columns_to_keep, typed, support-restored rows only"""
+    return ColumnSpec(columns_to_keep, column_dtypes, ('Restoration Type', 'Restored By Support'))
+
+def read_export(path, sheet_name=0, cache=None):
+    """An export's (or combined report sheet's) rows for process_sheet, parsed straight to that shape"""
+    return read_frame(path, sheet_name, export_columns(), cache)
+
+def process_sheet(df, region=''):
+    """Keep support-restored tickets and add the SLA columns, with region's holidays"""
+    if df.columns.empty:
+        return df
+    df = df[[col for col in columns_to_keep if col in df.columns]]
+    df = df[df['Restoration Type'] == 'Restored By Support'].copy()
+    if df.empty:
+        return df
+    # Month column in 'Month Year' format, but keep date parsing in dd-mm-yyyy
+    df['Month'] = format_month_year(pd.to_datetime(df['Call Log Date'], format='%d-%m-%Y', errors='coerce'))
+    # Parse each timestamp once and keep it for the calculations below
+    dt_ttbl = parse_date_time(df['Call Log Date'], df['Call Log Time'])
+    dt_dealer = parse_date_time(df['Actual Response/Reach Date as per Dealer'], df['Actual Response/Reach Time as per Dealer'])
+    dt_restored = parse_date_time(df['Actual Restoration Date Dealer'], df['Actual Restoration Time Dealer'])
+    # Date Time (TTBL), Date Time (Dealer), Restored as per Dealer in dd-mm-yyyy HH:MM:SS
+    df['Date Time (TTBL)'] = format_datetimes(dt_ttbl)
+    df['Date Time (Dealer)'] = format_datetimes(dt_dealer)
+    df['Restored as per Dealer'] = format_datetimes(dt_restored)
+    # Response Time and Restoration Time (in hours:minutes)
+    resp_seconds = elapsed_seconds(dt_ttbl, dt_dealer, region)
+    rest_seconds = elapsed_seconds(dt_ttbl, dt_restored, region)
+    df['Response Time'] = format_hours_minutes(resp_seconds)
+    df['Restoration Time'] = format_hours_minutes(rest_seconds)
+    # For confirmity checks, use hours as float; missing times are NC
+    resp_hours = resp_seconds / 3600
+    rest_hours = rest_seconds / 3600
+    df['Response Confirmity (2 Hrs)'] = conformity(resp_hours, 2)
+    df['Response Confirmity (4 Hrs)'] = conformity(resp_hours, 4)
+    df['Restore Confirmity'] = conformity(rest_hours, 12)
+    df['Holiday Count'] = holiday_flags(dt_ttbl, region)
+    missing = dt_ttbl.isna().to_numpy()
+    hour = dt_ttbl.dt.hour.to_numpy(dtype=float, na_value=-1)
+    df['Day/Night'] = np.where(missing, '', np.where((hour >= 6) & (hour < 18), 'Day', 'Night'))
+    df['Quarter'] = QUARTERS[dt_ttbl.dt.month.to_numpy(dtype=float, na_value=0).astype(np.int64)]
+    return df
+
+def process_sheet_incremental(store, sheet_name, df, source=None):
+    """Upsert a sheet into the ticket store and process only new or changed tickets"""
+    dealer, report_date, mode = sheet_info(sheet_name, source)
+    region = region_for(dealer)
+    changed = store.upsert(df, sheet_name, dealer, mode, report_date, sla_settings(region))
+    # Tickets read no longer (e.g. not restored by support any more) leave the report
+    store.retain(sheet_name, df['Ticket Number'])
+    # A sheet without support-restored tickets still needs its column list stored
+    if changed.any() or df.empty:
+        store.save_processed(sheet_name, report_date, df.loc[changed, 'Ticket Number'],
+                             process_sheet(df[changed], region))
+    print(f"{sheet_name}: {int(changed.sum())} of {len(df)} tickets new or changed")
+    return store.load_processed(sheet_name)
+
+def process_frame(sheet_name, df, store=None, source=None):
+    """SLA columns for one export (source: its file name), through the ticket store when there is one"""
+    if store is not None and 'Ticket Number' in df.columns:
+        return process_sheet_incremental(store, sheet_name, df, source)
+    return process_sheet(df, region_for(sheet_info(sheet_name, source)[0]))
+
+MODE_NAMES = {'E': 'Elite', 'S': 'Standard'}
+
+def hours_from_text(text):
+    """Hours from format_hours_minutes' 'HH:MM' strings; NaN where blank"""
+    parts = text.astype(str).str.extract(r'^(-?\d+):(\d{2})$').astype(float)
+    # Hours are floored, so '-1:30' is half an hour early
+    return parts[0] + parts[1] / 60
+
+def summary_frame(sheet_name, processed, source=None):
+    """One processed sheet cut down to what the KPI summaries aggregate"""
+    dealer, _, mode = sheet_info(sheet_name, source)
+    month_start = pd.to_datetime(processed['Month'], format='%B %y', errors='coerce')
+    return pd.DataFrame({
+        'Dealer': dealer,
+        'Mode': MODE_NAMES.get(mode, mode),
+        'Month Start': month_start,
+        # April to March, matching the Q1-Q4 of get_quarter
+        'Financial Year': month_start.dt.year - (month_start.dt.month < 4),
+        'Quarter': processed['Quarter'],
+        'Day/Night': processed['Day/Night'],
+        'Response Hrs': hours_from_text(processed['Response Time']),
+        'Restoration Hrs': hours_from_text(processed['Restoration Time']),
+        'Response 2 Hrs': processed['Response Confirmity (2 Hrs)'] == 'Conf.',
+        'Response 4 Hrs': processed['Response Confirmity (4 Hrs)'] == 'Conf.',
+        'Restore 12 Hrs': processed['Restore Confirmity'] == 'Conf.',
+        'Holiday': processed['Holiday Count'].fillna(False).astype(bool),
+    })
+
+def kpi_table(rows, period):
+    """Tickets, conformity % and mean/p90 hours per dealer, mode, period and Day/Night, plus an 'All' row"""
+    keys = ['Dealer', 'Mode'] + period
+    tables = []
+    for split in (['Day/Night'], []):
+        grouped = rows.groupby(keys + split, sort=False, dropna=False)
+        table = grouped.agg(**{
+            'Tickets': ('Holiday', 'size'),
+            'Holiday Tickets': ('Holiday', 'sum'),
+            'Response 2 Hrs %': ('Response 2 Hrs', 'mean'),
+            'Response 4 Hrs %': ('Response 4 Hrs', 'mean'),
+            'Mean Response Hrs': ('Response Hrs', 'mean'),
+            'Restore 12 Hrs %': ('Restore 12 Hrs', 'mean'),
+            'Mean Restoration Hrs': ('Restoration Hrs', 'mean'),
+        })
+        table.insert(5, 'P90 Response Hrs', grouped['Response Hrs'].quantile(0.9))
+        table['P90 Restoration Hrs'] = grouped['Restoration Hrs'].quantile(0.9)
+        table = table.reset_index()
+        if not split:
+            table['Day/Night'] = 'All'
+        tables.append(table)
+    table = pd.concat(tables, ignore_index=True).sort_values(keys + ['Day/Night'], ignore_index=True)
+    for column in table.columns:
+        if column.endswith('%'):
+            table[column] = (table[column] * 100).round(1)
+        elif column.endswith('Hrs'):
+            table[column] = table[column].round(2)
+    return table[keys + ['Day/Night'] + [c for c in table.columns if c not in keys and c != 'Day/Night']]
+
+class KpiSummary:
+    """Collects processed sheets, then builds the summary sheets from all of them in one grouped pass"""
+
+    def __init__(self):
+        self._frames = []
+
+    def add(self, sheet_name, processed, source=None):
+        if not processed.empty:
+            self._frames.append(summary_frame(sheet_name, processed, source))
+
+    def sheets(self):
+        if not self._frames:
+            return []
+        rows = pd.concat(self._frames, ignore_index=True)
+        by_month = kpi_table(rows, ['Month Start'])
+        by_month.insert(2, 'Month', format_month_year(by_month.pop('Month Start')))
+        by_quarter = kpi_table(rows, ['Financial Year', 'Quarter'])
+        year = by_quarter['Financial Year']
+        by_quarter['Financial Year'] = np.where(
+            year.notna(), 'FY ' + year.fillna(0).astype(int).astype(str) + '-' +
+            ((year.fillna(0).astype(int) + 1) % 100).map(lambda y: f"{y:02}"), '')
+        return [('KPI by Month', by_month), ('KPI by Quarter', by_quarter)]
+
+    def write(self, writer):
+        """Append the summary sheets to a WorkbookWriter"""
+        for name, table in self.sheets():
+            writer.add_sheet(name, table)
+
+def process_workbook(combined_file, output_file, store=None, workers=1, cache=None):
+    """Process every sheet of a combined report into the output workbook"""
+    # Overwrite output file if it exists
+    if os.path.exists(output_file):
+        os.remove(output_file)
+    # Column widths and wrap/top alignment are applied while writing,
+    # so the finished workbook never has to be reloaded
+    summary = KpiSummary() if kpi_summary else None
+    sources = sheet_sources(combined_file)
+    with WorkbookWriter(output_file) as writer:
+        for sheet_name, df in read_sheets(combined_file, workers, cache, export_columns()):
+            source = sources.get(sheet_name)
+            try:
+                processed = process_frame(sheet_name, df, store, source)
+                writer.add_sheet(sheet_name, processed)
+            except Exception as e:
+                print(f"Error processing sheet {sheet_name}: {e}")
+                continue
+            if summary is not None:
+                summary.add(sheet_name, processed, source)
+        if summary is not None:
+            summary.write(writer)
+    print(f"Processed file saved as: {output_file}")
+
+def process_store(store_path, report_date, output_file):
+    """The processed report of report_date (dd-mm-yyyy) from the ticket store alone, without reading any export.
+
+    Returns the number of dealer sheets written.
+    """
+    from .ticket_store import TicketStore
+    store = TicketStore(store_path)
+    try:
+        sheets = store.report(report_date)
+        if not sheets:
+            print(f"No processed sheets for {report_date} in {store_path}")
+            return 0
+        if os.path.exists(output_file):
+            os.remove(output_file)
+        summary = KpiSummary() if kpi_summary else None
+        with WorkbookWriter(output_file) as writer:
+            for sheet_name, processed in sheets.items():
+                writer.add_sheet(sheet_name, processed)
+                partition = store.sheet_partition(sheet_name)
+                if summary is not None and partition:
+                    # Long dealer names are shortened in sheet names; the store has them whole
+                    dealer, mode = partition
+                    summary.add(sheet_name, processed, f"{dealer}_{report_date}_{mode}")
+            if summary is not None:
+                summary.write(writer)
+    finally:
+        store.close()
+    print(f"Processed file saved as: {output_file}")
+    return len(sheets)
+
+def process_combined(combined_file, output_file, store_path=None, workers=1, cache=None):
+    """process_workbook with the ticket store at store_path (None for none) opened and closed around it"""
+    store = None
+    if store_path:
+        from .ticket_store import TicketStore
+        store = TicketStore(store_path)
+    try:
+        process_workbook(combined_file, output_file, store, workers, cache)
+    finally:
+        if store is not None:
+            store.close()
+
+if __name__ == '__main__':
+    cache = ParseCache(parse_cache_dir, parse_cache_max_mb) if parse_cache_dir else None
+    process_combined(combined_file, output_file, ticket_store_file, ingest_workers, cache)
@@ -0,0 +1 @@
+"""Download, combine and process Ashok Leyland Elite Support dealer reports"""
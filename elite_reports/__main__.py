@@ -0,0 +1,4 @@
+"""python -m elite_reports: the same subcommands as the elite-reports script"""
+from .cli import main
+
+main()
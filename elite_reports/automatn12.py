@@ -0,0 +1,1213 @@
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import pandas as pd
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import Select, WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+import glob
+from .waits import timings, wait_for_step, ajax_idle, support_mode_is, field_empty, SUPPORT_HEADING_JS
+from .http_export import PortalClient, create_pool
+from .selector_cache import SelectorCache, probe_selectors
+from .sessions import SessionPool, TabbedSession, CookieStore, sign_out
+from .backfill import Checkpoint, split_by_day
+from .excel_writer import combine_workbooks
+from .ingest import DEFAULT_WORKERS
+from .parse_cache import ParseCache
+from .pipeline import process_exports, StreamingReport
+from .downloads import watcher_for, close_watchers
+from .tracing import tracer, traced
+from .scheduler import Job, JobScheduler, CircuitBreaker
+from .report_form import CASCADE, OPTIONS_JS, read_form, set_cascade, option_texts, select_all, set_select
+
+# --- CONFIGURATION ---
+CONFIG = {
+    'url': 'https://helpline.ashokleyland.com/elitesupport/',
+    'selector_cache_path': os.path.join(os.getcwd(), 'selector_cache.json'),
+    'cookie_cache_dir': os.path.join(os.getcwd(), 'session_cookies'),
+    'headless': False,
+    # Longest date range the Consolidated Report accepts in one query
+    'backfill_max_days': 31,
+    'backfill_checkpoint_path': os.path.join(os.getcwd(), 'backfill_checkpoint.jsonl'),
+    # Daily exports already downloaded, so a re-run only fetches the missing ones
+    'job_checkpoint_path': os.path.join(os.getcwd(), 'job_checkpoint.jsonl'),
+    # Every (user, mode, date range) export is a job. A failed job goes to the
+    # end of the run after an exponential backoff with jitter; after
+    # breaker_failures failures in a row all exports pause for breaker_cooldown
+    # seconds and a single job probes whether the portal has recovered
+    'retry': {
+        'max_attempts': 3,
+        'base_delay': 5,
+        'max_delay': 120,
+        'breaker_failures': 5,
+        'breaker_cooldown': 120
+    },
+    # Processes parsing downloaded files while combining (1 = parse in this process)
+    'combine_workers': DEFAULT_WORKERS,
+    # Parsed exports kept as Feather so re-runs skip XLSX parsing (None to disable)
+    'parse_cache_dir': os.path.join(os.getcwd(), 'parse_cache'),
+    'parse_cache_max_mb': 2048,
+    # Process straight into Processed_Combined_Report_<date>.xlsx instead of
+    # only writing the combined workbook for Fixing_excel.py
+    'process_report': False,
+    'keep_combined_report': False,
+    'ticket_store_path': os.path.join(os.getcwd(), 'tickets.sqlite'),
+    # Process each export while the next ones download (daily runs only, not backfills)
+    'stream_report': False,
+    # Tabs each browser exports from at once (1 = one export per browser). Tabs
+    # share their browser's login, and the portal keeps one support mode per
+    # login, so tabs only run jobs of one account in one mode side by side:
+    # the date ranges of a backfill. A daily run has one job per account and
+    # mode (E, then S) and gains nothing from tabs; use --workers for that
+    'tabs_per_browser': 1,
+    # Step spans of every run are appended here (None to disable);
+    # summarise them with: python -m elite_reports.tracing summary scraper_trace.jsonl
+    'trace_path': os.path.join(os.getcwd(), 'scraper_trace.jsonl'),
+    'login': {
+        'user_field_selectors': [
+            (By.CSS_SELECTOR, 'input[placeholder="Employee Id"]'),
+            (By.CSS_SELECTOR, 'input[name="userId"]'),
+            (By.CSS_SELECTOR, 'input[id="userId"]'),
+            (By.CSS_SELECTOR, 'input[type="text"]'),
+            (By.NAME, 'username'),
+            (By.ID, 'username')
+        ],
+        'pass_field_selectors': [
+            (By.CSS_SELECTOR, 'input[placeholder="Password"]'),
+            (By.CSS_SELECTOR, 'input[name="password"]'),
+            (By.CSS_SELECTOR, 'input[id="password"]'),
+            (By.CSS_SELECTOR, 'input[type="password"]'),
+            (By.NAME, 'password'),
+            (By.ID, 'password')
+        ],
+        'submit_button_selectors': [
+            (By.XPATH, "//button[normalize-space(text())='LOG IN']"),
+            (By.XPATH, "//button[contains(text(), 'LOG IN')]"),
+            (By.XPATH, "//button[contains(text(), 'Login')]"),
+            (By.XPATH, "//input[@type='submit']"),
+            (By.CSS_SELECTOR, 'button[type="submit"]'),
+            (By.CSS_SELECTOR, '.login-btn'),
+            (By.CSS_SELECTOR, '.btn-login')
+        ]
+    },
+    'dashboard': {
+        # Updated selectors based on the screenshot
+        'date_from_selectors': [
+            (By.CSS_SELECTOR, 'input[placeholder*="From"]'),
+            (By.ID, 'DateFrom'),
+            (By.NAME, 'dateFrom'),
+            (By.CSS_SELECTOR, 'input[type="date"]'),
+            (By.XPATH, "//input[contains(@placeholder, 'From') or contains(@name, 'from')]")
+        ],
+        'date_to_selectors': [
+            (By.CSS_SELECTOR, 'input[placeholder*="To"]'),
+            (By.ID, 'DateTo'),
+            (By.NAME, 'dateTo'),
+            (By.XPATH, "//input[contains(@placeholder, 'To') or contains(@name, 'to')]")
+        ],
+        'ticket_status_selectors': [
+            (By.CSS_SELECTOR, 'select option[value="All"]'),
+            (By.XPATH, "//select//option[text()='All']"),
+            (By.CSS_SELECTOR, 'select[class*="status"] option[value="All"]')
+        ],
+        'zone_select_selectors': [
+            (By.CSS_SELECTOR, 'select option[value="North 1"]'),
+            (By.XPATH, "//select//option[text()='North 1']"),
+            (By.CSS_SELECTOR, 'select[id*="zone"]')
+        ],
+        'region_select_selectors': [
+            (By.CSS_SELECTOR, 'select option[contains(text(), "Gurgaon")]'),
+            (By.CSS_SELECTOR, 'select option[contains(text(), "Delhi")]'),
+            (By.XPATH, "//select//option[contains(text(), 'Gurgaon') or contains(text(), 'Delhi')]")
+        ],
+        'area_select_selectors': [
+            (By.CSS_SELECTOR, 'select option[contains(text(), "Faridabad")]'),
+            (By.CSS_SELECTOR, 'select option[contains(text(), "Gurgaon")]'),
+            (By.CSS_SELECTOR, 'select option[contains(text(), "Ghaziabad")]'),
+            (By.XPATH, "//select//option[contains(text(), 'Faridabad') or contains(text(), 'Gurgaon') or contains(text(), 'Ghaziabad')]")
+        ],
+        'dealer_select_selectors': [
+            (By.CSS_SELECTOR, 'select option[contains(text(), "TTBL")]'),
+            (By.XPATH, "//select//option[contains(text(), 'TTBL')]")
+        ],
+        'tat_select_selectors': [
+            (By.CSS_SELECTOR, 'select option[value="All"]'),
+            (By.XPATH, "//select//option[text()='All']")
+        ],
+        'submit_selectors': [
+            (By.XPATH, "//button[text()='Submit']"),
+            (By.CSS_SELECTOR, 'button[type="submit"]'),
+            (By.XPATH, "//button[contains(text(), 'Submit')]"),
+            (By.CSS_SELECTOR, 'input[type="submit"]'),
+            (By.XPATH, "//input[@value='Submit']")
+        ],
+        'export_selectors': [
+            (By.XPATH, "//button[text()='Excel']"),
+            (By.CSS_SELECTOR, 'button[onclick*="excel"]'),
+            (By.XPATH, "//button[contains(text(), 'Excel')]"),
+            (By.ID, 'exportExcel'),
+            (By.CSS_SELECTOR, 'button[id*="export"]'),
+            # DataTables Excel export button selectors:
+            (By.CSS_SELECTOR, 'a.buttons-excel'),
+            (By.CSS_SELECTOR, 'a.exportExcel'),
+            (By.CSS_SELECTOR, 'a.dt-button.buttons-excel'),
+            (By.XPATH, "//a[contains(@class, 'buttons-excel')]")
+        ],
+        'no_data_selectors': [
+            (By.XPATH, "//*[contains(text(), 'No Data Found')]"),
+            (By.XPATH, "//*[contains(text(), 'No records found')]"),
+            (By.XPATH, "//*[contains(text(), 'No data available')]"),
+            (By.XPATH, "//*[contains(text(), 'No results')]")
+        ],
+        # Support type selector (top right Dealer dropdown)
+        'support_type_selectors': [
+            (By.CSS_SELECTOR, 'select.form-control'),  # Generic select dropdown
+            (By.XPATH, "//select[contains(@class, 'form-control')]"),
+            (By.CSS_SELECTOR, 'select[onchange*="support"]'),
+            (By.XPATH, "//select//option[contains(text(), 'Elite') or contains(text(), 'Standard')]/..")
+        ]
+    },
+    # Upper bound in seconds for each condition-based wait; a step returns as
+    # soon as its condition holds and only waits this long in the worst case
+    'wait_budgets': {
+        'field_clear': 2,
+        'support_type': 10,
+        'switch_mode': 15,
+        'before_filters': 10,
+        'dropdown_options': 10,
+        'after_filters': 10,
+        'before_export': 10,
+        'between_modes': 10
+    },
+    # Direct HTTP export (--http). Paths are relative to 'url' and must match
+    # the requests the portal's own Consolidated Report page sends.
+    'http_export': {
+        'login_with_browser': True,
+        'login_path': 'login',
+        # Text of the page a successful login lands on, when it is not a redirect
+        'landing_marker': 'Consolidated Report',
+        'switch_mode_path': 'switch-support?type={mode}',
+        'report_path': 'consolidated-report/data',
+        'ticket_status_values': ['All'],
+        'fields': {
+            'user_id': 'userId',
+            'password': 'password',
+            'date_from': 'dateFrom',
+            'date_to': 'dateTo',
+            'zone': 'zone',
+            'region': 'state',
+            'area': 'city',
+            'dealer': 'dealer',
+            'ticket_status': 'ticketStatus',
+            'tat': 'tat'
+        }
+    }
+}
+
+selector_cache = SelectorCache(CONFIG['selector_cache_path'])
+cookie_store = CookieStore(CONFIG['cookie_cache_dir'])
+
+# Download directory, created when a run starts
+download_dir = os.path.join(os.getcwd(), 'downloads')
+
+# User credentials and mapping
+users = [
+   # Hidden due to privacy concerns
+]
+# Support modes - These will be selected from the top-right dropdown
+modes = [
+    {'name': 'Standard Support', 'suffix': 'S', 'dropdown_text': 'Standard'},
+    {'name': 'Elite Support', 'suffix': 'E', 'dropdown_text': 'Elite'}
+]
+
+def set_report_date(day):
+    """Day a daily run exports; yesterday unless changed before main()"""
+    global report_date, yesterday, yesterday_filename
+    report_date = day
+    yesterday = day.strftime('%Y-%m-%d')
+    yesterday_filename = day.strftime('%d-%m-%Y')
+
+set_report_date((datetime.now() - timedelta(days=1)).date())
+
+def clear_download_dir(keep=()):
+    """Clear any existing files in download directory, except those in keep"""
+    for file in glob.glob(os.path.join(download_dir, "*")):
+        if file in keep:
+            continue
+        try:
+            os.remove(file)
+            print(f"Removed existing file: {file}")
+        except:
+            pass
+
+def setup_driver(download_path=None, headless=None):
+    """Setup Chrome WebDriver with robust options"""
+    options = webdriver.ChromeOptions()
+    if headless is None:
+        headless = CONFIG['headless']
+    if headless:
+        options.add_argument('--headless=new')
+        options.add_argument('--window-size=1920,1080')
+    
+    prefs = {
+        'download.default_directory': download_path or download_dir,
+        'download.prompt_for_download': False,
+        'download.directory_upgrade': True,
+        'safebrowsing.enabled': True,
+        'profile.default_content_settings.popups': 0,
+        'profile.default_content_setting_values.automatic_downloads': 1
+    }
+    options.add_experimental_option('prefs', prefs)
+    
+    # Stability options
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--disable-web-security')
+    options.add_argument('--allow-running-insecure-content')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    # Background tabs (see CONFIG['tabs_per_browser']) keep their timers and rendering at full speed
+    options.add_argument('--disable-background-timer-throttling')
+    options.add_argument('--disable-backgrounding-occluded-windows')
+    options.add_argument('--disable-renderer-backgrounding')
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    
+    options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+    
+    try:
+        driver = webdriver.Chrome(options=options)
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        driver.maximize_window()
+        return driver
+    except Exception as e:
+        print(f"Error setting up Chrome driver: {e}")
+        return None
+
+def find_element_with_fallback(driver, selectors, timeout=10, clickable=False, cache_key=None):
+    """Try multiple selectors to find an element, starting with the one that matched last time"""
+    condition = EC.element_to_be_clickable if clickable else EC.presence_of_element_located
+    cached = selector_cache.get(cache_key) if cache_key else None
+    if cached not in selectors:
+        if cached:
+            selector_cache.invalidate(cache_key)
+        cached = None
+    candidates = [cached] + [s for s in selectors if s != cached] if cached else list(selectors)
+    try:
+        # One JS probe checks every candidate per poll, so stale selectors
+        # no longer each burn a full timeout before the working one is tried
+        position = WebDriverWait(driver, timeout).until(
+            lambda d: probe_selectors(d, candidates, clickable) + 1
+        )
+        selector = candidates[position - 1]
+        element = WebDriverWait(driver, timeout).until(condition(selector))
+    except TimeoutException:
+        if cached:
+            selector_cache.invalidate(cache_key)
+        return None
+    except WebDriverException as e:
+        print(f"Selector probe failed, trying selectors one by one: {e}")
+        for selector in candidates:
+            try:
+                element = WebDriverWait(driver, timeout).until(condition(selector))
+                break
+            except TimeoutException:
+                continue
+        else:
+            return None
+    if cache_key:
+        if selector == cached:
+            selector_cache.hit()
+        else:
+            if cached:
+                selector_cache.invalidate(cache_key)
+            selector_cache.record(cache_key, selector)
+    print(f"Found element using selector: {selector}")
+    return element
+
+def wait_for_download(expected_filename_part, timeout=60, download_path=None):
+    """Wait for a file to be downloaded completely"""
+    download_path = download_path or download_dir
+    watcher = watcher_for(download_path)
+    since = watcher.mark()
+    for filename in os.listdir(download_path):
+        if expected_filename_part.lower() in filename.lower() and not filename.endswith('.crdownload'):
+            return os.path.join(download_path, filename)
+    return watcher.claim(since, timeout, lambda name: expected_filename_part.lower() in name.lower())
+
+def clear_and_send_keys(element, text):
+    """Clear field and send keys with retry mechanism"""
+    try:
+        element.clear()
+        wait_for_step(element.parent, 'field_clear', field_empty(element), CONFIG['wait_budgets']['field_clear'])
+        element.send_keys(text)
+        return True
+    except Exception as e:
+        print(f"Error in clear_and_send_keys: {e}")
+        return False
+
+def debug_page_source(driver, filename="debug_page.html"):
+    """Save page source for debugging"""
+    try:
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(driver.page_source)
+        print(f"Page source saved to {filename}")
+    except Exception as e:
+        print(f"Could not save page source: {e}")
+
+def check_login_success(driver, wait):
+    """Check if login was successful using multiple indicators"""
+    try:
+        # Check URL change
+        current_url = driver.current_url
+        if 'consolidated-report' in current_url.lower() or 'dashboard' in current_url.lower():
+            print("Login successful - redirected to dashboard/report page")
+            return True
+        
+        # Check for the "Consolidated Report" heading
+        try:
+            heading = WebDriverWait(driver, 5).until(
+                EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'Consolidated Report')]"))
+            )
+            print("Login successful - found Consolidated Report heading")
+            return True
+        except TimeoutException:
+            pass
+        
+        # Check for form elements that appear after login
+        dashboard_indicators = [
+            (By.CSS_SELECTOR, 'input[placeholder*="From"]'),  # Date From field
+            (By.CSS_SELECTOR, 'input[placeholder*="To"]'),    # Date To field
+            (By.XPATH, "//button[text()='Submit']"),          # Submit button
+            (By.XPATH, "//button[text()='Excel']"),           # Excel button
+        ]
+        
+        for selector in dashboard_indicators:
+            try:
+                element = WebDriverWait(driver, 5).until(
+                    EC.presence_of_element_located(selector)
+                )
+                print(f"Login successful - found dashboard element: {selector}")
+                return True
+            except TimeoutException:
+                continue
+        
+        print("Login status unclear - no clear indicators found")
+        return False
+        
+    except Exception as e:
+        print(f"Error checking login status: {e}")
+        return False
+
+@traced('login', lambda driver, wait, user: {'user': user['id'], 'dealer': user['dealer']})
+def login_user(driver, wait, user):
+    """Login with improved speed and success detection"""
+    try:
+        print(f"Navigating to: {CONFIG['url']}")
+        driver.get(CONFIG['url'])
+
+        # Use minimal timeout since fields should be present immediately
+        user_field = find_element_with_fallback(driver, CONFIG['login']['user_field_selectors'], timeout=2,
+                                                cache_key='login.user_field')
+        pass_field = find_element_with_fallback(driver, CONFIG['login']['pass_field_selectors'], timeout=2,
+                                                cache_key='login.pass_field')
+        submit_btn = find_element_with_fallback(driver, CONFIG['login']['submit_button_selectors'], timeout=2,
+                                                cache_key='login.submit_button')
+
+        if not user_field or not pass_field or not submit_btn:
+            print("Login fields/buttons not found quickly.")
+            return False
+
+        print("Entering credentials and clicking login immediately...")
+        clear_and_send_keys(user_field, user['id'])
+        clear_and_send_keys(pass_field, user['pass'])
+        try:
+            submit_btn.click()
+        except Exception as e:
+            print(f"Normal click failed, trying JavaScript click: {e}")
+            driver.execute_script("arguments[0].click();", submit_btn)
+
+        # Wait for dashboard element (date field or heading) after login
+        dashboard_loaded = False
+        dashboard_selectors = [
+            (By.CSS_SELECTOR, 'input[placeholder*="From"]'),
+            (By.XPATH, "//*[contains(text(), 'Consolidated Report')]")
+        ]
+        for selector in dashboard_selectors:
+            try:
+                WebDriverWait(driver, 15).until(
+                    EC.presence_of_element_located(selector)
+                )
+                dashboard_loaded = True
+                break
+            except TimeoutException:
+                continue
+        if dashboard_loaded:
+            print("Login successful - dashboard loaded")
+            return True
+        print("Login status unclear - dashboard not detected")
+        return False
+    except Exception as e:
+        print(f"Login error for {user['id']}: {e}")
+        return False
+
+def select_support_type(driver, wait, mode):
+    """Select support type from the top-right dropdown"""
+    try:
+        print(f"Selecting support type: {mode['name']}")
+        
+        # Look for the support type dropdown (likely in the top right area)
+        support_selectors = [
+            (By.XPATH, f"//select//option[contains(text(), '{mode['dropdown_text']}')]"),
+            (By.CSS_SELECTOR, f'select option[value*="{mode["dropdown_text"].lower()}"]'),
+            (By.XPATH, f"//option[contains(text(), '{mode['dropdown_text']}')]"),
+        ]
+        
+        # First, try to find the select element itself
+        select_element = find_element_with_fallback(driver, CONFIG['dashboard']['support_type_selectors'],
+                                                    cache_key='dashboard.support_type')
+        if select_element:
+            try:
+                Select(select_element).select_by_visible_text(mode['dropdown_text'])
+                print(f"Selected {mode['dropdown_text']} from dropdown")
+                wait_for_step(driver, 'support_type', ajax_idle, CONFIG['wait_budgets']['support_type'])
+                return True
+            except Exception as e:
+                print(f"Could not select from dropdown: {e}")
+        
+        # Alternative: try to find and click the option directly
+        for selector in support_selectors:
+            try:
+                option = WebDriverWait(driver, 5).until(
+                    EC.element_to_be_clickable(selector)
+                )
+                driver.execute_script("arguments[0].click();", option)
+                print(f"Clicked {mode['dropdown_text']} option")
+                wait_for_step(driver, 'support_type', ajax_idle, CONFIG['wait_budgets']['support_type'])
+                return True
+            except TimeoutException:
+                continue
+        
+        print(f"Could not find or select {mode['dropdown_text']} support type")
+        return False
+        
+    except Exception as e:
+        print(f"Error selecting support type: {e}")
+        return False
+
+@traced('set_form_filters')
+def set_form_filters(driver, wait, user, date_from_value, date_to_value=None, form_options=None):
+    """Bring the report form to this export's filters, touching only the fields that differ.
+
+    Selects ALL ticket status options. form_options caches the cascading
+    dropdowns' options for the current login, so later exports can fill
+    them without waiting on the portal's AJAX reloads.
+    """
+    date_to_value = date_to_value or date_from_value
+    form_options = {} if form_options is None else form_options
+    try:
+        print("Setting form filters...")
+        date_from = find_element_with_fallback(driver, CONFIG['dashboard']['date_from_selectors'],
+                                               cache_key='dashboard.date_from')
+        date_to = find_element_with_fallback(driver, CONFIG['dashboard']['date_to_selectors'],
+                                             cache_key='dashboard.date_to')
+        state = read_form(driver, date_from, date_to, CASCADE + ('ticketStatus', 'tat'))
+        for element, value, label, current in ((date_from, date_from_value, 'Date From', state['dates'][0]),
+                                               (date_to, date_to_value, 'Date To', state['dates'][1])):
+            if not element:
+                print(f"Could not find '{label}' field")
+            elif current != value:
+                clear_and_send_keys(element, value)
+                print(f"Set {label} to: {value}")
+
+        # Zone first; each dropdown below only changes if something above it did
+        wanted = [('zone', 'North 1'), ('state', user['region']), ('city', user['area']), ('dealer', user['dealer'])]
+        missing = set_cascade(driver, wanted, state, form_options, CONFIG['wait_budgets']['dropdown_options'])
+        if missing:
+            field, text = missing
+            options = option_texts(driver.execute_script(OPTIONS_JS, field))
+            print(f"'{text}' not found in the {field} dropdown ({len(options)} options) "
+                  f"after {CONFIG['wait_budgets']['dropdown_options']} seconds.")
+            return False
+        print(f"Dealer set to {user['dealer']}")
+
+        status = state['selects'].get('ticketStatus')
+        if status is None:
+            print("Could not find the Ticket Status field")
+        elif len(status['selected']) < len(status['options']):
+            select_all(driver, 'ticketStatus')
+            print("Selected all Ticket Status options")
+        tat = state['selects'].get('tat')
+        if tat is None:
+            print("Could not find the TAT field")
+        elif tat['selected'] != ['All']:
+            if set_select(driver, 'tat', 'All'):
+                print("Set TAT to All")
+            else:
+                print("Could not set TAT to All")
+
+        wait_for_step(driver, 'after_filters', ajax_idle, CONFIG['wait_budgets']['after_filters'])
+        return True
+    except Exception as e:
+        print(f"Error setting form filters: {e}")
+        return False
+
+def get_current_support_mode(driver):
+    """Detects the current support mode from the top-middle heading ('Elite Support' or 'Standard Support').
+
+    One script call reads every candidate heading at once instead of
+    waiting on each selector in turn.
+    """
+    try:
+        return driver.execute_script(SUPPORT_HEADING_JS)
+    except WebDriverException as e:
+        print(f"Error detecting support mode: {e}")
+        return 'Unknown'
+
+@traced('switch_support_mode', lambda driver, wait, target_mode: {'mode': target_mode['name']})
+def switch_support_mode(driver, wait, target_mode):
+    """Switch to the target support mode by clicking Dealer and selecting the other support."""
+    try:
+        current_mode = get_current_support_mode(driver)
+        print(f"Current support mode: {current_mode}")
+        print(f"Target support mode: {target_mode['name']}")
+        if current_mode == target_mode['name']:
+            print(f"Already on {target_mode['name']}")
+            return True
+        # Click Dealer button (top right)
+        try:
+            # Most robust: by id
+            dealer_btn = WebDriverWait(driver, 10).until(
+                EC.element_to_be_clickable((By.XPATH, "//a[@id='profileDropdown']"))
+            )
+            driver.execute_script("arguments[0].click();", dealer_btn)
+        except Exception:
+            # Fallback: by class
+            try:
+                dealer_btn = WebDriverWait(driver, 10).until(
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, "a#profileDropdown"))
+                )
+                driver.execute_script("arguments[0].click();", dealer_btn)
+            except Exception as e:
+                print(f"Could not find Dealer button: {e}")
+                return False
+        # Now, in the dropdown, click the correct support mode
+        try:
+            support_link = WebDriverWait(driver, 10).until(
+                EC.element_to_be_clickable((By.XPATH, f"//a[contains(@class, 'dropdown-item') and contains(., '{target_mode['dropdown_text']}')]"))
+            )
+            driver.execute_script("arguments[0].click();", support_link)
+            print(f"Clicked to switch to {target_mode['name']}")
+            switched = wait_for_step(
+                driver, 'switch_mode',
+                lambda d: support_mode_is(target_mode['name'])(d) and ajax_idle(d),
+                CONFIG['wait_budgets']['switch_mode'])
+            if switched or get_current_support_mode(driver) == target_mode['name']:
+                print(f"Switched to {target_mode['name']}")
+                return True
+            print(f"Failed to switch to {target_mode['name']} after clicking")
+            return False
+        except Exception as e:
+            print(f"Could not find support mode link in Dealer dropdown: {e}")
+            return False
+    except Exception as e:
+        print(f"Error in switch_support_mode: {e}")
+        return False
+
+def export_filename(user, mode, date_from=None, date_to=None):
+    """File name a dealer/mode export is saved under"""
+    date_from = date_from or report_date
+    date_to = date_to or date_from
+    dealer_name_clean = user['dealer'].replace(' ', '_').replace('/', '_')
+    date_label = date_from.strftime('%d-%m-%Y')
+    if date_to != date_from:
+        date_label = f"{date_label}_to_{date_to.strftime('%d-%m-%Y')}"
+    return f"{dealer_name_clean}_{date_label}_{mode['suffix']}_ALL_TICKET_STATUS.xlsx"
+
+def export_ranges(user, mode, backfill=None, checkpoint=None):
+    """(date_from, date_to) ranges still to export for a dealer/mode"""
+    if backfill is not None:
+        # A daily run clears download_dir, taking earlier backfill days' files with it
+        kept = lambda day: os.path.exists(os.path.join(download_dir, export_filename(user, mode, day)))
+        return [(chunk[0], chunk[-1]) for chunk in backfill.pending_chunks(user['dealer'], mode['suffix'], kept)]
+    if checkpoint is not None and export_done(user, mode, checkpoint):
+        return []
+    return [(report_date, report_date)]
+
+def export_done(user, mode, checkpoint):
+    """Whether an earlier run already downloaded this dealer/mode's daily export"""
+    return (checkpoint.is_done(user['dealer'], mode['suffix'], report_date)
+            and os.path.exists(os.path.join(download_dir, export_filename(user, mode))))
+
+def finished_exports(checkpoint):
+    """Daily exports kept from an earlier run, in job order"""
+    return [os.path.join(download_dir, export_filename(user, mode))
+            for user in users for mode in ordered_modes() if export_done(user, mode, checkpoint)]
+
+def ordered_modes():
+    # Always process Elite Support first, then Standard Support
+    return sorted(modes, key=lambda m: 0 if m['name'] == 'Elite Support' else 1)
+
+def build_jobs(users, backfill=None, checkpoint=None):
+    """One job per user, support mode and date range still to export"""
+    return [Job(user, mode, date_from, date_to)
+            for user in users for mode in ordered_modes()
+            for date_from, date_to in export_ranges(user, mode, backfill, checkpoint)]
+
+def job_scheduler(jobs):
+    settings = CONFIG['retry']
+    breaker = CircuitBreaker(settings['breaker_failures'], settings['breaker_cooldown'])
+    # The support mode is per account, so one account's jobs never run side by side,
+    # except in the tabs of its browser, and then only in one mode
+    return JobScheduler(jobs, settings['max_attempts'], settings['base_delay'], settings['max_delay'],
+                        breaker, key=lambda job: job.user['id'], share=lambda job: job.mode['name'])
+
+def settle_job(scheduler, job, export, checkpoint, results):
+    """Run export(job) -> (files, error) and hand the outcome to the scheduler"""
+    try:
+        files, error = export(job)
+    except Exception as e:
+        files, error = None, f"unexpected error: {e}"
+    if error:
+        scheduler.fail(job, error)
+        return
+    if checkpoint is not None:
+        checkpoint.mark_done(job.user['dealer'], job.mode['suffix'], [job.date_from])
+    results[job] = files
+    scheduler.done(job)
+
+def save_backfill_days(range_file, user, mode, date_from, date_to, backfill):
+    """Split a range export into per-day files and checkpoint the days it covered.
+
+    Every day gets a file, without rows if it had no tickets, so a day
+    checkpointed without its file is known to be missing. Rows without a
+    readable call log date go to an _UNDATED file, which is returned with
+    the daily files but left out of every day's report.
+    """
+    download_path = os.path.dirname(range_file)
+    # Other tabs may be waiting on a download into the same directory
+    watcher = watcher_for(download_path)
+    range_export = pd.read_excel(range_file)
+    per_day = split_by_day(range_export)
+    undated = per_day.pop(None, None)
+    days = [day for day in backfill.days if date_from <= day <= date_to]
+    day_files = []
+    for day in days:
+        rows = per_day.get(day, range_export.iloc[:0])
+        day_file = os.path.join(download_path, export_filename(user, mode, day))
+        watcher.reserve(day_file)
+        rows.to_excel(day_file, index=False)
+        day_files.append(day_file)
+    outside = sum(len(rows) for day, rows in per_day.items() if day not in days)
+    if outside:
+        print(f"Dropped {outside} rows dated outside {date_from} - {date_to}")
+    if undated is not None:
+        undated_name = export_filename(user, mode, date_from, date_to).replace('_ALL_TICKET_STATUS.xlsx', '_UNDATED.xlsx')
+        undated_file = os.path.join(download_path, undated_name)
+        watcher.reserve(undated_file)
+        undated.to_excel(undated_file, index=False)
+        day_files.append(undated_file)
+        print(f"Kept {len(undated)} rows without a readable Call Log Date in {undated_name}")
+    backfill.checkpoint.mark_done(user['dealer'], mode['suffix'], days)
+    if range_file not in day_files:
+        os.remove(range_file)
+    print(f"Split {os.path.basename(range_file)} into {len(day_files)} daily files")
+    return day_files
+
+@traced('export', lambda driver, wait, user, mode, *args, **kwargs: {'dealer': user['dealer'], 'mode': mode['name']})
+def process_user_mode(driver, wait, user, mode, download_path=None, date_from=None, date_to=None, form_options=None):
+    """Process a single user for a specific support mode, selecting all ticket status options at once."""
+    download_path = download_path or download_dir
+    date_from = date_from or report_date
+    date_to = date_to or date_from
+    try:
+        print(f"Processing {user['dealer']} - {mode['name']}")
+        if not switch_support_mode(driver, wait, mode):
+            print(f"Failed to switch to {mode['name']}, trying to continue anyway...")
+        wait_for_step(driver, 'before_filters', ajax_idle, CONFIG['wait_budgets']['before_filters'])
+        if not set_form_filters(driver, wait, user, date_from.strftime('%Y-%m-%d'), date_to.strftime('%Y-%m-%d'),
+                                form_options):
+            print("Failed to set some filters, continuing anyway...")
+            return None
+        print("Submitting form...")
+        submit_btn = find_element_with_fallback(driver, CONFIG['dashboard']['submit_selectors'], timeout=10,
+                                                clickable=True, cache_key='dashboard.submit')
+        if submit_btn:
+            try:
+                driver.execute_script("arguments[0].scrollIntoView(true);", submit_btn)
+                submit_btn.click()
+                print("Form submitted successfully")
+            except Exception as e:
+                print(f"Error clicking submit button: {e}")
+                return None
+        else:
+            print("Could not find submit button")
+            return None
+
+        # Wait for table to load before looking for Excel button
+        with tracer.span('table_load') as span:
+            try:
+                WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, 'table tbody tr'))
+                )
+                print("Table loaded.")
+            except TimeoutException:
+                span['status'] = 'timeout'
+                print("Table did not load in time.")
+
+        # Now look for the Excel button with a short timeout
+        print("Looking for Excel export button...")
+        export_btn = find_element_with_fallback(driver, CONFIG['dashboard']['export_selectors'], timeout=5,
+                                                clickable=True, cache_key='dashboard.export')
+        if not export_btn:
+            print(f"Excel export button not found quickly.")
+            debug_page_source(driver, f"no_excel_button_{user['id']}_{mode['suffix']}.html")
+            return None
+        return download_export(driver, export_btn, download_path, user, mode, date_from, date_to)
+    except Exception as e:
+        print(f"Error processing {user['dealer']} - {mode['name']}: {e}")
+        return None
+
+def download_export(driver, export_btn, download_path, user, mode, date_from, date_to):
+    """Click the Excel export button and claim the download under its export_filename; [path] or None"""
+    try:
+        print("Clicking Excel export button...")
+        driver.execute_script("arguments[0].scrollIntoView(true);", export_btn)
+        wait_for_step(driver, 'before_export',
+                      lambda d: ajax_idle(d) and export_btn.is_displayed() and export_btn.is_enabled(),
+                      CONFIG['wait_budgets']['before_export'])
+        # Only a file that arrives after the click, and that no other
+        # export into this directory has claimed, is this export's. Every
+        # export arrives under the same name, so tabs sharing the
+        # directory take turns
+        watcher = watcher_for(download_path)
+        with watcher.exclusive():
+            since = watcher.mark()
+            driver.execute_script("arguments[0].click();", export_btn)
+            print("Excel export button clicked")
+            print("Waiting for download to complete...")
+            with tracer.span('download') as span:
+                downloaded_file = watcher.claim(since, 45, lambda name: name.endswith('.xlsx'))
+                if not downloaded_file:
+                    span['status'] = 'timeout'
+        if not downloaded_file:
+            print(f"Download failed for {user['dealer']} - {mode['name']}")
+            return None
+        print(f"Download completed: {os.path.basename(downloaded_file)}")
+        new_filename = export_filename(user, mode, date_from, date_to)
+        new_filepath = os.path.join(download_path, new_filename)
+        try:
+            watcher.rename(downloaded_file, new_filepath)
+            print(f"File renamed to: {new_filename}")
+            return [new_filepath]
+        except Exception as e:
+            print(f"Error renaming file: {e}")
+            return [downloaded_file]
+    except Exception as e:
+        print(f"Error during download process: {e}")
+        return None
+
+@traced('sign_in', lambda driver, wait, user: {'user': user['id'], 'dealer': user['dealer']})
+def sign_in(driver, wait, user):
+    """Restore the user's cached session cookies, falling back to the login form"""
+    cookies = cookie_store.load(user['id'])
+    if cookies:
+        try:
+            # Cookies can only be set for the domain currently loaded
+            driver.get(CONFIG['url'])
+            for cookie in cookies:
+                cookie.pop('sameSite', None)
+                driver.add_cookie(cookie)
+            driver.get(CONFIG['url'])
+            if find_element_with_fallback(driver, CONFIG['dashboard']['date_from_selectors'], timeout=5,
+                                          cache_key='dashboard.date_from'):
+                print(f"Reused cached session for {user['id']}")
+                return True
+        except WebDriverException as e:
+            print(f"Could not restore cached session for {user['id']}: {e}")
+        print(f"Cached session for {user['id']} expired, logging in")
+        cookie_store.delete(user['id'])
+        sign_out(driver)
+    if not login_user(driver, wait, user):
+        return False
+    cookie_store.save(user['id'], driver.get_cookies())
+    return True
+
+def switch_user(session, user):
+    """Sign a warm browser in as user, signing out whoever was signed in"""
+    if session.user_id is not None:
+        session.sign_out()
+    print(f"\n{'='*50}")
+    print(f"Processing user: {user['id']} - {user['dealer']}")
+    print(f"{'='*50}")
+    if not sign_in(session.driver, WebDriverWait(session.driver, 20), user):
+        return False
+    session.user_id = user['id']
+    session.mode = get_current_support_mode(session.driver)
+    return True
+
+def open_report_page(driver):
+    """Load the report form again under the current login; False if the login has expired"""
+    driver.get(CONFIG['url'])
+    return find_element_with_fallback(driver, CONFIG['dashboard']['date_from_selectors'], timeout=5,
+                                      cache_key='dashboard.date_from') is not None
+
+def export_job(session, job, backfill=None, deliver=None):
+    """Run one job on a warm browser (or one of its tabs) already signed in as the job's user.
+
+    Returns (files, None), or (None, reason) when the job should be retried.
+    deliver, if given, is called with the saved files and returns their
+    final paths.
+    """
+    driver = session.driver
+    user, mode = job.user, job.mode
+    with tracer.span('job', user=user['id'], dealer=user['dealer'], mode=mode['name'],
+                     attempt=job.attempts + 1) as span:
+        try:
+            files = process_user_mode(driver, WebDriverWait(driver, 20), user, mode, session.download_path,
+                                      job.date_from, job.date_to, session.form_options)
+            if files:
+                if backfill:
+                    files = save_backfill_days(files[0], user, mode, job.date_from, job.date_to, backfill)
+                if files and deliver:
+                    files = deliver(files)
+                session.mode = mode['name']
+                wait_for_step(driver, 'between_modes', ajax_idle, CONFIG['wait_budgets']['between_modes'])
+                return files, None
+            error = "export failed"
+        except Exception as e:
+            error = f"unexpected error: {e}"
+        span['status'] = 'failed'
+        # The page may be stuck half-way through a step: the retry starts from a fresh sign-in
+        session.sign_out()
+        return None, error
+
+def run_users(users, workers=1, backfill=None, on_download=None, checkpoint=None, tabs=1):
+    """Run every user's export jobs on a pool of warm browsers, one download directory per browser.
+
+    With tabs > 1 each browser exports from that many tabs at once.
+    on_download is called with each file's final path as soon as it lands.
+    Finished daily exports are recorded in checkpoint.
+    """
+    if workers > 1:
+        worker_dirs = [os.path.join(download_dir, f'worker_{i + 1}') for i in range(workers)]
+        for worker_dir in worker_dirs:
+            os.makedirs(worker_dir, exist_ok=True)
+    else:
+        worker_dirs = [download_dir]
+    pool = SessionPool(setup_driver, worker_dirs)
+    move_lock = threading.Lock()
+    jobs = build_jobs(users, backfill, checkpoint)
+    scheduler = job_scheduler(jobs)
+    results = {}
+
+    def deliver(files):
+        moved = []
+        for file_path in files:
+            target = os.path.join(download_dir, os.path.basename(file_path))
+            if file_path != target:
+                with move_lock:
+                    shutil.move(file_path, target)
+            moved.append(target)
+            if on_download:
+                on_download(target)
+        return moved
+
+    def run_worker():
+        # Sessions go back to the pool between jobs so a crashed browser is replaced
+        while True:
+            session = pool.acquire()
+
+            def preference(job):
+                # Stay on the account this browser is signed in to, and on its
+                # current support mode, so each login switches mode at most once
+                return job.user['id'] != session.user_id, job.mode['name'] != session.mode
+
+            try:
+                if not session.driver:
+                    print("Failed to setup Chrome driver, stopping this worker.")
+                    return
+                job = scheduler.next_job(preference)
+                if job is None:
+                    if session.user_id is not None:
+                        session.sign_out()
+                    return
+                if job.user['id'] != session.user_id:
+                    try:
+                        signed_in = switch_user(session, job.user)
+                    except Exception as e:
+                        print(f"Unexpected error signing in {job.user['id']}: {e}")
+                        signed_in = False
+                    if not signed_in:
+                        session.sign_out()
+                        scheduler.fail(job, "login failed")
+                        continue
+                    # A login lands in whichever mode the portal picks: start with that mode's job
+                    job = scheduler.reconsider(job, preference)
+                settle_job(scheduler, job, lambda job: export_job(session, job, backfill, deliver),
+                           checkpoint, results)
+            finally:
+                pool.release(session)
+
+    def run_tab(browser, tab):
+        tab.use()
+
+        def preference(job):
+            return job.user['id'] != browser.user_id, job.mode['name'] != browser.mode
+
+        while True:
+            # The browser's tabs hold one account, in one mode, between them
+            job = scheduler.next_job(preference, owner=browser)
+            if job is None:
+                return
+            with browser.login_lock:
+                if not browser.is_alive():
+                    scheduler.fail(job, "browser closed")
+                    print("Browser closed, stopping its tabs.")
+                    return
+                signed_in = True
+                try:
+                    if job.user['id'] != browser.user_id:
+                        # The scheduler only hands out another account once no tab is exporting
+                        signed_in = switch_user(browser, job.user)
+                        if signed_in:
+                            browser.logins += 1
+                    elif not tab.is_current():
+                        # Another tab signed in, or switched the support mode, since this page loaded
+                        signed_in = open_report_page(browser.driver)
+                except Exception as e:
+                    print(f"Unexpected error signing in {job.user['id']}: {e}")
+                    signed_in = False
+                if not signed_in:
+                    # The next job for this browser starts from a fresh sign-in
+                    browser.sign_out()
+                    scheduler.fail(job, "login failed")
+                    continue
+                if not tab.is_current():
+                    tab.page = (browser.logins, browser.mode)
+                    # A fresh login lands in whichever mode the portal picks: start with that mode's job
+                    job = scheduler.reconsider(job, preference)
+            settle_job(scheduler, job, lambda job: export_job(tab, job, backfill, deliver), checkpoint, results)
+
+    def run_browser(browser):
+        if not browser.start(setup_driver):
+            print("Failed to setup Chrome driver, skipping this browser's tabs.")
+            return
+        with ThreadPoolExecutor(max_workers=tabs) as executor:
+            for future in [executor.submit(run_tab, browser, tab) for tab in browser.tabs]:
+                future.result()
+        if browser.is_alive() and browser.user_id is not None:
+            browser.sign_out()
+
+    try:
+        if tabs > 1:
+            browsers = [TabbedSession(worker_dir, tabs) for worker_dir in worker_dirs]
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for future in [executor.submit(run_browser, browser) for browser in browsers]:
+                        future.result()
+            finally:
+                for browser in browsers:
+                    browser.close()
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for future in [executor.submit(run_worker) for _ in range(workers)]:
+                    future.result()
+    finally:
+        pool.close()
+        close_watchers()
+    if workers > 1:
+        for worker_dir in worker_dirs:
+            shutil.rmtree(worker_dir, ignore_errors=True)
+    # Workers stop early when Chrome fails to start or closes; whatever they left goes in the summary
+    scheduler.abandon("no browser left to run it")
+    scheduler.report()
+    # Job order, not finishing order, so the combined sheets stay deterministic
+    return [file_path for job in jobs for file_path in results.get(job, [])]
+
+def http_client_for_user(user, pool):
+    """Log a user in and return a PortalClient holding the session cookies"""
+    settings = CONFIG['http_export']
+    if not settings['login_with_browser']:
+        client = PortalClient(CONFIG['url'], settings, pool=pool)
+        return client if client.login(user) else None
+    driver = setup_driver()
+    if not driver:
+        print("Failed to setup Chrome driver for login.")
+        return None
+    try:
+        if not sign_in(driver, WebDriverWait(driver, 20), user):
+            return None
+        return PortalClient.from_driver(driver, CONFIG['url'], settings, pool=pool)
+    finally:
+        driver.quit()
+
+def export_job_http(job, clients, pool, backfill=None, on_download=None):
+    """Run one job over plain HTTP, logging its user in on first use. Returns (files, error)"""
+    user, mode = job.user, job.mode
+    with tracer.span('job', user=user['id'], dealer=user['dealer'], mode=mode['name'],
+                     attempt=job.attempts + 1) as span:
+        try:
+            client = clients.get(user['id'])
+            if client is None:
+                print(f"Processing user over HTTP: {user['id']} - {user['dealer']}")
+                client = http_client_for_user(user, pool)
+                if not client:
+                    span['status'] = 'failed'
+                    return None, "login failed"
+                clients[user['id']] = client
+            if not client.switch_mode(mode):
+                print(f"Failed to switch to {mode['name']}, trying to continue anyway...")
+            file_path = client.export_report(
+                user, job.date_from.strftime('%Y-%m-%d'), job.date_to.strftime('%Y-%m-%d'),
+                os.path.join(download_dir, export_filename(user, mode, job.date_from, job.date_to)))
+            print(f"Exported: {os.path.basename(file_path)}")
+            files = [file_path]
+            if backfill:
+                files = save_backfill_days(file_path, user, mode, job.date_from, job.date_to, backfill)
+            if on_download:
+                for saved_path in files:
+                    on_download(saved_path)
+            return files, None
+        except Exception as e:
+            # Most often an expired session: the retry logs in again
+            clients.pop(user['id'], None)
+            span['status'] = 'failed'
+            return None, f"HTTP export failed: {e}"
+
+def run_http(users, workers, backfill=None, on_download=None, checkpoint=None):
+    """Export all users over HTTP, sharing one keep-alive connection pool"""
+    pool = create_pool(maxsize=workers)
+    jobs = build_jobs(users, backfill, checkpoint)
+    scheduler = job_scheduler(jobs)
+    clients = {}
+    results = {}
+
+    def current_mode(job):
+        client = clients.get(job.user['id'])
+        return client.mode if client else None
+
+    def run_worker():
+        while True:
+            # Finish a logged-in account's jobs in its current mode before switching it
+            job = scheduler.next_job(lambda job: job.mode['name'] != current_mode(job))
+            if job is None:
+                return
+            settle_job(scheduler, job, lambda job: export_job_http(job, clients, pool, backfill, on_download),
+                       checkpoint, results)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(run_worker) for _ in range(workers)]:
+            future.result()
+    scheduler.report()
+    return [file_path for job in jobs for file_path in results.get(job, [])]
+
+def open_parse_cache():
+    if not CONFIG['parse_cache_dir']:
+        return None
+    return ParseCache(CONFIG['parse_cache_dir'], CONFIG['parse_cache_max_mb'])
+
+@traced('combine', check_result=False)
+def combine_downloads(downloaded_files, date_label=None):
+    """Combine downloaded files into one workbook with a sheet per file"""
+    date_label = date_label or yesterday_filename
+    print(f"\n{'='*50}")
+    print("Combining all downloaded files into separate sheets...")
+    print(f"{'='*50}")
+    output_filename = f"Combined_Report_{date_label}.xlsx"
+    output_path = os.path.join(os.getcwd(), output_filename)
+    cache = open_parse_cache()
+    if CONFIG['process_report']:
+        process_downloads(downloaded_files, date_label, cache,
+                          output_path if CONFIG['keep_combined_report'] else None)
+        return
+    sheets_written = combine_workbooks(downloaded_files, output_path, CONFIG['combine_workers'], cache)
+    print(f"\nCombined file saved as: {output_filename}")
+    print(f"Files combined as separate sheets: {sheets_written}")
+
+def process_downloads(downloaded_files, date_label, cache=None, combined_path=None):
+    """Processed report straight from the downloads, through the ticket store"""
+    output_path = os.path.join(os.getcwd(), f"Processed_Combined_Report_{date_label}.xlsx")
+    process_exports(downloaded_files, output_path, CONFIG['ticket_store_path'],
+                    CONFIG['combine_workers'], cache, combined_path)
+
+def open_streaming_report(date_label=None):
+    """Processed report that takes each export as soon as it is downloaded"""
+    date_label = date_label or yesterday_filename
+    combined_path = None
+    if CONFIG['keep_combined_report']:
+        combined_path = os.path.join(os.getcwd(), f"Combined_Report_{date_label}.xlsx")
+    print("Processing exports as they download")
+    return StreamingReport(os.path.join(os.getcwd(), f"Processed_Combined_Report_{date_label}.xlsx"),
+                           CONFIG['ticket_store_path'], open_parse_cache(), combined_path)
+
+def main(workers=1, http=False, backfill=None):
+    """Main execution function"""
+    print(f"Processing data for date: {yesterday}")
+    os.makedirs(download_dir, exist_ok=True)
+    if CONFIG['trace_path']:
+        tracer.open(CONFIG['trace_path'])
+        print(f"Tracing run {tracer.run_id} to {CONFIG['trace_path']}")
+    checkpoint = None
+    kept_files = []
+    if backfill is None:
+        # Exports an earlier run today already finished are kept and not fetched again
+        checkpoint = Checkpoint(CONFIG['job_checkpoint_path'])
+        kept_files = finished_exports(checkpoint)
+        clear_download_dir(keep=kept_files)
+        if kept_files:
+            print(f"Keeping {len(kept_files)} exports from an earlier run")
+    else:
+        # Keep earlier days' files: the checkpoint says they are already done
+        print(f"Backfilling {backfill.days[0]} to {backfill.days[-1]}")
+    # Backfills still get one report per day once everything is downloaded
+    report = open_streaming_report() if CONFIG['stream_report'] and backfill is None else None
+    on_download = report.submit if report else None
+    try:
+        if on_download:
+            for file_path in kept_files:
+                on_download(file_path)
+        if http:
+            print("Exporting reports over direct HTTP")
+            downloaded_files = run_http(users, workers, backfill, on_download, checkpoint)
+        else:
+            if workers > 1:
+                print(f"Running {workers} browser sessions in parallel")
+            tabs = CONFIG['tabs_per_browser']
+            if tabs > 1:
+                print(f"Exporting from {tabs} tabs per browser")
+            downloaded_files = run_users(users, workers, backfill, on_download, checkpoint, tabs)
+        downloaded_files = kept_files + downloaded_files
+    finally:
+        if report:
+            with tracer.span('stream_drain'):
+                sheets_written = report.close()
+            print(f"Files processed as separate sheets: {sheets_written}")
+    timings.report()
+    selector_cache.report()
+    if report:
+        return
+    if backfill is not None:
+        # One combined report per day, including days finished by earlier runs
+        for day in backfill.days:
+            date_label = day.strftime('%d-%m-%Y')
+            day_files = sorted(glob.glob(os.path.join(download_dir, f"*_{date_label}_*_ALL_TICKET_STATUS.xlsx")))
+            if day_files:
+                combine_downloads(day_files, date_label)
+        return
+    # Combine files
+    if downloaded_files:
+        combine_downloads(downloaded_files)
+    else:
+        print("No files were downloaded successfully.")
+
+if __name__ == "__main__":
+    # Same options as 'elite-reports scrape'
+    import sys
+    from .cli import main as cli_main
+    cli_main(['scrape'] + sys.argv[1:])
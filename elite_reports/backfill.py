@@ -0,0 +1,96 @@
+"""Date-range backfill: chunked exports, per-day split and a resumable checkpoint"""
+import os
+import json
+import threading
+from datetime import timedelta
+import pandas as pd
+
+
+def date_span(start, end):
+    """Every date from start to end inclusive"""
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def chunk_days(days, max_days):
+    """Group sorted days into contiguous runs of at most max_days each"""
+    chunks = []
+    for day in sorted(days):
+        if chunks and (day - chunks[-1][-1]).days == 1 and len(chunks[-1]) < max_days:
+            chunks[-1].append(day)
+        else:
+            chunks.append([day])
+    return chunks
+
+
+def split_by_day(df, date_column='Call Log Date'):
+    """Split an export into {date: rows} by its call log date (dd-mm-yyyy).
+
+    Rows whose date is missing or unreadable are kept under None, since the
+    range export is deleted once it has been split.
+    """
+    if df.empty:
+        return {}
+    if date_column not in df.columns:
+        return {None: df}
+    dates = df[date_column]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates.astype(str), format='%d-%m-%Y', errors='coerce')
+    dated = dates.notna()
+    per_day = {day: rows for day, rows in df[dated].groupby(dates[dated].dt.date, sort=True)}
+    if not dated.all():
+        per_day[None] = df[~dated]
+    return per_day
+
+
+class Checkpoint:
+    """Append-only record of completed (dealer, mode, day) exports"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._done = set()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A crash can leave a torn last line; that day is simply redone
+                        continue
+                    self._done.add((entry['dealer'], entry['mode'], entry['day']))
+
+    def is_done(self, dealer, mode_suffix, day):
+        with self._lock:
+            return (dealer, mode_suffix, day.isoformat()) in self._done
+
+    def mark_done(self, dealer, mode_suffix, days):
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                for day in days:
+                    key = (dealer, mode_suffix, day.isoformat())
+                    if key not in self._done:
+                        self._done.add(key)
+                        f.write(json.dumps({'dealer': dealer, 'mode': mode_suffix, 'day': key[2]}) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+
+class Backfill:
+    """A date range to fetch in as few exports as the portal allows"""
+
+    def __init__(self, start, end, max_days, checkpoint):
+        if start > end:
+            raise ValueError(f"Backfill start {start} is after its end {end}")
+        self.days = date_span(start, end)
+        self.max_days = max_days
+        self.checkpoint = checkpoint
+
+    def pending_chunks(self, dealer, mode_suffix, kept=None):
+        """Date runs still missing for a dealer/mode, each one export's worth.
+
+        kept(day), when given, says whether a checkpointed day's file is
+        still on disk; days whose file has gone are fetched again.
+        """
+        pending = [day for day in self.days
+                   if not (self.checkpoint.is_done(dealer, mode_suffix, day) and (kept is None or kept(day)))]
+        return chunk_days(pending, self.max_days)
@@ -0,0 +1,99 @@
+"""Holiday calendar and business-time arithmetic for the SLA columns"""
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+
+DAY_SECONDS = 86400
+# 1970-01-01, day 0 of the index arithmetic below, was a Thursday
+EPOCH_WEEKDAY = 3
+
+
+def load_holidays(path):
+    """{region: array of datetime64[D]} from a date,region,name CSV; '' holds the national holidays"""
+    table = pd.read_csv(path, dtype=str, keep_default_na=False, comment='#')
+    days = pd.to_datetime(table['date'].str.strip(), format='%Y-%m-%d').to_numpy().astype('datetime64[D]')
+    regions = table['region'].str.strip() if 'region' in table.columns else pd.Series('', index=table.index)
+    return {region: np.unique(days[(regions == region).to_numpy()]) for region in regions.unique()}
+
+
+def _epoch_seconds(timestamps):
+    return timestamps.to_numpy().astype('datetime64[s]').astype(np.int64)
+
+
+class BusinessCalendar:
+    """Business time between timestamps, skipping weekly offs and holidays.
+
+    Only day_start to day_end (hours) of each working day counts. For each
+    region a per-day index of cumulative business seconds is built once,
+    so the business time between two timestamps is two array lookups and
+    a subtraction whatever their distance, and whole columns go in one pass.
+    """
+
+    def __init__(self, holidays=None, weekly_off=(6,), day_start=0, day_end=24):
+        self.holidays = holidays or {}
+        self.weekly_off = np.array(weekly_off, dtype=np.int64)
+        self.start = int(day_start * 3600)
+        self.window = int(day_end * 3600) - self.start
+        # region -> (first day number, working day flags, business seconds before each day)
+        self._indexes = {}
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        if not os.path.exists(path):
+            print(f"Holiday file {path} not found, only weekly offs are excluded")
+            return cls(**kwargs)
+        return cls(load_holidays(path), **kwargs)
+
+    def _holiday_days(self, region):
+        days = self.holidays.get('', np.array([], dtype='datetime64[D]'))
+        if region:
+            days = np.union1d(days, self.holidays.get(region, np.array([], dtype='datetime64[D]')))
+        return days.astype(np.int64)
+
+    def fingerprint(self, region=''):
+        """Digest of everything the region's business time depends on: offs, hours and holidays"""
+        text = repr((self.weekly_off.tolist(), self.start, self.window, self._holiday_days(region).tolist()))
+        return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+    def _index(self, region, first, last):
+        """The region's index, grown to cover day numbers first..last"""
+        index = self._indexes.get(region)
+        if index is not None:
+            start, working, _ = index
+            if start <= first and last < start + len(working):
+                return index
+            first, last = min(first, start), max(last, start + len(working) - 1)
+        days = np.arange(first, last + 1)
+        working = ~np.isin((days + EPOCH_WEEKDAY) % 7, self.weekly_off) & ~np.isin(days, self._holiday_days(region))
+        before = np.concatenate(([0], np.cumsum(working * self.window)[:-1]))
+        index = self._indexes[region] = (first, working, before)
+        return index
+
+    def _position(self, seconds, index):
+        """Business seconds from the start of the index to each timestamp"""
+        first, working, before = index
+        day = seconds // DAY_SECONDS - first
+        into_day = np.clip(seconds % DAY_SECONDS - self.start, 0, self.window)
+        return before[day] + working[day] * into_day
+
+    def elapsed(self, start, end, region=''):
+        """Business seconds from start to end for two datetime Series; NaN where either is missing"""
+        valid = (start.notna() & end.notna()).to_numpy()
+        result = np.full(len(start), np.nan)
+        if valid.any():
+            begin, finish = _epoch_seconds(start)[valid], _epoch_seconds(end)[valid]
+            index = self._index(region, int(min(begin.min(), finish.min()) // DAY_SECONDS),
+                                int(max(begin.max(), finish.max()) // DAY_SECONDS))
+            result[valid] = self._position(finish, index) - self._position(begin, index)
+        return pd.Series(result, index=start.index)
+
+    def off_days(self, timestamps, region=''):
+        """True where a datetime Series falls on a weekly off or holiday; False where missing"""
+        valid = timestamps.notna().to_numpy()
+        result = np.zeros(len(timestamps), dtype=bool)
+        if valid.any():
+            days = _epoch_seconds(timestamps)[valid] // DAY_SECONDS
+            index = self._index(region, int(days.min()), int(days.max()))
+            result[valid] = ~index[1][days - index[0]]
+        return result
@@ -0,0 +1,163 @@
+"""Elite Support reports: scrape, combine and process from one command
+
+    elite-reports scrape [--workers 4] [--tabs 3] [--headless] [--http] [--process] [--stream] [--from ... --to ...]
+    elite-reports combine [--date 2025-06-12] [--dir downloads]
+    elite-reports process [--date 2025-06-12] [--exports | --from-store]
+
+From a checkout, python -m elite_reports takes the same arguments.
+Selenium, pandas and openpyxl are only imported by the subcommand that
+needs them, so --help answers immediately. Paths default to the
+scraper's layout under the working directory.
+"""
+import os
+import argparse
+from datetime import date, datetime, timedelta
+
+
+def _yesterday():
+    return (datetime.now() - timedelta(days=1)).date()
+
+
+def _date_label(args):
+    return (args.date or _yesterday()).strftime('%d-%m-%Y')
+
+
+def _workers(args):
+    if args.workers is not None:
+        return max(1, args.workers)
+    from .ingest import DEFAULT_WORKERS
+    return DEFAULT_WORKERS
+
+
+def _parse_cache(args):
+    if args.no_cache:
+        return None
+    from .parse_cache import ParseCache
+    return ParseCache(args.cache_dir, args.cache_max_mb)
+
+
+def scrape(args):
+    from . import automatn12
+    from .automatn12 import CONFIG
+    from .backfill import Backfill, Checkpoint
+    if args.date:
+        automatn12.set_report_date(args.date)
+    CONFIG['headless'] = CONFIG['headless'] or args.headless
+    CONFIG['process_report'] = CONFIG['process_report'] or args.process
+    CONFIG['stream_report'] = CONFIG['stream_report'] or args.stream
+    if args.tabs:
+        CONFIG['tabs_per_browser'] = max(1, args.tabs)
+    backfill = None
+    if args.date_from:
+        backfill = Backfill(args.date_from, args.date_to or automatn12.report_date, CONFIG['backfill_max_days'],
+                            Checkpoint(CONFIG['backfill_checkpoint_path']))
+    automatn12.main(workers=max(1, args.workers), http=args.http, backfill=backfill)
+    if args.trace_chrome and CONFIG['trace_path']:
+        from .tracing import load_spans, chrome_trace
+        chrome_trace(load_spans([CONFIG['trace_path']], automatn12.tracer.run_id), args.trace_chrome)
+
+
+def combine(args):
+    from .combine_excels import combine_for_date
+    date_label = _date_label(args)
+    output_path = args.output or os.path.join(os.getcwd(), f"Combined_Report_{date_label}.xlsx")
+    combine_for_date(args.dir, date_label, output_path, _workers(args),
+                     None if args.no_cache else args.cache_dir, args.cache_max_mb)
+
+
+def process(args):
+    from . import Fixing_excel
+    date_label = _date_label(args)
+    output_path = args.output or os.path.join(os.getcwd(), f"Processed_Combined_Report_{date_label}.xlsx")
+    store_path = None if args.no_store else args.store
+    Fixing_excel.kpi_summary = Fixing_excel.kpi_summary and not args.no_kpi
+    if args.from_store:
+        Fixing_excel.process_store(args.store, date_label, output_path)
+        return
+    if args.exports:
+        from .combine_excels import export_files
+        from .pipeline import process_exports
+        files = export_files(args.dir, date_label)
+        if not files:
+            print("No valid Excel files found for the date in downloads directory.")
+            return
+        process_exports(files, output_path, store_path, _workers(args), _parse_cache(args))
+        return
+    combined_path = args.input or os.path.join(os.getcwd(), f"Combined_Report_{date_label}.xlsx")
+    if not os.path.exists(combined_path):
+        print(f"Combined report not found: {combined_path} (run 'combine' first, or use --exports)")
+        return
+    Fixing_excel.process_combined(combined_path, output_path, store_path, _workers(args), _parse_cache(args))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='elite-reports', description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    cwd = os.getcwd()
+
+    scrape_parser = commands.add_parser('scrape', help="Download every dealer/mode export from the portal")
+    scrape_parser.set_defaults(func=scrape)
+    scrape_parser.add_argument('--workers', type=int, default=1,
+                               help="Number of parallel browser sessions (default: 1)")
+    scrape_parser.add_argument('--tabs', type=int,
+                               help="Tabs exporting at once in each browser, sharing its login and support "
+                                    "mode, so only backfill date ranges run side by side "
+                                    "(default: CONFIG['tabs_per_browser'])")
+    scrape_parser.add_argument('--headless', action='store_true',
+                               help="Run Chrome without a visible window")
+    scrape_parser.add_argument('--http', action='store_true',
+                               help="Export over direct HTTP requests after login instead of driving the report form")
+    scrape_parser.add_argument('--process', action='store_true',
+                               help="Write the processed SLA report directly instead of only the combined workbook")
+    scrape_parser.add_argument('--stream', action='store_true',
+                               help="Process each export into the SLA report while the next ones download")
+    scrape_parser.add_argument('--trace-chrome', metavar='PATH',
+                               help="Also export this run's step spans as a Chrome-trace JSON file")
+    scrape_parser.add_argument('--date', type=date.fromisoformat,
+                               help="Day to export (YYYY-MM-DD, default: yesterday)")
+    scrape_parser.add_argument('--from', dest='date_from', type=date.fromisoformat,
+                               help="Backfill start date (YYYY-MM-DD); resumes from the checkpoint")
+    scrape_parser.add_argument('--to', dest='date_to', type=date.fromisoformat,
+                               help="Backfill end date (YYYY-MM-DD, default: yesterday)")
+
+    combine_parser = commands.add_parser('combine', help="Combine a day's exports into one workbook")
+    combine_parser.set_defaults(func=combine)
+    process_parser = commands.add_parser('process', help="Write the processed SLA report with KPI summaries")
+    process_parser.set_defaults(func=process)
+    for command in (combine_parser, process_parser):
+        command.add_argument('--date', type=date.fromisoformat,
+                             help="Report day (YYYY-MM-DD, default: yesterday)")
+        command.add_argument('--dir', default=os.path.join(cwd, 'downloads'),
+                             help="Directory holding the dealer exports (default: ./downloads)")
+        command.add_argument('-o', '--output', help="Output workbook (default: in the working directory)")
+        command.add_argument('--workers', type=int,
+                             help="Processes parsing workbooks in parallel (default: one per CPU)")
+        command.add_argument('--cache-dir', default=os.path.join(cwd, 'parse_cache'),
+                             help="Parsed-workbook cache (default: ./parse_cache)")
+        command.add_argument('--cache-max-mb', type=int, default=2048)
+        command.add_argument('--no-cache', action='store_true', help="Parse every workbook again")
+    process_parser.add_argument('--input', help="Combined workbook to process (default: ./Combined_Report_<date>.xlsx)")
+    process_parser.add_argument('--exports', action='store_true',
+                                help="Process the exports in --dir directly, without a combined workbook")
+    process_parser.add_argument('--from-store', action='store_true',
+                                help="Write the report from the tickets already processed into --store, "
+                                     "without reading any export")
+    process_parser.add_argument('--store', default=os.path.join(cwd, 'tickets.sqlite'),
+                                help="Ticket store, so unchanged tickets are not processed again")
+    process_parser.add_argument('--no-store', action='store_true', help="Process every ticket from scratch")
+    process_parser.add_argument('--no-kpi', action='store_true', help="Leave out the KPI summary sheets")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'scrape' and args.date_from:
+        date_to = args.date_to or args.date or _yesterday()
+        if args.date_from > date_to:
+            parser.error(f"--from {args.date_from} is after --to {date_to}")
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
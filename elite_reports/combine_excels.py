@@ -0,0 +1,48 @@
+import os
+from .excel_writer import combine_workbooks
+from .ingest import DEFAULT_WORKERS
+from .parse_cache import ParseCache
+
+# Set the date to search for (today's date or a specific date)
+target_date = '12-06-2025'  # Change this as needed
+
+# Directory where Excel files are saved
+DOWNLOAD_DIR = r'C:\Users\91987\TVS\downloads'
+
+# Processes parsing dealer files in parallel (1 = parse in this process)
+WORKERS = DEFAULT_WORKERS
+
+# Parsed exports kept as Feather so re-runs skip XLSX parsing (None to disable)
+PARSE_CACHE_DIR = os.path.join(DOWNLOAD_DIR, 'parse_cache')
+PARSE_CACHE_MAX_MB = 2048
+
+def export_files(directory, date_label):
+    """Dealer exports for a date, sorted so sheet order is stable; earlier reports are left out"""
+    return sorted(
+        os.path.join(directory, f)
+        for f in os.listdir(directory)
+        if f.endswith('.xlsx') and date_label in f
+        and not f.startswith(('Combined_Report_', 'Processed_Combined_Report_'))
+    )
+
+def combine_for_date(directory, date_label, output_path=None, workers=1, cache_dir=None, cache_max_mb=2048):
+    """Combine a date's exports in directory into one workbook; returns the number of sheets"""
+    output_path = output_path or os.path.join(directory, f"Combined_Report_{date_label}.xlsx")
+    files = export_files(directory, date_label)
+    if not files:
+        print("No valid Excel files found for the date in downloads directory.")
+        return 0
+    cache = ParseCache(cache_dir, cache_max_mb) if cache_dir else None
+    sheets_written = combine_workbooks(files, output_path, workers=workers, cache=cache)
+    if sheets_written:
+        print(f"\nCombined file saved as: {os.path.basename(output_path)}")
+        print(f"Files combined as separate sheets: {sheets_written}")
+    else:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        print("No valid, non-empty Excel files found for the date in downloads directory.")
+    return sheets_written
+
+if __name__ == '__main__':
+    combine_for_date(DOWNLOAD_DIR, target_date, workers=WORKERS, cache_dir=PARSE_CACHE_DIR,
+                     cache_max_mb=PARSE_CACHE_MAX_MB)
@@ -0,0 +1,143 @@
+"""Download completion from file system events, with claims so concurrent waiters never share a file"""
+import os
+import time
+import threading
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # without watchdog the directory is polled
+    Observer = None
+    FileSystemEventHandler = object
+
+# Chrome (and other browsers) write here first and rename once the download is complete
+PARTIAL_SUFFIXES = ('.crdownload', '.part', '.tmp')
+POLL_INTERVAL = 0.25
+
+
+class _ArrivalHandler(FileSystemEventHandler):
+    def __init__(self, watcher):
+        self.watcher = watcher
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.watcher._arrived(event.src_path)
+
+    def on_moved(self, event):
+        # A finished .crdownload is renamed to its real name
+        if not event.is_directory:
+            self.watcher._arrived(event.dest_path)
+
+
+class DownloadWatcher:
+    """Files arriving in one directory, in arrival order.
+
+    A waiter takes a mark() before starting its download and then claim()s
+    the first complete file to arrive after it. Claimed names are never
+    handed out again, so several downloads into the same directory each
+    get their own file. Downloads that all match the same names (the
+    portal names every export alike) are told apart by arrival order only,
+    so those take turns under exclusive().
+    """
+
+    def __init__(self, directory, use_events=True):
+        self.directory = directory
+        self._cond = threading.Condition()
+        self._arrivals = []
+        self._claimed = set()
+        self._known = set(os.listdir(directory))
+        self._exclusive = threading.Lock()
+        self._observer = None
+        if use_events and Observer is not None:
+            self._observer = Observer()
+            self._observer.daemon = True
+            self._observer.schedule(_ArrivalHandler(self), directory, recursive=False)
+            self._observer.start()
+
+    def _arrived(self, path):
+        with self._cond:
+            self._arrivals.append(os.path.basename(path))
+            self._cond.notify_all()
+
+    def _poll(self):
+        names = set(os.listdir(self.directory))
+        self._arrivals.extend(sorted(names - self._known))
+        self._known = names
+
+    def mark(self):
+        """Position to wait from: only files arriving after it are claimed"""
+        with self._cond:
+            if self._observer is None:
+                self._poll()
+            return len(self._arrivals)
+
+    def claim(self, since, timeout, match=None):
+        """Path of the first complete, unclaimed file to arrive after since, or None"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._observer is None:
+                    self._poll()
+                for name in self._arrivals[since:]:
+                    if name in self._claimed or name.endswith(PARTIAL_SUFFIXES):
+                        continue
+                    if match is not None and not match(name):
+                        continue
+                    path = os.path.join(self.directory, name)
+                    if not os.path.exists(path):
+                        continue
+                    self._claimed.add(name)
+                    return path
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining if self._observer else min(remaining, POLL_INTERVAL))
+
+    def exclusive(self):
+        """Lock to hold from mark() to claim() so no other download arrives in between"""
+        return self._exclusive
+
+    def reserve(self, path):
+        """Claim a file before writing it into the directory, so no waiter takes it for a download"""
+        with self._cond:
+            self._claimed.add(os.path.basename(path))
+
+    def rename(self, path, new_path):
+        """Rename a claimed download; its new name stays claimed and its old name is free again.
+
+        The portal names every export alike, so the next download arrives
+        under the name this one had.
+        """
+        name = os.path.basename(path)
+        with self._cond:
+            os.rename(path, new_path)
+            self._claimed.add(os.path.basename(new_path))
+            self._claimed.discard(name)
+            # Polling only sees new names, and the next download may arrive between two polls
+            self._known.discard(name)
+
+    def close(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+
+_watchers = {}
+_watchers_lock = threading.Lock()
+
+
+def watcher_for(directory):
+    """The shared watcher of a download directory, started on first use"""
+    key = os.path.abspath(directory)
+    with _watchers_lock:
+        if key not in _watchers:
+            _watchers[key] = DownloadWatcher(key)
+        return _watchers[key]
+
+
+def close_watchers():
+    with _watchers_lock:
+        for watcher in _watchers.values():
+            watcher.close()
+        _watchers.clear()
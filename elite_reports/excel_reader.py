@@ -0,0 +1,197 @@
+"""Stream chosen columns of a sheet straight from the XLSX XML"""
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+from openpyxl.utils.datetime import from_excel, from_ISO8601, CALENDAR_WINDOWS_1900, CALENDAR_MAC_1904
+
+MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+RELS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+REL_ID = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+CUSTOM = '{http://schemas.openxmlformats.org/officeDocument/2006/custom-properties}'
+ROW, CELL, VALUE, INLINE, TEXT, RUN = (MAIN + tag for tag in ('row', 'c', 'v', 'is', 't', 'r'))
+DIGITS = '0123456789'
+
+
+def _column_number(letters):
+    number = 0
+    for letter in letters:
+        number = number * 26 + ord(letter) - 64
+    return number
+
+
+def _text(element):
+    """Plain text of an <si> or <is>: its <t> then the <t> of each rich text run, as openpyxl joins them"""
+    plain = element.findtext(TEXT)
+    runs = [run.findtext(TEXT) or '' for run in element.findall(RUN)]
+    return ''.join([plain or ''] + runs) if plain is not None or runs else None
+
+
+def _number(text):
+    value = float(text) if '.' in text or 'E' in text or 'e' in text else int(text)
+    # Whole floats come back as ints, as pd.read_excel gives them
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+class XlsxReader:
+    """An XLSX workbook whose sheets are read as rows of the wanted columns only.
+
+    openpyxl turns every cell of every row into a Python value; here the
+    sheet XML is walked once with ElementTree and only cells under the
+    wanted headers are converted, the others are only checked for being
+    blank. Values come back as pd.read_excel reads them through openpyxl:
+    numbers (whole ones as int), dates by cell style, shared and inline
+    strings, booleans, and error cells as missing.
+    """
+
+    def __init__(self, path):
+        self._zip = zipfile.ZipFile(path)
+        try:
+            self._load_workbook()
+        except Exception:
+            self._zip.close()
+            raise
+        self._shared_strings = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._zip.close()
+
+    def _relationships(self, part):
+        """{id: (type, part name)} of a part's relationships"""
+        folder, name = posixpath.split(part)
+        rels_path = posixpath.join(folder, '_rels', f"{name}.rels")
+        if rels_path not in self._zip.namelist():
+            return {}
+        relationships = {}
+        for rel in ET.fromstring(self._zip.read(rels_path)).iter(RELS + 'Relationship'):
+            target = rel.get('Target')
+            target = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join(folder, target))
+            relationships[rel.get('Id')] = (rel.get('Type').rsplit('/', 1)[-1], target)
+        return relationships
+
+    def _load_workbook(self):
+        workbook = next(target for kind, target in self._relationships('').values() if kind == 'officeDocument')
+        relationships = self._relationships(workbook)
+        parts = {kind: target for kind, target in relationships.values()}
+        root = ET.fromstring(self._zip.read(workbook))
+        properties = root.find(MAIN + 'workbookPr')
+        date1904 = properties is not None and properties.get('date1904') in ('1', 'true')
+        self.epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+        self._sheets = {}
+        for sheet in root.iter(MAIN + 'sheet'):
+            kind, target = relationships.get(sheet.get(REL_ID), (None, None))
+            if kind == 'worksheet':
+                self._sheets[sheet.get('name')] = target
+        self.sheet_names = list(self._sheets)
+        self._strings_part = parts.get('sharedStrings')
+        self._date_styles, self._timedelta_styles = self._number_styles(parts.get('styles'))
+
+    def custom_properties(self):
+        """The workbook's custom document properties as {name: text}"""
+        part = next((target for kind, target in self._relationships('').values() if kind == 'custom-properties'), None)
+        if part is None or part not in self._zip.namelist():
+            return {}
+        root = ET.fromstring(self._zip.read(part))
+        return {prop.get('name'): ''.join(prop.itertext()) for prop in root.iter(CUSTOM + 'property')}
+
+    def _number_styles(self, part):
+        """Indexes of the cell styles that format numbers as dates, and as durations"""
+        dates, durations = set(), set()
+        if part is None:
+            return dates, durations
+        root = ET.fromstring(self._zip.read(part))
+        custom = {int(fmt.get('numFmtId')): fmt.get('formatCode') for fmt in root.iter(MAIN + 'numFmt')}
+        cell_styles = root.find(MAIN + 'cellXfs')
+        for index, style in enumerate(cell_styles if cell_styles is not None else ()):
+            number_format = int(style.get('numFmtId', 0))
+            code = custom.get(number_format, BUILTIN_FORMATS.get(number_format))
+            if code and is_date_format(code):
+                dates.add(index)
+            if code and is_timedelta_format(code):
+                durations.add(index)
+        return dates, durations
+
+    def _strings(self):
+        if self._shared_strings is None:
+            self._shared_strings = []
+            if self._strings_part is not None:
+                with self._zip.open(self._strings_part) as source:
+                    for _, element in ET.iterparse(source):
+                        if element.tag == MAIN + 'si':
+                            self._shared_strings.append((_text(element) or '').replace('x005F_', ''))
+                            element.clear()
+        return self._shared_strings
+
+    def _value(self, cell):
+        kind = cell.get('t', 'n')
+        if kind == 'inlineStr':
+            child = cell.find(INLINE)
+            return _text(child) if child is not None else None
+        text = cell.findtext(VALUE)
+        if not text:
+            return None
+        if kind == 'n':
+            value = _number(text)
+            style = int(cell.get('s', 0))
+            if style in self._date_styles:
+                try:
+                    return from_excel(value, self.epoch, timedelta=style in self._timedelta_styles)
+                except (OverflowError, ValueError):
+                    return None
+            return value
+        if kind == 's':
+            return self._strings()[int(text)]
+        if kind == 'b':
+            return bool(int(text))
+        if kind == 'd':
+            return from_ISO8601(text)
+        if kind == 'e':
+            return None
+        return text
+
+    def rows(self, sheet, columns):
+        """Header, then non-blank rows of a sheet (name or position), holding only the given columns.
+
+        Only cells under those header names are read; header and rows keep
+        them in sheet order. A row is blank only if all of its cells are,
+        wanted or not, as in openpyxl's read-only rows.
+        """
+        name = self.sheet_names[sheet] if isinstance(sheet, int) else sheet
+        columns = set(columns)
+        wanted = keep = None
+        with self._zip.open(self._sheets[name]) as source:
+            for _, element in ET.iterparse(source):
+                if element.tag != ROW:
+                    continue
+                values = {}
+                filled = False
+                position = 0
+                for cell in element:
+                    if cell.tag != CELL:
+                        continue
+                    reference = cell.get('r')
+                    position = _column_number(reference.rstrip(DIGITS)) if reference else position + 1
+                    if keep is not None and position not in keep:
+                        filled = filled or bool(cell.findtext(VALUE)) or cell.find(INLINE) is not None
+                        continue
+                    value = self._value(cell)
+                    if value is not None:
+                        values[position] = value
+                element.clear()
+                if not values and not filled:
+                    continue
+                if wanted is None:
+                    # The header row decides which cells of the data rows are read
+                    wanted = [number for number in sorted(values) if values[number] in columns]
+                    keep = set(wanted)
+                    yield tuple(values[number] for number in wanted)
+                    continue
+                yield tuple(values.get(number) for number in wanted)
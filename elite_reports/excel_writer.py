@@ -0,0 +1,254 @@
+"""Single-pass XLSX writing with column widths and styles computed from the data"""
+import os
+import re
+import datetime
+import itertools
+import pandas as pd
+from .ingest import ordered_map, read_rows, source_rows
+
+try:
+    import xlsxwriter
+except ImportError:  # openpyxl's write-only mode is the fallback
+    xlsxwriter = None
+
+DATETIME_FORMAT = 'yyyy-mm-dd hh:mm:ss'
+DATE_FORMAT = 'yyyy-mm-dd'
+TIME_FORMAT = 'hh:mm:ss'
+SHEET_NAME_MAX = 31  # Excel's limit
+
+
+def column_widths(df):
+    """Width per column: longest str(value) including the header, plus 2.
+
+    Falsy values (blank, 0, False) are not counted, as in the old
+    cell-by-cell auto fit.
+    """
+    widths = []
+    for name in df.columns:
+        column = df[name]
+        counted = column[column.notna() & column.astype(bool)]
+        longest = int(counted.astype(str).str.len().max()) if len(counted) else 0
+        widths.append(max(longest, len(str(name))) + 2)
+    return widths
+
+
+def _value_format(value):
+    if isinstance(value, datetime.datetime):
+        return DATETIME_FORMAT
+    if isinstance(value, datetime.date):
+        return DATE_FORMAT
+    if isinstance(value, datetime.time):
+        return TIME_FORMAT
+    return None
+
+
+def _number_format(column):
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return DATETIME_FORMAT
+    sample = column.dropna()
+    return _value_format(sample.iloc[0]) if len(sample) else None
+
+
+def _rows(df):
+    """Row tuples of native values, with None for anything missing"""
+    columns = [df[name].astype(object).where(df[name].notna(), None) for name in df.columns]
+    return zip(*columns) if columns else iter(())
+
+
+class WorkbookWriter:
+    """Writes DataFrames as sheets in one pass, widths and wrap style included.
+
+    Uses xlsxwriter in constant-memory mode when installed, otherwise
+    openpyxl's write-only workbook; either way rows go straight to disk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._names = set()  # Excel compares sheet names case-insensitively
+        if xlsxwriter is not None:
+            self._book = xlsxwriter.Workbook(path, {'constant_memory': True})
+            self._formats = {}
+        else:
+            from openpyxl import Workbook
+            self._book = Workbook(write_only=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def unique_name(self, name):
+        """name as a valid sheet name not yet used in this workbook, with a counter if it is"""
+        name = re.sub(r'[\[\]:*?/\\]', '_', name)[:SHEET_NAME_MAX]
+        candidate, count = name, 1
+        while candidate.lower() in self._names:
+            count += 1
+            tag = f" ({count})"
+            candidate = name[:SHEET_NAME_MAX - len(tag)] + tag
+        return candidate
+
+    def _claim_name(self, name):
+        name = self.unique_name(name)
+        self._names.add(name.lower())
+        return name
+
+    def add_sheet(self, name, df):
+        """Write df as a new sheet; returns the sheet name used (see unique_name)"""
+        name = self._claim_name(name)
+        widths = column_widths(df)
+        number_formats = [_number_format(df[col]) for col in df.columns]
+        if xlsxwriter is not None:
+            self._add_xlsxwriter_sheet(name, df, widths, number_formats)
+        else:
+            self._add_openpyxl_sheet(name, df, widths, number_formats)
+        return name
+
+    def set_property(self, name, value):
+        """Custom document property of the workbook (text, up to 255 characters)"""
+        if xlsxwriter is not None:
+            self._book.set_custom_property(name, value)
+        else:
+            from openpyxl.packaging.custom import StringProperty
+            self._book.custom_doc_props.append(StringProperty(name=name, value=value))
+
+    def add_rows(self, name, rows):
+        """Stream an iterable of row tuples (header first) into a new sheet; returns its name"""
+        name = self._claim_name(name)
+        if xlsxwriter is not None:
+            ws = self._book.add_worksheet(name)
+            header_format = self._format(header=True, wrap=False)
+            for row_number, values in enumerate(rows):
+                for col, value in enumerate(values):
+                    if value is None:
+                        continue
+                    if row_number == 0:
+                        ws.write(0, col, value, header_format)
+                        continue
+                    number_format = _value_format(value)
+                    if number_format is None:
+                        ws.write(row_number, col, value)
+                    else:
+                        ws.write(row_number, col, value, self._format(number_format, wrap=False))
+        else:
+            ws = self._book.create_sheet(name)
+            for values in rows:
+                ws.append(values)
+        return name
+
+    def _format(self, number_format=None, header=False, wrap=True):
+        key = (number_format, header, wrap)
+        if key not in self._formats:
+            props = {'text_wrap': True, 'valign': 'top'} if wrap else {}
+            if number_format:
+                props['num_format'] = number_format
+            if header:
+                props.update({'bold': True, 'border': 1})
+            self._formats[key] = self._book.add_format(props)
+        return self._formats[key]
+
+    def _add_xlsxwriter_sheet(self, name, df, widths, number_formats):
+        ws = self._book.add_worksheet(name)
+        formats = [self._format(fmt) for fmt in number_formats]
+        for col, width in enumerate(widths):
+            ws.set_column(col, col, width, formats[col])
+        header_format = self._format(header=True)
+        for col, title in enumerate(df.columns):
+            ws.write(0, col, str(title), header_format)
+        for row, values in enumerate(_rows(df), start=1):
+            for col, value in enumerate(values):
+                if value is not None:
+                    ws.write(row, col, value, formats[col])
+
+    def _add_openpyxl_sheet(self, name, df, widths, number_formats):
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Alignment, Font, Border, Side
+        from openpyxl.utils import get_column_letter
+        ws = self._book.create_sheet(name)
+        for col, width in enumerate(widths, start=1):
+            ws.column_dimensions[get_column_letter(col)].width = width
+        alignment = Alignment(wrap_text=True, vertical='top')
+        thin = Side(style='thin')
+        header = []
+        for title in df.columns:
+            cell = WriteOnlyCell(ws, value=str(title))
+            cell.font = Font(bold=True)
+            cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+            cell.alignment = alignment
+            header.append(cell)
+        ws.append(header)
+        for values in _rows(df):
+            row = []
+            for value, number_format in zip(values, number_formats):
+                cell = WriteOnlyCell(ws, value=value)
+                cell.alignment = alignment
+                if number_format and value is not None:
+                    cell.number_format = number_format
+                row.append(cell)
+            ws.append(row)
+
+    def close(self):
+        if xlsxwriter is not None:
+            self._book.close()
+        else:
+            self._book.save(self.path)
+
+
+def sheet_name_for(path):
+    """Sheet name for an export in a combined workbook.
+
+    The file name cut to 31 characters, as long as that keeps the date and
+    mode; for longer dealer names the dealer part is shortened instead, so
+    the E and S exports of one dealer stay apart.
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    match = re.match(r'^(.*?)(_\d{2}-\d{2}-\d{4}(?:_to_\d{2}-\d{2}-\d{4})?_[ES])(?:_|$)', stem)
+    if match and len(match.group(1) + match.group(2)) > SHEET_NAME_MAX:
+        dealer, suffix = match.groups()
+        return dealer[:SHEET_NAME_MAX - len(suffix)] + suffix
+    return stem[:SHEET_NAME_MAX]
+
+
+def source_property(sheet_name):
+    """Custom property of a combined workbook naming the export file a sheet was copied from"""
+    return f"Source {sheet_name}"
+
+
+def frame_rows(df):
+    """Header then data rows of a parsed sheet, as add_rows takes them"""
+    return itertools.chain([tuple(str(name) for name in df.columns)], _rows(df))
+
+
+def combine_workbooks(paths, output_path, workers=1, cache=None):
+    """Copy each workbook's first sheet into output_path, one sheet per file.
+
+    Rows are streamed from openpyxl's read-only reader into the
+    constant-memory writer, so memory stays flat however many rows the
+    inputs hold. With workers > 1 the files are parsed in that many
+    processes instead, and a few parsed files at a time wait for the
+    writer, which still adds sheets in input order. With a ParseCache
+    each file is loaded from, or parsed into, the cache instead. Files
+    without data rows are skipped. Returns the number of sheets written.
+    """
+    sheets_written = 0
+    if cache is not None:
+        read = cache.read_excel
+    else:
+        read = source_rows if workers <= 1 else read_rows
+    with WorkbookWriter(output_path) as writer:
+        for file_path, parsed in ordered_map(read, paths, workers):
+            try:
+                print(f"Reading: {os.path.basename(file_path)}")
+                rows = iter(parsed.result()) if cache is None else frame_rows(parsed.result())
+                header = next(rows, None)
+                first = next(rows, None)
+                if header is None or first is None:
+                    print(f"Skipped empty file: {file_path}")
+                    continue
+                sheet_name = writer.add_rows(sheet_name_for(file_path), itertools.chain([header, first], rows))
+                # The sheet name can be too short for the dealer, date and mode the processing needs
+                writer.set_property(source_property(sheet_name), os.path.basename(file_path))
+                sheets_written += 1
+            except Exception as e:
+                print(f"Error reading {file_path}: {e}")
+    return sheets_written
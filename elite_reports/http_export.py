@@ -0,0 +1,130 @@
+"""Direct HTTP export of consolidated reports, bypassing the browser after login"""
+import os
+import json
+from http.cookies import SimpleCookie
+from urllib.parse import urljoin, urlencode
+import urllib3
+import pandas as pd
+
+XLSX_MAGIC = b'PK\x03\x04'
+
+
+def create_pool(maxsize=4, timeout=30):
+    """Shared keep-alive connection pool for all portal clients"""
+    return urllib3.PoolManager(
+        maxsize=maxsize,
+        block=True,
+        timeout=urllib3.Timeout(connect=10, read=timeout),
+        retries=urllib3.Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504)),
+    )
+
+
+class PortalClient:
+    """One authenticated portal session speaking plain HTTP.
+
+    base_url and the endpoint paths come from CONFIG['http_export'], so a
+    local stub server implementing the same endpoints can stand in for the
+    live portal.
+    """
+
+    def __init__(self, base_url, settings, pool=None, cookies=None):
+        self.base_url = base_url if base_url.endswith('/') else base_url + '/'
+        self.settings = settings
+        self.pool = pool or create_pool()
+        self.cookies = dict(cookies or {})
+        # Support mode this session was last switched to (None until the first switch)
+        self.mode = None
+
+    @classmethod
+    def from_driver(cls, driver, base_url, settings, pool=None):
+        """Reuse the cookies of a browser session that has already logged in"""
+        cookies = {c['name']: c['value'] for c in driver.get_cookies()}
+        return cls(base_url, settings, pool=pool, cookies=cookies)
+
+    def _request(self, method, path, fields=None):
+        headers = {'X-Requested-With': 'XMLHttpRequest'}
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f"{k}={v}" for k, v in self.cookies.items())
+        url = urljoin(self.base_url, path)
+        if method == 'GET' and fields:
+            url = f"{url}?{urlencode(fields, doseq=True)}"
+            fields = None
+        body = urlencode(fields, doseq=True) if fields else None
+        if body:
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        response = self.pool.request(method, url, body=body, headers=headers, redirect=False)
+        for header in response.headers.getlist('Set-Cookie'):
+            cookie = SimpleCookie()
+            cookie.load(header)
+            for name, morsel in cookie.items():
+                self.cookies[name] = morsel.value
+        return response
+
+    def login(self, user):
+        """Log in with the portal's login form, without a browser"""
+        fields = self.settings['fields']
+        response = self._request('POST', self.settings['login_path'], {
+            fields['user_id']: user['id'],
+            fields['password']: user['pass'],
+        })
+        if response.status in (301, 302, 303):
+            location = response.headers.get('Location', '')
+            return self.settings['login_path'] not in location
+        if response.status != 200:
+            return False
+        # A failed login renders the form again, often setting a session cookie on the way
+        page = response.data.decode('utf-8', 'replace')
+        return self.settings['landing_marker'] in page and 'type="password"' not in page
+
+    def switch_mode(self, mode):
+        """Switch the session's support mode the way the profile dropdown does"""
+        if self.mode == mode['name']:
+            return True
+        path = self.settings['switch_mode_path'].format(mode=mode['dropdown_text'])
+        response = self._request('GET', path)
+        switched = response.status in (200, 301, 302, 303)
+        self.mode = mode['name'] if switched else None
+        return switched
+
+    def report_query(self, user, date_from, date_to):
+        """Form fields of the Consolidated Report query for one dealer"""
+        fields = self.settings['fields']
+        return {
+            fields['date_from']: date_from,
+            fields['date_to']: date_to,
+            fields['zone']: 'North 1',
+            fields['region']: user['region'],
+            fields['area']: user['area'],
+            fields['dealer']: user['dealer'],
+            fields['ticket_status']: self.settings['ticket_status_values'],
+            fields['tat']: 'All',
+        }
+
+    def fetch_report(self, user, date_from, date_to):
+        """Run the report query; returns raw XLSX bytes or a DataFrame of rows"""
+        response = self._request('POST', self.settings['report_path'],
+                                 self.report_query(user, date_from, date_to))
+        if response.status != 200:
+            raise RuntimeError(f"Report request failed with HTTP {response.status}")
+        if response.data.startswith(XLSX_MAGIC):
+            return response.data
+        payload = json.loads(response.data.decode('utf-8'))
+        # DataTables convention: {"data": [...], "columns": [...]} with rows
+        # either as objects or as arrays aligned to the column titles
+        rows = payload.get('data', []) if isinstance(payload, dict) else payload
+        columns = payload.get('columns') if isinstance(payload, dict) else None
+        if columns and rows and not isinstance(rows[0], dict):
+            titles = [c['title'] if isinstance(c, dict) else c for c in columns]
+            return pd.DataFrame(rows, columns=titles)
+        return pd.DataFrame(rows)
+
+    def export_report(self, user, date_from, date_to, file_path):
+        """Fetch one dealer's report and save it as an XLSX export"""
+        report = self.fetch_report(user, date_from, date_to)
+        os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+        if isinstance(report, bytes):
+            with open(file_path, 'wb') as f:
+                f.write(report)
+        else:
+            report.to_excel(file_path, index=False)
+        return file_path
@@ -0,0 +1,194 @@
+"""Parse workbooks in worker processes and hand the results back in input order"""
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+import pandas as pd
+
+# Worker processes to parse with; 1 parses in this process
+DEFAULT_WORKERS = os.cpu_count() or 1
+# Text pd.read_excel reads as missing by default
+NA_VALUES = frozenset({
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+})
+
+
+def ordered_map(func, items, workers=1, prefetch=2):
+    """Yield a Future per item, in order, with func(item) computed by a pool.
+
+    At most workers * prefetch items are in flight, so results that the
+    caller has not consumed yet do not pile up in memory. A failure comes
+    out of that item's future.result() and does not stop the others.
+    """
+    if workers <= 1:
+        for item in items:
+            future = Future()
+            try:
+                future.set_result(func(item))
+            except Exception as e:
+                future.set_exception(e)
+            yield item, future
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append((item, pool.submit(func, item)))
+            if len(pending) >= workers * prefetch:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+
+
+def worksheet_rows(ws):
+    """Non-blank rows of an openpyxl worksheet, as value tuples"""
+    for values in ws.iter_rows(values_only=True):
+        if any(value is not None for value in values):
+            yield values
+
+
+def source_rows(path):
+    """Non-blank rows of a workbook's first sheet, read lazily"""
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from worksheet_rows(wb.worksheets[0])
+    finally:
+        wb.close()
+
+
+def read_rows(path):
+    """All non-blank rows of a workbook's first sheet"""
+    return list(source_rows(path))
+
+
+def _cell(row, position):
+    # Rows can stop short of the header
+    return row[position] if position < len(row) else None
+
+
+def _astype(series, dtype):
+    # Before pandas 3, astype('str') turns missing values into the text 'nan'
+    if dtype in ('str', str):
+        return series.astype(str).where(series.notna(), None)
+    return series.astype(dtype)
+
+
+class ColumnSpec:
+    """Which columns of a sheet to parse, their dtypes, and a (column, value) rows must match.
+
+    Only those columns are read from the sheet (see excel_reader), and
+    rows failing the filter are dropped as they are read, before pandas
+    sees them. Columns a sheet lacks are left out; a column without a
+    dtype gets the one pd.read_excel would infer, and blank or 'NA'-like
+    text is missing either way. A sheet without data rows comes back with
+    its columns and dtypes but no rows, like one whose rows were all
+    filtered out (has_data_rows tells them apart).
+    """
+
+    def __init__(self, columns, dtypes=None, where=None):
+        self.columns = list(columns)
+        self.dtypes = dict(dtypes or {})
+        self.where = where
+
+    def key(self):
+        """Stable description, for keying parsed results"""
+        return repr((self.columns, sorted(self.dtypes.items()), self.where))
+
+    def names(self):
+        """Header names to read: the columns and the one filtered on"""
+        if self.where and self.where[0] not in self.columns:
+            return self.columns + [self.where[0]]
+        return self.columns
+
+    def _series(self, name, values):
+        series = pd.Series(values, dtype=object)
+        series = series.where(series.notna() & ~series.isin(NA_VALUES))
+        dtype = self.dtypes.get(name)
+        if dtype:
+            return _astype(series, dtype)
+        series = series.infer_objects()
+        if len(series) and (series.dtype == object or pd.api.types.is_string_dtype(series)):
+            # Numeric text becomes numbers, as pd.read_excel's parser does
+            try:
+                return pd.to_numeric(series)
+            except (ValueError, TypeError):
+                pass
+        return series
+
+    def frame(self, rows):
+        """DataFrame from a header-first stream of row tuples"""
+        header = next(rows, None) or ()
+        positions = {}
+        for position, name in enumerate(header):
+            positions.setdefault(name, position)
+        names = [name for name in self.columns if name in positions]
+        test = positions.get(self.where[0]) if self.where else None
+        kept = [row for row in rows if test is None or _cell(row, test) == self.where[1]]
+        return pd.DataFrame({name: self._series(name, [_cell(row, positions[name]) for row in kept])
+                             for name in names})
+
+    def select(self, df):
+        """The same columns, dtypes and rows from a frame parsed in full"""
+        if self.where and self.where[0] in df.columns:
+            df = df[df[self.where[0]] == self.where[1]]
+        df = df[[name for name in self.columns if name in df.columns]].reset_index(drop=True)
+        return pd.DataFrame({name: _astype(df[name], self.dtypes[name]) if self.dtypes.get(name) else df[name]
+                             for name in df.columns})
+
+
+def has_data_rows(path, sheet_name=0):
+    """Whether a sheet has a non-blank row under its header, reading no further than that row"""
+    from .excel_reader import XlsxReader
+    with XlsxReader(path) as book:
+        rows = book.rows(sheet_name, ())
+        return next(rows, None) is not None and next(rows, None) is not None
+
+
+def read_frame(path, sheet_name=0, spec=None, cache=None):
+    """One sheet (by name or position) as a DataFrame, cut down by a ColumnSpec when given.
+
+    With a ParseCache, a sheet parsed the same way by an earlier run is
+    loaded from it.
+    """
+    if cache is not None:
+        return cache.read_excel(path, sheet_name, spec=spec)
+    if spec is None:
+        return pd.read_excel(path, sheet_name=sheet_name)
+    from .excel_reader import XlsxReader
+    with XlsxReader(path) as book:
+        return spec.frame(book.rows(sheet_name, spec.names()))
+
+
+def read_sheet(task):
+    """One sheet of a workbook as a DataFrame; task is (path, sheet_name, cache, digest, spec)"""
+    path, sheet_name, cache, digest, spec = task
+    if cache is not None:
+        return cache.read_excel(path, sheet_name, digest, spec)
+    return read_frame(path, sheet_name, spec)
+
+
+def read_sheets(path, workers=1, cache=None, spec=None):
+    """Yield (sheet_name, DataFrame) for every sheet, parsed by up to workers processes.
+
+    With a ColumnSpec only its columns and rows are parsed, and with a
+    ParseCache, sheets parsed by an earlier run are loaded from it.
+    """
+    if spec is not None:
+        from .excel_reader import XlsxReader
+        with XlsxReader(path) as book:
+            sheet_names = book.sheet_names
+            if cache is None and (workers <= 1 or len(sheet_names) < 2):
+                for sheet_name in sheet_names:
+                    yield sheet_name, spec.frame(book.rows(sheet_name, spec.names()))
+                return
+    else:
+        with pd.ExcelFile(path) as xls:
+            sheet_names = xls.sheet_names
+            if cache is None and (workers <= 1 or len(sheet_names) < 2):
+                for sheet_name in sheet_names:
+                    yield sheet_name, pd.read_excel(xls, sheet_name=sheet_name)
+                return
+    digest = cache.digest(path) if cache is not None else None
+    tasks = [(path, sheet_name, cache, digest, spec) for sheet_name in sheet_names]
+    for (_, sheet_name, _, _, _), future in ordered_map(read_sheet, tasks, min(workers, len(tasks))):
+        yield sheet_name, future.result()
@@ -0,0 +1,95 @@
+"""Parse each exported workbook once: parsed sheets cached as Feather by content hash"""
+import os
+import hashlib
+from .ingest import read_frame
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # without pyarrow every read parses the workbook
+    feather = None
+
+# Bump when the parsing or the stored layout changes, so old entries are not reused
+CACHE_VERSION = 2
+HASH_BLOCK = 1024 * 1024
+
+
+class ParseCache:
+    """Parsed sheets keyed by workbook content and sheet name, evicted LRU by size.
+
+    Entries are uncompressed Feather (Arrow IPC) files read through a
+    memory map, so numeric columns come back without a copy.
+    """
+
+    def __init__(self, directory, max_mb=2048):
+        self.directory = directory
+        self.max_bytes = max_mb * 1024 * 1024
+        os.makedirs(directory, exist_ok=True)
+
+    def digest(self, path):
+        """SHA-256 of a workbook's bytes; renamed or re-downloaded copies share entries"""
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK), b''):
+                sha.update(block)
+        return sha.hexdigest()
+
+    def _entry_path(self, digest, sheet_name, spec=None):
+        key = f"{CACHE_VERSION}\0{digest}\0{sheet_name!r}"
+        if spec is not None:
+            key += f"\0{spec.key()}"
+        key = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{key}.feather")
+
+    def read_excel(self, path, sheet_name=0, digest=None, spec=None):
+        """ingest.read_frame(path, sheet_name, spec), parsed at most once per content and spec"""
+        if feather is None:
+            return read_frame(path, sheet_name, spec)
+        entry = self._entry_path(digest or self.digest(path), sheet_name, spec)
+        try:
+            df = feather.read_feather(entry, memory_map=True)
+            os.utime(entry)  # mark as recently used
+            return df
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Ignoring unreadable parse cache entry {entry}: {e}")
+        df = read_frame(path, sheet_name, spec)
+        self._store(entry, df)
+        return df
+
+    def _store(self, entry, df):
+        tmp_path = f"{entry}.{os.getpid()}.tmp"
+        try:
+            feather.write_feather(df, tmp_path, compression='uncompressed')
+            os.replace(tmp_path, entry)
+        except Exception as e:
+            # e.g. a column mixing numbers and text, which Arrow cannot type
+            print(f"Not caching {os.path.basename(entry)}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._evict(keep=entry)
+
+    def _evict(self, keep):
+        """Drop least recently used entries until the cache fits its budget"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.feather'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:  # evicted by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:  # already gone, or still mapped by a reader on Windows
+                continue
+            total -= size
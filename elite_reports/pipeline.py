@@ -0,0 +1,152 @@
+"""Dealer exports straight to the processed report, without the combined workbook round trip"""
+import os
+import functools
+import threading
+from queue import Queue
+from .excel_writer import WorkbookWriter, frame_rows, sheet_name_for, source_property
+from .ingest import has_data_rows, ordered_map, read_frame
+from .parse_cache import ParseCache
+from .tracing import tracer
+from . import Fixing_excel
+from .Fixing_excel import process_frame, KpiSummary, export_columns
+
+# --- CONFIGURATION ---
+# Also write the raw Combined_Report workbook (only needed to inspect the exports)
+write_combined_report = False
+
+
+def run_pipeline(paths, output_file, store=None, workers=1, cache=None, combined_file=None):
+    """Combine, process and write the report in one pass over the exports.
+
+    Each export is parsed once (or loaded from the parse cache), only as
+    far as the processing needs it, processed in memory and written
+    straight to output_file with its formatting; the raw sheet goes to
+    combined_file only when one is given, and the KPI summary sheets
+    follow the dealer sheets. Sheets keep the names the combined workbook
+    would give them, so ticket store entries are shared with
+    Fixing_excel.py. Returns the number of sheets written.
+    """
+    if os.path.exists(output_file):
+        os.remove(output_file)
+    combined = WorkbookWriter(combined_file) if combined_file else None
+    # The raw combined sheet needs every column and row, the report only what process_sheet reads
+    spec = export_columns()
+    read = functools.partial(read_frame, spec=None if combined is not None else spec, cache=cache)
+    # Read when called: the CLI sets it from --no-kpi, maybe after this module was imported
+    summary = KpiSummary() if Fixing_excel.kpi_summary else None
+    sheets_written = 0
+    try:
+        with WorkbookWriter(output_file) as writer:
+            for file_path, parsed in ordered_map(read, paths, workers):
+                print(f"Reading: {os.path.basename(file_path)}")
+                try:
+                    df = parsed.result()
+                except Exception as e:
+                    print(f"Error reading {file_path}: {e}")
+                    continue
+                # Read through the spec, a file whose rows were all filtered out looks
+                # the same as one without data rows, which combine_workbooks skips
+                if df.empty and (combined is not None or not has_data_rows(file_path)):
+                    print(f"Skipped empty file: {file_path}")
+                    continue
+                # Long dealer names can cut to the same 31 characters; the ticket store
+                # keys on the sheet name, so settle it before processing
+                sheet_name = writer.unique_name(sheet_name_for(file_path))
+                try:
+                    with tracer.span('process_export', sheet=sheet_name, rows=len(df)):
+                        if combined is not None:
+                            raw_name = combined.add_rows(sheet_name, frame_rows(df))
+                            combined.set_property(source_property(raw_name), os.path.basename(file_path))
+                            df = spec.select(df)
+                        processed = process_frame(sheet_name, df, store, file_path)
+                        writer.add_sheet(sheet_name, processed)
+                        if summary is not None:
+                            summary.add(sheet_name, processed, file_path)
+                except Exception as e:
+                    print(f"Error processing {file_path}: {e}")
+                    continue
+                sheets_written += 1
+            if summary is not None:
+                with tracer.span('kpi_summary'):
+                    summary.write(writer)
+    finally:
+        if combined is not None:
+            combined.close()
+    if combined_file:
+        print(f"Combined file saved as: {combined_file}")
+    print(f"Processed file saved as: {output_file}")
+    return sheets_written
+
+
+class StreamingReport:
+    """Processes exports on a background thread while later ones are still downloading.
+
+    submit() queues a finished download from any thread; the consumer
+    parses it, adds the SLA columns and appends its sheet to output_file
+    right away, so sheets follow download order. close() drains the
+    queue and finishes the workbook.
+    """
+
+    def __init__(self, output_file, store_path=None, cache=None, combined_file=None):
+        self.output_file = output_file
+        self.store_path = store_path
+        self.cache = cache
+        self.combined_file = combined_file
+        self.sheets_written = 0
+        self._queue = Queue()
+        self._error = None
+        self._thread = threading.Thread(target=self._consume, name='streaming-report', daemon=True)
+        self._thread.start()
+
+    def submit(self, file_path):
+        self._queue.put(file_path)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self.sheets_written
+
+    def _consume(self):
+        # SQLite connections belong to the thread that opened them
+        store = None
+        try:
+            if self.store_path:
+                from .ticket_store import TicketStore
+                store = TicketStore(self.store_path)
+            self.sheets_written = run_pipeline(iter(self._queue.get, None), self.output_file, store,
+                                               cache=self.cache, combined_file=self.combined_file)
+        except Exception as e:
+            self._error = e
+        finally:
+            if store is not None:
+                store.close()
+
+
+def process_exports(paths, output_file, store_path=None, workers=1, cache=None, combined_file=None):
+    """run_pipeline with the ticket store at store_path (None for none) opened and closed around it"""
+    store = None
+    if store_path:
+        from .ticket_store import TicketStore
+        store = TicketStore(store_path)
+    try:
+        sheets_written = run_pipeline(paths, output_file, store, workers, cache, combined_file)
+    finally:
+        if store is not None:
+            store.close()
+    print(f"Files processed as separate sheets: {sheets_written}")
+    return sheets_written
+
+
+if __name__ == '__main__':
+    from .combine_excels import export_files
+    files = export_files(Fixing_excel.DOWNLOAD_DIR, Fixing_excel.target_date)
+    if not files:
+        print("No valid Excel files found for the date in downloads directory.")
+    else:
+        cache_dir = Fixing_excel.parse_cache_dir
+        cache = ParseCache(cache_dir, Fixing_excel.parse_cache_max_mb) if cache_dir else None
+        process_exports(files, Fixing_excel.output_file, Fixing_excel.ticket_store_file,
+                        Fixing_excel.ingest_workers, cache,
+                        Fixing_excel.combined_file if write_combined_report else None)
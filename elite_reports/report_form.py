@@ -0,0 +1,120 @@
+"""Consolidated Report form: read it in one script call and only touch the fields that differ"""
+from .waits import wait_for_step, ajax_idle
+
+# Zone -> region -> area -> dealer: each select is reloaded over AJAX when its parent changes
+CASCADE = ('zone', 'state', 'city', 'dealer')
+
+# arguments: date from input, date to input, select ids.
+# Options come back as [value, text] pairs so they can be rebuilt exactly.
+FORM_STATE_JS = """
+var state = {dates: [], selects: {}};
+[arguments[0], arguments[1]].forEach(function (input) { state.dates.push(input ? input.value : null); });
+arguments[2].forEach(function (id) {
+    var select = document.getElementById(id);
+    if (!select) { return; }
+    var options = [], selected = [];
+    for (var i = 0; i < select.options.length; i++) {
+        var option = select.options[i];
+        options.push([option.value, option.text.trim()]);
+        if (option.selected) { selected.push(option.text.trim()); }
+    }
+    state.selects[id] = {options: options, selected: selected};
+});
+return state;
+"""
+
+OPTIONS_JS = """
+var select = document.getElementById(arguments[0]);
+if (!select) { return []; }
+var options = [];
+for (var i = 0; i < select.options.length; i++) { options.push([select.options[i].value, select.options[i].text.trim()]); }
+return options;
+"""
+
+# arguments: select id, option text, options to rebuild the select from (or null),
+# whether to fire 'change' (which makes the page reload the next select)
+SET_SELECT_JS = """
+var select = document.getElementById(arguments[0]);
+if (!select) { return false; }
+if (arguments[2]) {
+    select.length = 0;
+    arguments[2].forEach(function (option) { select.add(new Option(option[1], option[0])); });
+}
+for (var i = 0; i < select.options.length; i++) {
+    if (select.options[i].text.trim() === arguments[1]) {
+        select.value = select.options[i].value;
+        if (arguments[3]) { select.dispatchEvent(new Event('change', {bubbles: true})); }
+        return true;
+    }
+}
+return false;
+"""
+
+SELECT_ALL_JS = """
+var select = document.getElementById(arguments[0]);
+if (!select) { return 0; }
+for (var i = 0; i < select.options.length; i++) { select.options[i].selected = true; }
+select.dispatchEvent(new Event('change', {bubbles: true}));
+return select.options.length;
+"""
+
+
+def read_form(driver, date_from, date_to, select_ids):
+    """Date values and every select's options and selection, in one round trip"""
+    return driver.execute_script(FORM_STATE_JS, date_from, date_to, list(select_ids))
+
+
+def option_texts(options):
+    return [text for value, text in options]
+
+
+def set_cascade(driver, wanted, state, known_options, budget):
+    """Select wanted [(select id, option text), ...] top-down, touching only what differs.
+
+    known_options maps (select id, texts chosen above it) to the options
+    the page showed for it earlier in this login. A select whose options
+    are known is filled from them without firing 'change' upstream, so
+    the page skips that AJAX reload. Returns the (select id, text) that
+    never appeared, or None once every select is set.
+    """
+    parents = ()
+    changed = False
+    for index, (field, text) in enumerate(wanted):
+        current = state['selects'].get(field)
+        if current is None:
+            return field, text
+        if not changed and current['selected'] == [text]:
+            if len(current['options']) > 1:
+                known_options[(field, parents)] = current['options']
+            parents += (text,)
+            continue
+        fill = None
+        if changed:
+            fill = known_options.get((field, parents))
+            if fill is None:
+                # The parent fired 'change': wait for the page to reload this select
+                loaded = wait_for_step(
+                    driver, 'dropdown_options',
+                    lambda d: ajax_idle(d) and text in option_texts(d.execute_script(OPTIONS_JS, field)), budget)
+                if not loaded:
+                    return field, text
+                known_options[(field, parents)] = driver.execute_script(OPTIONS_JS, field)
+        elif len(current['options']) > 1:
+            known_options[(field, parents)] = current['options']
+        changed = True
+        parents += (text,)
+        last = index == len(wanted) - 1
+        # Only ask the page for the next select's options when they are not known yet
+        fire = last or (wanted[index + 1][0], parents) not in known_options
+        if not driver.execute_script(SET_SELECT_JS, field, text, fill, fire):
+            return field, text
+    return None
+
+
+def select_all(driver, select_id):
+    """Select every option of a multi-select in one call; returns how many there are"""
+    return driver.execute_script(SELECT_ALL_JS, select_id)
+
+
+def set_select(driver, select_id, text):
+    return driver.execute_script(SET_SELECT_JS, select_id, text, None, True)
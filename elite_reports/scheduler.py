@@ -0,0 +1,202 @@
+"""Export jobs with retries, backoff with jitter, and a circuit breaker for a degraded portal"""
+import time
+import random
+import threading
+
+
+class Job:
+    """One export: a user's support mode over a date range"""
+
+    def __init__(self, user, mode, date_from, date_to):
+        self.user = user
+        self.mode = mode
+        self.date_from = date_from
+        self.date_to = date_to
+        self.attempts = 0
+        self.not_before = 0.0
+        self.last_error = None
+
+    def __repr__(self):
+        label = self.date_from.isoformat()
+        if self.date_to != self.date_from:
+            label = f"{label} to {self.date_to.isoformat()}"
+        return f"{self.user['dealer']} - {self.mode['name']} ({label})"
+
+
+class CircuitBreaker:
+    """Opens after threshold failures in a row and lets a single probe through after cooldown"""
+
+    def __init__(self, threshold=5, cooldown=120):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def delay(self, now):
+        """Seconds until a job may be dispatched, 0 when it may go now"""
+        if self.opened_at is None:
+            return 0
+        if self.probing:
+            return self.cooldown
+        return max(0.0, self.opened_at + self.cooldown - now)
+
+    def dispatched(self):
+        if self.opened_at is not None:
+            self.probing = True
+
+    def record(self, success, now):
+        self.probing = False
+        if success:
+            if self.opened_at is not None:
+                print("Portal recovered, resuming exports")
+            self.failures = 0
+            self.opened_at = None
+            return
+        self.failures += 1
+        if self.failures >= self.threshold:
+            if self.opened_at is None:
+                print(f"{self.failures} exports failed in a row, pausing for {self.cooldown}s")
+            self.opened_at = now
+
+
+class JobScheduler:
+    """Hands jobs to workers; a failed job goes to the back of the queue after a backoff.
+
+    next_job() blocks until a job is ready and returns None once every job
+    has either finished or used up its attempts, so workers simply loop
+    until they get None. Jobs with the same key(job) never run at the same
+    time, e.g. two exports that would switch one account's support mode.
+
+    The exception is an owner passed to next_job(), such as the tabs of one
+    browser: the owner holds one key at a time and may run several of its
+    jobs at once, as long as share(job) is the same for all of them (the
+    account's support mode). Other owners and workers wait for the key.
+    """
+
+    def __init__(self, jobs, max_attempts=3, base_delay=5.0, max_delay=120.0, breaker=None, key=None, share=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker()
+        self.key = key
+        self.share = share
+        self.failed = []
+        self.completed = 0
+        self._pending = list(jobs)
+        self._running = 0
+        # key -> [owner, share, running jobs]; owner -> the key it holds
+        self._busy = {}
+        self._owners = {}
+        self._cond = threading.Condition()
+
+    def next_job(self, preference=None, owner=None):
+        """Next ready job, choosing the lowest preference(job) among ready ones (queue order breaks ties)"""
+        with self._cond:
+            while True:
+                if not self._pending and not self._running:
+                    return None
+                now = time.monotonic()
+                wait = self.breaker.delay(now)
+                if not wait:
+                    ready = [job for job in self._pending if job.not_before <= now and self._free(job, owner)]
+                    if ready:
+                        job = min(ready, key=preference) if preference else ready[0]
+                        self._pending.remove(job)
+                        self._start(job, owner)
+                        return job
+                    # A running job can finish, free its key or fail and come back
+                    later = [job.not_before - now for job in self._pending if job.not_before > now]
+                    wait = min(later) if later else None
+                self._cond.wait(wait)
+
+    def reconsider(self, job, preference):
+        """Trade a dispatched job for a ready one with the same key that now ranks better.
+
+        For a worker that learnt something while starting the job, such as
+        which support mode a fresh login landed in.
+        """
+        with self._cond:
+            if self.key is None:
+                return job
+            now = time.monotonic()
+            held = self._busy[self.key(job)]
+            siblings = [other for other in self._pending
+                        if other.not_before <= now and self.key(other) == self.key(job)
+                        # Jobs running beside this one fix what it shares with them
+                        and (held[2] == 1 or self.share is None or self.share(other) == held[1])]
+            best = min([job] + siblings, key=preference)
+            if best is not job:
+                # The traded job takes the other's place in the queue
+                self._pending[self._pending.index(best)] = job
+                if self.share is not None:
+                    held[1] = self.share(best)
+            return best
+
+    def _free(self, job, owner):
+        if self.key is None:
+            return True
+        if owner is not None and owner in self._owners:
+            key = self._owners[owner]
+            return self.key(job) == key and (self.share is None or self.share(job) == self._busy[key][1])
+        return self.key(job) not in self._busy
+
+    def _start(self, job, owner=None):
+        self._running += 1
+        if self.key is not None:
+            key = self.key(job)
+            held = self._busy.setdefault(key, [owner, self.share(job) if self.share else None, 0])
+            held[2] += 1
+            if owner is not None:
+                self._owners[owner] = key
+        self.breaker.dispatched()
+
+    def _finish(self, job):
+        self._running -= 1
+        if self.key is not None:
+            held = self._busy[self.key(job)]
+            held[2] -= 1
+            if not held[2]:
+                del self._busy[self.key(job)]
+                self._owners.pop(held[0], None)
+
+    def done(self, job):
+        with self._cond:
+            self._finish(job)
+            self.completed += 1
+            self.breaker.record(True, time.monotonic())
+            self._cond.notify_all()
+
+    def fail(self, job, error):
+        """Requeue at the back with exponential backoff and jitter, or give up"""
+        with self._cond:
+            self._finish(job)
+            job.attempts += 1
+            job.last_error = error
+            now = time.monotonic()
+            self.breaker.record(False, now)
+            if job.attempts >= self.max_attempts:
+                print(f"Giving up on {job} after {job.attempts} attempts: {error}")
+                self.failed.append(job)
+            else:
+                delay = min(self.max_delay, self.base_delay * 2 ** (job.attempts - 1))
+                delay = random.uniform(delay / 2, delay)
+                print(f"{job} failed ({error}); retrying in {delay:.0f}s")
+                job.not_before = now + delay
+                self._pending.append(job)
+            self._cond.notify_all()
+
+    def abandon(self, error):
+        """Give up on every job still queued, e.g. once no worker is left to run them"""
+        with self._cond:
+            for job in self._pending:
+                job.last_error = error
+                print(f"Giving up on {job}: {error}")
+            self.failed.extend(self._pending)
+            self._pending = []
+            self._cond.notify_all()
+
+    def report(self):
+        print(f"\nJobs completed: {self.completed}, failed: {len(self.failed)}")
+        for job in self.failed:
+            print(f"  {job}: {job.last_error}")
@@ -0,0 +1,91 @@
+"""On-disk cache of which fallback selector matched for each logical element"""
+import os
+import json
+import threading
+
+# Evaluates every candidate selector in one round trip and returns the index
+# of the first one (in priority order) that matches, or -1.
+# arguments[0]: [[by, value], ...]   arguments[1]: require a clickable element
+PROBE_JS = """
+var candidates = arguments[0], clickable = arguments[1];
+function locate(by, value) {
+    try {
+        if (by === 'css selector') { return document.querySelector(value); }
+        if (by === 'xpath') {
+            return document.evaluate(value, document, null,
+                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        }
+        if (by === 'id') { return document.getElementById(value); }
+        if (by === 'name') { return document.getElementsByName(value)[0] || null; }
+        if (by === 'class name') { return document.getElementsByClassName(value)[0] || null; }
+        if (by === 'tag name') { return document.getElementsByTagName(value)[0] || null; }
+    } catch (e) {}
+    return null;
+}
+for (var i = 0; i < candidates.length; i++) {
+    var el = locate(candidates[i][0], candidates[i][1]);
+    if (!el) { continue; }
+    if (clickable && (el.disabled || el.getClientRects().length === 0)) { continue; }
+    return i;
+}
+return -1;
+"""
+
+
+class SelectorCache:
+    """Remembers the winning selector per element key across runs"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+        self._entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._entries = {key: tuple(sel) for key, sel in json.load(f).items()}
+            except Exception as e:
+                print(f"Ignoring unreadable selector cache {path}: {e}")
+
+    def get(self, key):
+        with self._lock:
+            return self._entries.get(key)
+
+    def hit(self):
+        with self._lock:
+            self.stats['hits'] += 1
+
+    def record(self, key, selector):
+        """Store the selector that matched; counts as a miss for this lookup"""
+        with self._lock:
+            self.stats['misses'] += 1
+            if self._entries.get(key) == tuple(selector):
+                return
+            self._entries[key] = tuple(selector)
+            self._save()
+
+    def invalidate(self, key):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.stats['invalidations'] += 1
+                self._save()
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({key: list(sel) for key, sel in self._entries.items()}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def report(self):
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        if not lookups:
+            return
+        print(f"Selector cache: {stats['hits']}/{lookups} hits, "
+              f"{stats['misses']} misses, {stats['invalidations']} invalidations")
+
+
+def probe_selectors(driver, selectors, clickable=False):
+    """Index of the first matching selector, checked in a single JS call"""
+    return driver.execute_script(PROBE_JS, [list(sel) for sel in selectors], clickable)
@@ -0,0 +1,236 @@
+"""Warm browser session pool and per-user auth cookie cache"""
+import os
+import json
+import time
+import threading
+from queue import Queue
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+
+
+class BrowserSession:
+    """A browser kept alive across users, bound to one download directory"""
+
+    def __init__(self, download_path):
+        self.download_path = download_path
+        self.driver = None
+        # Account currently signed in, so consecutive jobs for it skip the login,
+        # and the support mode its page is in, so they skip the switch too
+        self.user_id = None
+        self.mode = None
+        # Report dropdown options seen during this login (see report_form.set_cascade)
+        self.form_options = {}
+
+    def is_alive(self):
+        if self.driver is None:
+            return False
+        try:
+            self.driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def sign_out(self):
+        """Drop the signed-in account so the next one starts clean"""
+        sign_out(self.driver)
+        self.user_id = None
+        self.mode = None
+        self.form_options = {}
+
+
+class TabbedSession(BrowserSession):
+    """One browser signed in to one account, exporting from several tabs at once.
+
+    The tabs share the login, and the support mode is part of it, so the
+    scheduler only gives them jobs of the same account and mode at a time
+    (see JobScheduler). A tab costs a renderer, not a whole Chrome.
+    """
+
+    def __init__(self, download_path, tab_count):
+        super().__init__(download_path)
+        self.tab_count = tab_count
+        self.tabs = []
+        # Counts sign-ins, so a tab can tell its page belongs to an earlier login
+        self.logins = 0
+        self.login_lock = threading.Lock()
+        self.switcher = None
+
+    def start(self, factory):
+        """Start Chrome and open the tabs; False if Chrome did not start"""
+        self.driver = factory(self.download_path)
+        if self.driver is None:
+            return False
+        self.switcher = WindowSwitcher(self.driver)
+        handles = [self.switcher.current] + [self.switcher.open_tab() for _ in range(self.tab_count - 1)]
+        self.tabs = [Tab(self, handle) for handle in handles]
+        return True
+
+    def close(self):
+        SessionPool._quit(self)
+
+
+class Tab:
+    """One tab of a TabbedSession, driven like a BrowserSession of its own"""
+
+    def __init__(self, browser, handle):
+        self.browser = browser
+        self.handle = handle
+        # (login, support mode) the page was loaded in; None when it needs reloading
+        self.page = None
+
+    @property
+    def driver(self):
+        return self.browser.driver
+
+    @property
+    def download_path(self):
+        return self.browser.download_path
+
+    @property
+    def form_options(self):
+        return self.browser.form_options
+
+    @property
+    def mode(self):
+        return self.browser.mode
+
+    @mode.setter
+    def mode(self, mode):
+        self.browser.mode = mode
+        self.page = (self.browser.logins, mode)
+
+    def use(self):
+        """Send the calling thread's browser commands to this tab"""
+        self.browser.switcher.use(self.handle)
+
+    def is_current(self):
+        """Whether the page was loaded in the browser's current login and support mode"""
+        return self.page == (self.browser.logins, self.browser.mode)
+
+    def sign_out(self):
+        """Reload this tab before its next export, leaving the login to the other tabs.
+
+        A failed export may have switched the account's support mode half
+        way, so every tab reloads to see which mode the portal is in.
+        """
+        self.page = None
+        self.browser.mode = None
+
+
+class WindowSwitcher:
+    """Lets several threads each drive their own tab of one WebDriver session.
+
+    WebDriver sends every command to its current window, so the driver's
+    commands (element commands go through it too) take a lock and first
+    switch to the calling thread's tab. The lock is held for one command
+    at a time: condition waits poll between commands, so while one tab
+    waits on the portal the others keep working.
+    """
+
+    def __init__(self, driver):
+        self._execute = driver.execute
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.current = self._execute(Command.W3C_GET_CURRENT_WINDOW_HANDLE)['value']
+        driver.execute = self.execute
+
+    def open_tab(self):
+        """Handle of a new blank tab; the current window stays the same"""
+        with self._lock:
+            return self._execute(Command.NEW_WINDOW, {'type': 'tab'})['value']['handle']
+
+    def use(self, handle):
+        self._local.handle = handle
+
+    def execute(self, command, params=None):
+        with self._lock:
+            handle = getattr(self._local, 'handle', None)
+            if handle is not None and handle != self.current:
+                self._execute(Command.SWITCH_TO_WINDOW, {'handle': handle})
+                self.current = handle
+            return self._execute(command, params)
+
+
+class SessionPool:
+    """Hands out warm browsers; Chrome is only started the first time a slot is used"""
+
+    def __init__(self, factory, download_paths):
+        self.factory = factory
+        self._sessions = [BrowserSession(path) for path in download_paths]
+        self._idle = Queue()
+        for session in self._sessions:
+            self._idle.put(session)
+
+    def acquire(self):
+        session = self._idle.get()
+        if not session.is_alive():
+            self._quit(session)
+            session.driver = self.factory(session.download_path)
+            session.user_id = None
+            session.mode = None
+            session.form_options = {}
+        return session
+
+    def release(self, session):
+        self._idle.put(session)
+
+    def close(self):
+        for session in self._sessions:
+            self._quit(session)
+
+    @staticmethod
+    def _quit(session):
+        if session.driver is not None:
+            try:
+                session.driver.quit()
+            except Exception:
+                pass
+            session.driver = None
+
+
+def sign_out(driver):
+    """Drop the current account's session so the next user starts clean"""
+    try:
+        driver.delete_all_cookies()
+        driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+    except WebDriverException as e:
+        print(f"Could not clear browser session: {e}")
+
+
+class CookieStore:
+    """Auth cookies per user id, kept between runs"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, user_id):
+        safe_id = ''.join(c if c.isalnum() else '_' for c in str(user_id))
+        return os.path.join(self.directory, f"{safe_id}.json")
+
+    def load(self, user_id):
+        """Saved cookies that have not expired yet, or None"""
+        path = self._path(user_id)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                cookies = json.load(f)
+        except Exception as e:
+            print(f"Ignoring unreadable cookie cache {path}: {e}")
+            return None
+        now = time.time()
+        cookies = [c for c in cookies if not c.get('expiry') or c['expiry'] > now]
+        return cookies or None
+
+    def save(self, user_id, cookies):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(user_id)
+        # Session cookies are credentials: keep the file private to this user
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(cookies, f)
+
+    def delete(self, user_id):
+        path = self._path(user_id)
+        if os.path.exists(path):
+            os.remove(path)
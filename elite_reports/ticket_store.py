@@ -0,0 +1,157 @@
+"""SQLite store of exported tickets keyed by Ticket Number"""
+import json
+import sqlite3
+from datetime import date, datetime, time
+import pandas as pd
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    ticket_number TEXT PRIMARY KEY,
+    sheet TEXT NOT NULL,
+    dealer TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    report_date TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    row_hash TEXT NOT NULL,
+    raw TEXT NOT NULL,
+    -- NULL: not processed yet, '': filtered out of the processed report
+    processed TEXT
+);
+CREATE INDEX IF NOT EXISTS tickets_partition ON tickets (report_date, dealer, mode);
+CREATE INDEX IF NOT EXISTS tickets_sheet ON tickets (sheet, position);
+CREATE TABLE IF NOT EXISTS sheets (
+    sheet TEXT PRIMARY KEY,
+    report_date TEXT NOT NULL,
+    columns TEXT NOT NULL
+);
+"""
+
+# SQLite caps the number of bound parameters per statement
+LOOKUP_CHUNK = 900
+
+
+def _encode(value):
+    if value is pd.NaT:
+        return None
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, (date, time)):
+        return {'__' + type(value).__name__ + '__': value.isoformat()}
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Cannot store value of type {type(value).__name__}")
+
+
+def _decode(obj):
+    if '__datetime__' in obj:
+        return pd.Timestamp(obj['__datetime__'])
+    if '__date__' in obj:
+        return date.fromisoformat(obj['__date__'])
+    if '__time__' in obj:
+        return time.fromisoformat(obj['__time__'])
+    return obj
+
+
+def _dumps(record):
+    return json.dumps(record, default=_encode)
+
+
+def _loads(text):
+    return json.loads(text, object_hook=_decode)
+
+
+class TicketStore:
+    """Latest raw and processed row per ticket, partitioned by date/dealer/mode"""
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _known_hashes(self, keys):
+        known = {}
+        for i in range(0, len(keys), LOOKUP_CHUNK):
+            chunk = keys[i:i + LOOKUP_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            known.update(self.conn.execute(
+                # Rows left unprocessed by an interrupted run count as changed
+                f"SELECT ticket_number, row_hash FROM tickets "
+                f"WHERE processed IS NOT NULL AND ticket_number IN ({placeholders})", chunk))
+        return known
+
+    def upsert(self, df, sheet, dealer, mode, report_date, settings=''):
+        """Merge an export into the store; returns a mask of new or changed rows.
+
+        settings fingerprints whatever else the processed rows depend on;
+        rows processed under different settings count as changed.
+        """
+        keys = df['Ticket Number'].astype(str)
+        hashes = pd.util.hash_pandas_object(df, index=False).astype(str)
+        if settings:
+            hashes = hashes + ':' + settings
+        known = self._known_hashes(keys.tolist())
+        changed = keys.map(known) != hashes
+        with self.conn:
+            # Unchanged tickets keep their processed row but follow the latest export
+            self.conn.executemany(
+                "UPDATE tickets SET sheet = ?, dealer = ?, mode = ?, report_date = ?, position = ? "
+                "WHERE ticket_number = ?",
+                [(sheet, dealer, mode, report_date, pos, key)
+                 for pos, key in enumerate(keys) if not changed.iat[pos]])
+            records = df[changed].to_dict('records')
+            positions = [pos for pos in range(len(df)) if changed.iat[pos]]
+            self.conn.executemany(
+                "INSERT INTO tickets (ticket_number, sheet, dealer, mode, report_date, position, row_hash, raw, processed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL) "
+                "ON CONFLICT (ticket_number) DO UPDATE SET sheet = excluded.sheet, dealer = excluded.dealer, "
+                "mode = excluded.mode, report_date = excluded.report_date, position = excluded.position, "
+                "row_hash = excluded.row_hash, raw = excluded.raw, processed = NULL",
+                [(keys.iat[pos], sheet, dealer, mode, report_date, pos, hashes.iat[pos], _dumps(record))
+                 for pos, record in zip(positions, records)])
+        return changed
+
+    def retain(self, sheet, ticket_numbers):
+        """Leave tickets of sheet that are not in ticket_numbers out of its processed report"""
+        keep = set(pd.Series(ticket_numbers).astype(str))
+        stale = [(key,) for (key,) in self.conn.execute(
+            "SELECT ticket_number FROM tickets WHERE sheet = ? AND processed != ''", (sheet,)) if key not in keep]
+        with self.conn:
+            # No row hash either, so the ticket counts as changed if it comes back
+            self.conn.executemany("UPDATE tickets SET processed = '', row_hash = '' WHERE ticket_number = ?", stale)
+
+    def save_processed(self, sheet, report_date, ticket_numbers, processed):
+        """Store processed rows; tickets missing from processed were filtered out"""
+        rows = {str(record['Ticket Number']): _dumps(record) for record in processed.to_dict('records')}
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE tickets SET processed = ? WHERE ticket_number = ?",
+                [(rows.get(str(key), ''), str(key)) for key in ticket_numbers])
+            # An empty result lacks the SLA columns, so it must not replace a full column list
+            on_conflict = "NOTHING" if processed.empty else \
+                "UPDATE SET report_date = excluded.report_date, columns = excluded.columns"
+            self.conn.execute(
+                "INSERT INTO sheets (sheet, report_date, columns) VALUES (?, ?, ?) "
+                f"ON CONFLICT (sheet) DO {on_conflict}",
+                (sheet, report_date, json.dumps(list(processed.columns))))
+
+    def load_processed(self, sheet):
+        """Processed report rows of one sheet, in export order"""
+        row = self.conn.execute("SELECT columns FROM sheets WHERE sheet = ?", (sheet,)).fetchone()
+        columns = json.loads(row[0]) if row else None
+        records = [_loads(text) for (text,) in self.conn.execute(
+            "SELECT processed FROM tickets WHERE sheet = ? AND processed != '' ORDER BY position", (sheet,))]
+        return pd.DataFrame(records, columns=columns)
+
+    def sheet_partition(self, sheet):
+        """(dealer, mode) of a sheet's tickets, or None for a sheet without any"""
+        return self.conn.execute("SELECT dealer, mode FROM tickets WHERE sheet = ? LIMIT 1", (sheet,)).fetchone()
+
+    def report(self, report_date):
+        """Processed sheets for a report date, straight from the store"""
+        sheets = [name for (name,) in self.conn.execute(
+            "SELECT sheet FROM sheets WHERE report_date = ? ORDER BY sheet", (report_date,))]
+        return {name: self.load_processed(name) for name in sheets}
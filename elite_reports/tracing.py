@@ -0,0 +1,165 @@
+"""Structured timing spans written as JSONL, with Chrome-trace export and a p50/p95 summary
+
+    python -m elite_reports.tracing summary scraper_trace.jsonl [--run RUN_ID]
+    python -m elite_reports.tracing chrome scraper_trace.jsonl -o trace.json [--run RUN_ID]
+"""
+import os
+import json
+import math
+import time
+import argparse
+import functools
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class Tracer:
+    """Times named steps; nested spans inherit the tags (dealer, mode) of their parents"""
+
+    def __init__(self):
+        self.path = None
+        self.run_id = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def open(self, path):
+        """Append this run's spans to path; until then spans are not recorded"""
+        self.path = path
+        self.run_id = datetime.now().strftime('%Y%m%dT%H%M%S')
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @contextmanager
+    def span(self, name, **tags):
+        """Time the block; set 'status' on the yielded tags to record a soft failure"""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        merged = {key: value for key, value in stack[-1].items() if key != 'status'} if stack else {}
+        merged.update(tags)
+        stack.append(merged)
+        start = time.time()
+        started = time.perf_counter()
+        status = 'ok'
+        try:
+            yield merged
+        except BaseException:
+            status = 'error'
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            stack.pop()
+            if self.path is not None:
+                self._write({'run': self.run_id, 'name': name, 'start': start, 'duration': duration,
+                             'status': merged.pop('status', status), 'thread': threading.current_thread().name,
+                             'tags': merged})
+
+    def _write(self, record):
+        line = json.dumps(record, default=str) + '\n'
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+
+tracer = Tracer()
+
+
+def traced(name, tags=None, check_result=True):
+    """Decorator: a span around every call, tagged by tags(*args, **kwargs).
+
+    With check_result a falsy return value (how the scraper reports a
+    failed step) marks the span as failed.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.span(name, **(tags(*args, **kwargs) if tags else {})) as span:
+                result = func(*args, **kwargs)
+                if check_result and not result:
+                    span['status'] = 'failed'
+                return result
+        return wrapper
+    return decorate
+
+
+def load_spans(paths, run=None):
+    spans = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn last line of a crashed run
+                if run is None or record['run'] == run:
+                    spans.append(record)
+    return spans
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summary(spans):
+    """Print calls, failures and p50/p95/max seconds per step"""
+    durations = {}
+    failures = {}
+    for span in spans:
+        durations.setdefault(span['name'], []).append(span['duration'])
+        if span['status'] != 'ok':
+            failures[span['name']] = failures.get(span['name'], 0) + 1
+    runs = len({span['run'] for span in spans})
+    print(f"{len(spans)} spans from {runs} run(s)")
+    print(f"{'Step':<24}{'Calls':>7}{'Failed':>8}{'p50':>9}{'p95':>9}{'Max':>9}")
+    for name in sorted(durations, key=lambda n: -sum(durations[n])):
+        values = sorted(durations[name])
+        print(f"{name:<24}{len(values):>7}{failures.get(name, 0):>8}{percentile(values, 50):>8.2f}s"
+              f"{percentile(values, 95):>8.2f}s{values[-1]:>8.2f}s")
+
+
+def chrome_trace(spans, output_path):
+    """Write spans in the Trace Event format read by chrome://tracing and Perfetto"""
+    runs = sorted({span['run'] for span in spans})
+    threads = {}
+    events = []
+    for span in spans:
+        tid = threads.setdefault((span['run'], span['thread']), len(threads) + 1)
+        args = dict(span['tags'], status=span['status'])
+        events.append({'name': span['name'], 'ph': 'X', 'ts': span['start'] * 1e6, 'dur': span['duration'] * 1e6,
+                       'pid': runs.index(span['run']) + 1, 'tid': tid, 'args': args})
+    for (run, thread), tid in threads.items():
+        events.append({'name': 'thread_name', 'ph': 'M', 'pid': runs.index(run) + 1, 'tid': tid,
+                       'args': {'name': thread}})
+    for pid, run in enumerate(runs, start=1):
+        events.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': f"run {run}"}})
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events}, f)
+    print(f"Chrome trace saved as: {output_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    summary_parser = commands.add_parser('summary', help="p50/p95 per step across runs")
+    chrome_parser = commands.add_parser('chrome', help="Export a Chrome-trace JSON file")
+    chrome_parser.add_argument('-o', '--output', default='trace.json')
+    for command in (summary_parser, chrome_parser):
+        command.add_argument('paths', nargs='+', help="JSONL trace files")
+        command.add_argument('--run', help="Only this run id")
+    args = parser.parse_args()
+    spans = load_spans(args.paths, args.run)
+    if not spans:
+        print("No spans found.")
+        return
+    if args.command == 'summary':
+        summary(spans)
+    else:
+        chrome_trace(spans, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""Condition-based waits and step timing for the Elite Support portal flow"""
+import time
+import threading
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+from .tracing import tracer
+
+# Fixed delays the condition waits replaced, in seconds per call.
+# Only used as the baseline for the timing report.
+FIXED_DELAYS = {
+    'support_type': 2,         # time.sleep(2) after select_support_type
+    'switch_mode': 5,          # time.sleep(5) after clicking the support link
+    'before_filters': 3,       # time.sleep(3) before set_form_filters
+    'field_clear': 0.5,        # time.sleep(0.5) in clear_and_send_keys
+    'after_filters': 2,        # time.sleep(2) at the end of set_form_filters
+    'before_export': 2,        # time.sleep(2) before the Excel click
+    'between_modes': 3,        # time.sleep(3) between modes in main()
+}
+
+POLL_FREQUENCY = 0.1
+
+# DOM readiness first, then jQuery.active counts in-flight $.ajax calls; DataTables shows its
+# processing indicator while a server-side draw is pending
+AJAX_IDLE_JS = """
+if (document.readyState !== 'complete') { return false; }
+if (window.jQuery && window.jQuery.active > 0) { return false; }
+var busy = document.querySelectorAll('.dataTables_processing');
+for (var i = 0; i < busy.length; i++) {
+    if (busy[i].offsetParent !== null) { return false; }
+}
+return true;
+"""
+
+# Only the support section's own heading, reading exactly 'Elite Support' or
+# 'Standard Support': any other heading that mentions either word is ignored
+SUPPORT_HEADING_JS = """
+var nodes = document.querySelectorAll('h1, h2, h3, h4, .card-title');
+for (var i = 0; i < nodes.length; i++) {
+    var text = (nodes[i].innerText || '').replace(/\\s+/g, ' ').trim().toLowerCase();
+    if (text === 'elite support') { return 'Elite Support'; }
+    if (text === 'standard support') { return 'Standard Support'; }
+}
+return 'Unknown';
+"""
+
+
+class StepTimings:
+    """Thread-safe record of how long each wait step actually took"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._steps = {}
+
+    def record(self, step, elapsed, timed_out=False):
+        with self._lock:
+            entry = self._steps.setdefault(step, {'calls': 0, 'waited': 0.0, 'timeouts': 0})
+            entry['calls'] += 1
+            entry['waited'] += elapsed
+            if timed_out:
+                entry['timeouts'] += 1
+
+    def report(self):
+        """Print seconds waited per step against the old fixed delays"""
+        with self._lock:
+            steps = {name: dict(entry) for name, entry in self._steps.items()}
+        if not steps:
+            return
+        print(f"\n{'='*50}")
+        print("Wait timing report")
+        print(f"{'='*50}")
+        print(f"{'Step':<18}{'Calls':>6}{'Waited':>10}{'Fixed':>10}{'Saved':>10}{'Timeouts':>10}")
+        total_waited = total_fixed = 0.0
+        for name in sorted(steps):
+            entry = steps[name]
+            fixed = FIXED_DELAYS.get(name, 0) * entry['calls']
+            total_waited += entry['waited']
+            total_fixed += fixed
+            print(f"{name:<18}{entry['calls']:>6}{entry['waited']:>9.1f}s{fixed:>9.1f}s"
+                  f"{fixed - entry['waited']:>9.1f}s{entry['timeouts']:>10}")
+        print(f"{'Total':<18}{'':>6}{total_waited:>9.1f}s{total_fixed:>9.1f}s{total_fixed - total_waited:>9.1f}s")
+
+
+timings = StepTimings()
+
+
+def wait_for_step(driver, step, condition, budget):
+    """Wait until condition(driver) is truthy or the step's budget runs out.
+
+    Returns the condition's value, or False when the budget is exhausted.
+    Like the fixed sleeps it replaces, running out of budget is not an error.
+    """
+    start = time.time()
+    with tracer.span(f"wait.{step}") as span:
+        try:
+            result = WebDriverWait(driver, budget, poll_frequency=POLL_FREQUENCY).until(condition)
+            timings.record(step, time.time() - start)
+            return result
+        except TimeoutException:
+            timings.record(step, time.time() - start, timed_out=True)
+            span['status'] = 'timeout'
+            print(f"Wait '{step}' exceeded its {budget}s budget, continuing")
+            return False
+
+
+def ajax_idle(driver):
+    return driver.execute_script(AJAX_IDLE_JS)
+
+
+def support_mode_is(mode_name):
+    """Condition: the page heading shows the given support mode"""
+    def condition(driver):
+        return driver.execute_script(SUPPORT_HEADING_JS) == mode_name
+    return condition
+
+
+def field_empty(element):
+    """Condition: an input's value has been cleared"""
+    def condition(driver):
+        return element.get_attribute('value') == ''
+    return condition
@@ -0,0 +1,57 @@
+"""Per-day split of backfill range exports"""
+from datetime import date
+import pandas as pd
+import pytest
+
+from elite_reports import automatn12
+from elite_reports.backfill import Backfill, Checkpoint, split_by_day
+
+USER = {'id': 'EMP0001', 'dealer': 'TTBL Dealer 01'}
+MODE = automatn12.modes[0]
+
+
+def export(dates):
+    return pd.DataFrame({'Ticket Number': range(len(dates)), 'Call Log Date': dates})
+
+
+def test_split_keeps_undated_rows():
+    per_day = split_by_day(export(['01-06-2025', None, '02-06-2025', 'not a date', '01-06-2025']))
+    assert per_day[date(2025, 6, 1)]['Ticket Number'].tolist() == [0, 4]
+    assert per_day[date(2025, 6, 2)]['Ticket Number'].tolist() == [2]
+    assert per_day[None]['Ticket Number'].tolist() == [1, 3]
+    assert split_by_day(export(['01-06-2025']).drop(columns='Call Log Date'))[None].shape == (1, 1)
+
+
+def test_save_backfill_days_keeps_undated_file(tmp_path):
+    backfill = Backfill(date(2025, 6, 1), date(2025, 6, 3), 31, Checkpoint(str(tmp_path / 'checkpoint.jsonl')))
+    range_file = tmp_path / automatn12.export_filename(USER, MODE, date(2025, 6, 1), date(2025, 6, 3))
+    export(['01-06-2025', '', '03-06-2025']).to_excel(range_file, index=False)
+    files = automatn12.save_backfill_days(str(range_file), USER, MODE, date(2025, 6, 1), date(2025, 6, 3), backfill)
+    names = [p.split('/')[-1] for p in files]
+    assert names == ['TTBL_Dealer_01_01-06-2025_S_ALL_TICKET_STATUS.xlsx',
+                     'TTBL_Dealer_01_02-06-2025_S_ALL_TICKET_STATUS.xlsx',
+                     'TTBL_Dealer_01_03-06-2025_S_ALL_TICKET_STATUS.xlsx',
+                     'TTBL_Dealer_01_01-06-2025_to_03-06-2025_S_UNDATED.xlsx']
+    assert pd.read_excel(files[-1])['Ticket Number'].tolist() == [1]
+    # A day without tickets still gets its file, with the export's columns
+    assert list(pd.read_excel(files[1]).columns) == ['Ticket Number', 'Call Log Date']
+    assert not range_file.exists()
+    assert backfill.checkpoint.is_done(USER['dealer'], MODE['suffix'], date(2025, 6, 2))
+
+
+def test_reversed_range_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        Backfill(date(2025, 6, 3), date(2025, 6, 1), 31, Checkpoint(str(tmp_path / 'checkpoint.jsonl')))
+
+
+def test_checkpointed_days_without_their_file_are_exported_again(tmp_path, monkeypatch):
+    monkeypatch.setattr(automatn12, 'download_dir', str(tmp_path))
+    backfill = Backfill(date(2025, 6, 1), date(2025, 6, 4), 31, Checkpoint(str(tmp_path / 'checkpoint.jsonl')))
+    range_file = tmp_path / automatn12.export_filename(USER, MODE, date(2025, 6, 1), date(2025, 6, 4))
+    export(['01-06-2025', '03-06-2025']).to_excel(range_file, index=False)
+    automatn12.save_backfill_days(str(range_file), USER, MODE, date(2025, 6, 1), date(2025, 6, 4), backfill)
+    assert automatn12.export_ranges(USER, MODE, backfill) == []
+    # A daily run clears the download directory it shares with backfills
+    for day in (2, 3):
+        (tmp_path / automatn12.export_filename(USER, MODE, date(2025, 6, day))).unlink()
+    assert automatn12.export_ranges(USER, MODE, backfill) == [(date(2025, 6, 2), date(2025, 6, 3))]
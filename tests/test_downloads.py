@@ -0,0 +1,30 @@
+"""Claiming downloads that arrive in one directory"""
+import pytest
+
+from elite_reports.downloads import DownloadWatcher
+
+EXPORT_NAME = 'Consolidated Report.xlsx'
+
+
+@pytest.mark.parametrize('use_events', [False, True])
+def test_downloads_with_the_same_name_in_a_row(tmp_path, use_events):
+    watcher = DownloadWatcher(str(tmp_path), use_events=use_events)
+    try:
+        for mode in ('E', 'S'):
+            since = watcher.mark()
+            (tmp_path / EXPORT_NAME).write_bytes(mode.encode())
+            path = watcher.claim(since, 5, lambda name: name.endswith('.xlsx'))
+            assert path == str(tmp_path / EXPORT_NAME)
+            watcher.rename(path, str(tmp_path / f"Dealer_{mode}.xlsx"))
+    finally:
+        watcher.close()
+    assert (tmp_path / 'Dealer_E.xlsx').read_bytes() == b'E'
+    assert (tmp_path / 'Dealer_S.xlsx').read_bytes() == b'S'
+
+
+def test_renamed_download_is_not_claimed_again(tmp_path):
+    watcher = DownloadWatcher(str(tmp_path), use_events=False)
+    since = watcher.mark()
+    (tmp_path / EXPORT_NAME).write_bytes(b'E')
+    watcher.rename(watcher.claim(since, 5), str(tmp_path / 'Dealer_E.xlsx'))
+    assert watcher.claim(since, 0.5) is None
@@ -0,0 +1,76 @@
+"""PortalClient against the mock portal, and against stub login pages"""
+import copy
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pandas as pd
+import pytest
+
+from elite_reports.automatn12 import CONFIG, modes
+from elite_reports.http_export import PortalClient, create_pool
+from mock_portal import MockPortal, mock_users
+
+ROWS = 20
+
+
+@pytest.fixture
+def settings():
+    return copy.deepcopy(CONFIG['http_export'])
+
+
+@pytest.fixture(scope='module')
+def portal():
+    with MockPortal(mock_users(2), rows=ROWS) as portal:
+        yield portal
+
+
+def stub_login(status, page, cookie='JSESSIONID=abc; Path=/'):
+    """Server answering every request with one page and a session cookie"""
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            body = page.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Set-Cookie', cookie)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_login_and_export(portal, settings, tmp_path):
+    user = mock_users(2)[1]
+    client = PortalClient(portal.url, settings, pool=create_pool(maxsize=1))
+    assert client.login(user)
+    standard = next(mode for mode in modes if mode['suffix'] == 'S')
+    assert client.switch_mode(standard)
+    path = client.export_report(user, '2025-06-12', '2025-06-12', str(tmp_path / 'export.xlsx'))
+    df = pd.read_excel(path)
+    assert len(df) == ROWS
+    expected = portal.report(user['dealer'], 'Standard', '2025-06-12', '2025-06-12')
+    assert df['Ticket Number'].tolist() == expected['Ticket Number'].tolist()
+
+
+def test_wrong_password_fails(portal, settings):
+    user = dict(mock_users(1)[0], **{'pass': 'wrong'})
+    assert not PortalClient(portal.url, settings).login(user)
+
+
+@pytest.mark.parametrize('page, logged_in', [
+    ('<form><input type="password" name="password"><p>Invalid credentials</p></form>', False),
+    ('<h3>Consolidated Report</h3><form id="report"></form>', True),
+])
+def test_login_page_with_cookie(settings, page, logged_in):
+    server = stub_login(200, page)
+    try:
+        client = PortalClient(f"http://127.0.0.1:{server.server_port}/", settings)
+        assert client.login(mock_users(1)[0]) is logged_in
+        assert client.cookies == {'JSESSIONID': 'abc'}
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,42 @@
+"""Parsing export sheets through a ColumnSpec"""
+import pandas as pd
+
+from elite_reports.Fixing_excel import export_columns
+from elite_reports.ingest import ColumnSpec, has_data_rows, read_frame
+from elite_reports.pipeline import process_exports
+from synthetic import make_tickets
+
+SPEC = ColumnSpec(['Ticket Number', 'Chassis Number', 'Company Name'],
+                  {'Chassis Number': 'str', 'Company Name': 'category'})
+
+
+def test_header_only_sheet_keeps_its_columns(tmp_path):
+    path = tmp_path / 'empty.xlsx'
+    pd.DataFrame(columns=['Ticket Number', 'Company Name', 'Chassis Number']).to_excel(path, index=False)
+    df = read_frame(str(path), spec=SPEC)
+    assert df.empty and list(df.columns) == ['Ticket Number', 'Chassis Number', 'Company Name']
+    assert isinstance(df['Company Name'].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_string_dtype(df['Chassis Number'])
+    assert not has_data_rows(str(path))
+
+
+def test_blank_and_na_text_stay_missing_in_str_columns(tmp_path):
+    path = tmp_path / 'tickets.xlsx'
+    pd.DataFrame({'Ticket Number': [1, 2, 3, 4], 'Chassis Number': ['MB1', None, 'NA', 12345],
+                  'Company Name': ['A', 'B', None, 'A']}).to_excel(path, index=False)
+    df = read_frame(str(path), spec=SPEC)
+    assert df['Chassis Number'].tolist()[::3] == ['MB1', '12345']
+    assert df['Chassis Number'].isna().tolist() == [False, True, True, False]
+    assert has_data_rows(str(path))
+    full = SPEC.select(pd.read_excel(path))
+    assert full['Chassis Number'].isna().tolist() == [False, True, True, False]
+
+
+def test_pipeline_skips_files_without_data_rows_only(tmp_path):
+    empty = tmp_path / 'Dealer_A_12-06-2025_E_ALL_TICKET_STATUS.xlsx'
+    pd.DataFrame(columns=export_columns().columns).to_excel(empty, index=False)
+    unrestored = tmp_path / 'Dealer_B_12-06-2025_E_ALL_TICKET_STATUS.xlsx'
+    tickets = make_tickets(10, seed=1)
+    tickets['Restoration Type'] = 'Restored By Dealer'
+    tickets.to_excel(unrestored, index=False)
+    assert process_exports([str(empty), str(unrestored)], str(tmp_path / 'report.xlsx')) == 1
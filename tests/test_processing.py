@@ -0,0 +1,174 @@
+"""Processing exports into the SLA report, through the pipeline and through a combined workbook"""
+import re
+import sqlite3
+import pandas as pd
+import pytest
+
+from elite_reports import Fixing_excel
+from elite_reports.combine_excels import combine_for_date
+from elite_reports.excel_reader import XlsxReader
+from elite_reports.excel_writer import WorkbookWriter, sheet_name_for
+from elite_reports.pipeline import process_exports
+from synthetic import make_tickets
+
+DATE = '12-06-2025'
+# Long enough that their sheet names cannot hold the date and mode
+DEALERS = {'E': 'TTBL_Very_Long_Dealer_Name_Pvt_Ltd', 'S': 'TTBL_Other_Long_Dealer_Name_Pvt_Ltd'}
+
+
+@pytest.fixture
+def exports(tmp_path):
+    downloads = tmp_path / 'downloads'
+    downloads.mkdir()
+    paths = []
+    for seed, suffix in enumerate('ES'):
+        path = downloads / f"{DEALERS[suffix]}_{DATE}_{suffix}_ALL_TICKET_STATUS.xlsx"
+        make_tickets(40, seed=seed, first_ticket=1000 * (seed + 1)).to_excel(path, index=False)
+        paths.append(str(path))
+    return paths
+
+
+def stored_exports(store_path):
+    with sqlite3.connect(store_path) as conn:
+        return sorted(conn.execute("SELECT DISTINCT dealer, mode, report_date FROM tickets"))
+
+
+def kpi_dealers(report):
+    return sorted(set(pd.read_excel(report, sheet_name='KPI by Month')[['Dealer', 'Mode']].itertuples(index=False)))
+
+
+EXPECTED = sorted((dealer, suffix, DATE) for suffix, dealer in DEALERS.items())
+KPI_ROWS = sorted((dealer, Fixing_excel.MODE_NAMES[suffix]) for suffix, dealer in DEALERS.items())
+
+
+def test_pipeline_takes_dealer_date_and_mode_from_file_names(exports, tmp_path):
+    report = tmp_path / 'report.xlsx'
+    process_exports(exports, str(report), str(tmp_path / 'tickets.sqlite'))
+    assert stored_exports(tmp_path / 'tickets.sqlite') == EXPECTED
+    assert kpi_dealers(report) == KPI_ROWS
+
+
+def test_combined_report_keeps_the_export_file_names(exports, tmp_path):
+    combined = tmp_path / 'combined.xlsx'
+    assert combine_for_date(str(tmp_path / 'downloads'), DATE, str(combined)) == 2
+    sources = Fixing_excel.sheet_sources(str(combined))
+    assert sorted(sources.values()) == sorted(path.split('/')[-1] for path in exports)
+    report = tmp_path / 'report.xlsx'
+    Fixing_excel.process_combined(str(combined), str(report), str(tmp_path / 'tickets.sqlite'))
+    assert stored_exports(tmp_path / 'tickets.sqlite') == EXPECTED
+    assert kpi_dealers(report) == KPI_ROWS
+
+
+def test_report_from_the_store_matches_the_exports_report(exports, tmp_path):
+    from elite_reports import cli
+    store = str(tmp_path / 'tickets.sqlite')
+    process_exports(exports, str(tmp_path / 'report.xlsx'), store)
+    cli.main(['process', '--from-store', '--date', '2025-06-12', '--store', store,
+              '-o', str(tmp_path / 'from_store.xlsx')])
+    expected = pd.read_excel(tmp_path / 'report.xlsx', sheet_name=None)
+    report = pd.read_excel(tmp_path / 'from_store.xlsx', sheet_name=None)
+    assert sorted(report) == sorted(expected)
+    for name, sheet in report.items():
+        pd.testing.assert_frame_equal(sheet, expected[name])
+    assert kpi_dealers(tmp_path / 'from_store.xlsx') == KPI_ROWS
+
+
+def test_no_kpi_applies_to_an_already_imported_pipeline(exports, tmp_path, monkeypatch):
+    from elite_reports import cli
+    monkeypatch.setattr(Fixing_excel, 'kpi_summary', True)
+    report = tmp_path / 'report.xlsx'
+    cli.main(['process', '--exports', '--no-kpi', '--no-store', '--date', '2025-06-12',
+              '--dir', str(tmp_path / 'downloads'), '-o', str(report)])
+    assert not [name for name in pd.read_excel(report, sheet_name=None) if name.startswith('KPI')]
+
+
+def test_one_dealers_exports_get_their_own_sheets(tmp_path):
+    dealer = DEALERS['E']
+    downloads = tmp_path / 'downloads'
+    downloads.mkdir()
+    for seed, suffix in enumerate('ES'):
+        path = downloads / f"{dealer}_{DATE}_{suffix}_ALL_TICKET_STATUS.xlsx"
+        make_tickets(40, seed=seed, first_ticket=1000 * (seed + 1)).to_excel(path, index=False)
+    paths = sorted(str(path) for path in downloads.iterdir())
+    assert [sheet_name_for(path) for path in paths] == ['TTBL_Very_Long_Dea_12-06-2025_E', 'TTBL_Very_Long_Dea_12-06-2025_S']
+
+    report = tmp_path / 'report.xlsx'
+    assert process_exports(paths, str(report), str(tmp_path / 'tickets.sqlite')) == 2
+    assert stored_exports(tmp_path / 'tickets.sqlite') == [(dealer, 'E', DATE), (dealer, 'S', DATE)]
+    combined = tmp_path / 'combined.xlsx'
+    assert combine_for_date(str(downloads), DATE, str(combined)) == 2
+
+
+def test_short_names_keep_the_cut_file_name():
+    assert sheet_name_for(f"/x/ABC_{DATE}_E_ALL_TICKET_STATUS.xlsx") == 'ABC_12-06-2025_E_ALL_TICKET_STA'
+
+
+def test_clashing_sheet_names_get_a_counter(tmp_path):
+    frame = pd.DataFrame({'a': [1]})
+    with WorkbookWriter(str(tmp_path / 'out.xlsx')) as writer:
+        names = [writer.add_sheet('Dealer', frame), writer.add_sheet('DEALER', frame),
+                 writer.add_rows('x' * 40, [('a',), (1,)]), writer.add_rows('x' * 31, [('a',), (1,)]),
+                 writer.add_sheet('a/b', frame)]
+    assert names == ['Dealer', 'DEALER (2)', 'x' * 31, 'x' * 27 + ' (2)', 'a_b']
+    with XlsxReader(str(tmp_path / 'out.xlsx')) as reader:
+        assert reader.sheet_names == names
+
+
+def test_a_failing_export_does_not_stop_the_run(exports, tmp_path, monkeypatch):
+    process_frame = Fixing_excel.process_frame
+
+    def failing(sheet_name, df, store=None, source=None):
+        if source == exports[0]:
+            raise ValueError('bad export')
+        return process_frame(sheet_name, df, store, source)
+
+    from elite_reports import pipeline
+    monkeypatch.setattr(pipeline, 'process_frame', failing)
+    assert process_exports(exports, str(tmp_path / 'report.xlsx')) == 1
+
+
+def reprocessed(output):
+    """Per sheet processed through the store: 'all' or 'none' of its tickets new or changed"""
+    counts = re.findall(r': (\d+) of (\d+) tickets new or changed', output)
+    return ['none' if changed == '0' else 'all' if changed == total else changed for changed, total in counts]
+
+
+@pytest.fixture
+def sla_settings(monkeypatch):
+    """Set Fixing_excel SLA settings for the rest of a test, reloading the calendar"""
+    def set_settings(**settings):
+        for name, value in settings.items():
+            monkeypatch.setattr(Fixing_excel, name, value)
+        monkeypatch.setattr(Fixing_excel, '_calendar', None)
+    set_settings()
+    return set_settings
+
+
+def test_changing_sla_settings_reprocesses_stored_tickets(exports, tmp_path, sla_settings, capsys):
+    store = str(tmp_path / 'tickets.sqlite')
+    report = str(tmp_path / 'report.xlsx')
+    process_exports(exports, report, store)
+    process_exports(exports, report, store)
+    assert reprocessed(capsys.readouterr().out)[2:] == ['none', 'none']
+
+    sla_settings(business_day_hours=(9, 18))
+    process_exports(exports, report, store)
+    assert reprocessed(capsys.readouterr().out) == ['all', 'all']
+    fresh = str(tmp_path / 'fresh.xlsx')
+    process_exports(exports, fresh)
+    for sheet in pd.ExcelFile(report).sheet_names:
+        pd.testing.assert_frame_equal(pd.read_excel(report, sheet_name=sheet), pd.read_excel(fresh, sheet_name=sheet))
+
+
+def test_a_regional_holiday_reprocesses_only_that_regions_dealers(exports, tmp_path, sla_settings, capsys):
+    holidays = tmp_path / 'holidays.csv'
+    holidays.write_text('date,region,name\n')
+    sla_settings(holidays_file=str(holidays), dealer_regions={DEALERS['E']: 'Haryana'})
+    store = str(tmp_path / 'tickets.sqlite')
+    process_exports(exports, str(tmp_path / 'report.xlsx'), store)
+    capsys.readouterr()
+
+    holidays.write_text('date,region,name\n2025-06-10,Haryana,Local holiday\n')
+    sla_settings()
+    process_exports(exports, str(tmp_path / 'report.xlsx'), store)
+    assert reprocessed(capsys.readouterr().out) == ['all', 'none']
@@ -0,0 +1,214 @@
+"""Exporting from several tabs of one browser, against a fake WebDriver"""
+import io
+import itertools
+import os
+import threading
+import time
+from datetime import date
+
+import pandas as pd
+import pytest
+from selenium.webdriver.remote.command import Command
+
+from elite_reports import automatn12
+from elite_reports.backfill import Backfill, Checkpoint
+
+USERS = [{'id': f'U{i}', 'dealer': f'Dealer {i}'} for i in range(4)]
+DAYS = [date(2025, 6, day) for day in range(1, 4)]
+
+
+class FakeDriver:
+    """Answers window commands like Chrome and anything else with a dummy value"""
+
+    def __init__(self):
+        self.handles = ['w0']
+        self.current = 'w0'
+
+    def execute(self, command, params=None):
+        if command == Command.W3C_GET_CURRENT_WINDOW_HANDLE:
+            return {'value': self.current}
+        if command == Command.NEW_WINDOW:
+            self.handles.append(f'w{len(self.handles)}')
+            return {'value': {'handle': self.handles[-1]}}
+        if command == Command.SWITCH_TO_WINDOW:
+            self.current = params['handle']
+            return {'value': None}
+        if command == 'window':
+            # Gives another thread the chance to switch windows in between
+            time.sleep(0.001)
+            return {'value': self.current}
+        return {'value': None}
+
+    @property
+    def current_url(self):
+        return self.execute(Command.GET_CURRENT_URL)['value']
+
+    def delete_all_cookies(self):
+        self.execute(Command.DELETE_ALL_COOKIES)
+
+    def execute_script(self, script, *args):
+        return self.execute(Command.W3C_EXECUTE_SCRIPT)['value']
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def portal(tmp_path, monkeypatch):
+    """automatn12 driving fake browsers; records what ran where"""
+    state = {'drivers': [], 'logins': [], 'exporting': {}, 'windows': {}, 'errors': []}
+    lock = threading.Lock()
+    modes = itertools.cycle(['Elite Support', 'Standard Support'])
+    failed_once = set()
+
+    def setup_driver(download_path):
+        driver = FakeDriver()
+        state['drivers'].append(driver)
+        return driver
+
+    def sign_in(driver, wait, user):
+        with lock:
+            state['logins'].append(user['id'])
+            # Every account's first login fails, so retries go through the tabs too
+            return user['id'] in state['logins'][:-1]
+
+    def get_current_support_mode(driver):
+        with lock:
+            return next(modes)
+
+    def process_user_mode(driver, wait, user, mode, download_path, date_from, date_to, *options):
+        window = driver.execute('window')['value']
+        with lock:
+            if state['windows'].setdefault((driver, threading.get_ident()), window) != window:
+                state['errors'].append('tab thread used another window')
+            owner, running = state['exporting'].setdefault(user['id'], [driver, []])
+            if running and owner is not driver:
+                state['errors'].append(f"{user['id']} exporting in two browsers")
+            if any(name != mode['name'] for name in running):
+                state['errors'].append(f"{user['id']} exporting in two modes")
+            state['exporting'][user['id']] = [driver, running + [mode['name']]]
+        for _ in range(3):
+            if driver.execute('window')['value'] != window:
+                with lock:
+                    state['errors'].append('window changed during an export')
+        with lock:
+            state['exporting'][user['id']][1].remove(mode['name'])
+            key = (user['id'], mode['name'], date_from)
+            if date_from == DAYS[1] and key not in failed_once:
+                failed_once.add(key)
+                return None
+        path = os.path.join(download_path, automatn12.export_filename(user, mode, date_from, date_to))
+        open(path, 'w').close()
+        return [path]
+
+    monkeypatch.setattr(automatn12, 'download_dir', str(tmp_path))
+    monkeypatch.setattr(automatn12, 'setup_driver', setup_driver)
+    monkeypatch.setattr(automatn12, 'sign_in', sign_in)
+    monkeypatch.setattr(automatn12, 'sign_out', lambda driver: None)
+    monkeypatch.setattr(automatn12, 'get_current_support_mode', get_current_support_mode)
+    monkeypatch.setattr(automatn12, 'open_report_page', lambda driver: True)
+    monkeypatch.setattr(automatn12, 'wait_for_step', lambda *args: True)
+    monkeypatch.setattr(automatn12, 'process_user_mode', process_user_mode)
+    monkeypatch.setattr(automatn12, 'export_ranges',
+                        lambda user, mode, backfill=None, checkpoint=None: [(day, day) for day in DAYS])
+    monkeypatch.setitem(automatn12.CONFIG, 'retry',
+                        dict(automatn12.CONFIG['retry'], base_delay=0.01, max_delay=0.02, max_attempts=3))
+    return state
+
+
+@pytest.mark.parametrize('workers, tabs', [(1, 3), (2, 2), (2, 1)])
+def test_tabs_export_every_job_once(portal, tmp_path, workers, tabs):
+    files = automatn12.run_users(USERS, workers, tabs=tabs)
+    assert portal['errors'] == []
+    expected = {automatn12.export_filename(user, mode, day, day)
+                for user in USERS for mode in automatn12.ordered_modes() for day in DAYS}
+    assert sorted(os.path.basename(path) for path in files) == sorted(expected)
+    assert all(os.path.dirname(path) == str(tmp_path) for path in files)
+    assert len(portal['drivers']) == workers
+    if tabs > 1:
+        assert all(len(driver.handles) == tabs for driver in portal['drivers'])
+        # Each tab thread drives its own window
+        windows = [(id(driver), window) for (driver, _), window in portal['windows'].items()]
+        assert len(set(windows)) == len(windows)
+
+
+@pytest.mark.parametrize('workers, tabs', [(1, 1), (2, 1), (2, 3)])
+def test_jobs_fail_when_no_chrome_starts(portal, monkeypatch, capsys, workers, tabs):
+    monkeypatch.setattr(automatn12, 'setup_driver', lambda download_path: None)
+    assert automatn12.run_users(USERS[:1], workers, tabs=tabs) == []
+    jobs = len(automatn12.ordered_modes()) * len(DAYS)
+    assert f"Jobs completed: 0, failed: {jobs}" in capsys.readouterr().out
+
+
+class ExportButton:
+    def __init__(self, user, mode, date_from, date_to):
+        self.export = (user['id'], mode['suffix'], date_from, date_to)
+
+
+class DownloadingDriver(FakeDriver):
+    """A FakeDriver whose export button downloads into its directory, as Chrome does.
+
+    The file is written under a .crdownload name and renamed once complete,
+    to the portal's file name or, while that is taken, a numbered one.
+    """
+
+    def __init__(self, download_path):
+        super().__init__()
+        self.download_path = download_path
+        self._names = threading.Lock()
+
+    def execute_script(self, script, *args):
+        if 'click()' in script and isinstance(args[0], ExportButton):
+            threading.Thread(target=self._download, args=args[0].export).start()
+        return super().execute_script(script, *args)
+
+    def _download(self, user_id, suffix, date_from, date_to):
+        days = pd.date_range(date_from, date_to)
+        content = io.BytesIO()
+        pd.DataFrame({
+            'Ticket Number': [f"{user_id}-{suffix}-{day:%d}-{n}" for day in days for n in range(3)],
+            'Call Log Date': [f"{day:%d-%m-%Y}" for day in days for n in range(3)],
+        }).to_excel(content, index=False)
+        with self._names:
+            for count in itertools.count():
+                name = 'Consolidated Report.xlsx' if not count else f'Consolidated Report ({count}).xlsx'
+                path = os.path.join(self.download_path, name)
+                if not os.path.exists(path) and not os.path.exists(path + '.crdownload'):
+                    break
+            with open(path + '.crdownload', 'wb') as partial:
+                partial.write(content.getvalue())
+        time.sleep(0.01)
+        os.rename(path + '.crdownload', path)
+
+
+def test_backfill_in_tabs_claims_each_tabs_own_download(tmp_path, monkeypatch):
+    backfill = Backfill(date(2025, 6, 1), date(2025, 6, 8), 2, Checkpoint(str(tmp_path / 'checkpoint.jsonl')))
+    downloads = tmp_path / 'downloads'
+    downloads.mkdir()
+
+    def process_user_mode(driver, wait, user, mode, download_path, date_from, date_to, *options):
+        return automatn12.download_export(driver, ExportButton(user, mode, date_from, date_to), download_path,
+                                          user, mode, date_from, date_to)
+
+    monkeypatch.setattr(automatn12, 'download_dir', str(downloads))
+    monkeypatch.setattr(automatn12, 'setup_driver', DownloadingDriver)
+    monkeypatch.setattr(automatn12, 'sign_in', lambda driver, wait, user: True)
+    monkeypatch.setattr(automatn12, 'sign_out', lambda driver: None)
+    monkeypatch.setattr(automatn12, 'get_current_support_mode', lambda driver: 'Elite Support')
+    monkeypatch.setattr(automatn12, 'open_report_page', lambda driver: True)
+    monkeypatch.setattr(automatn12, 'wait_for_step', lambda *args: True)
+    monkeypatch.setattr(automatn12, 'process_user_mode', process_user_mode)
+    monkeypatch.setitem(automatn12.CONFIG, 'retry',
+                        dict(automatn12.CONFIG['retry'], base_delay=0.01, max_delay=0.02, max_attempts=1))
+    try:
+        files = automatn12.run_users(USERS[:2], 1, backfill, tabs=3)
+    finally:
+        automatn12.close_watchers()
+
+    expected = [(user, mode, day) for user in USERS[:2] for mode in automatn12.ordered_modes() for day in backfill.days]
+    assert sorted(files) == sorted(str(downloads / automatn12.export_filename(user, mode, day))
+                                   for user, mode, day in expected)
+    for user, mode, day in expected:
+        tickets = pd.read_excel(downloads / automatn12.export_filename(user, mode, day))['Ticket Number']
+        assert tickets.str.startswith(f"{user['id']}-{mode['suffix']}-{day:%d}-").all()
+    assert not [name for name in os.listdir(downloads) if name.startswith('Consolidated Report')]